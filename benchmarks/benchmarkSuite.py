@@ -0,0 +1,238 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import json
+import platform
+from random import Random
+from statistics import median
+from time import perf_counter, time
+from typing import Callable
+from card import Card
+from handBuilder import HandBuilder
+from handStrategy import BestHandStrat, LookupHandStrat
+from handEvaluator import HandEvaluator
+from probabilitySim import ProbabilitySim
+from betStrategy import ArguablyOptimalStrat
+from decisionContext import DecisionContext
+from gameEvents import NullSink
+from player import Player
+from poker import Game
+from deck import Deck
+
+SEED = 480
+HAND_COUNT = 2000
+
+# name -> (setup, repeat), setup pins its inputs and returns (run, operations per run)
+BENCHMARKS : dict[str, tuple[Callable[[], tuple[Callable[[], object], int]], int]] = {}
+
+def benchmark(name : str, repeat : int = 5):
+    """
+    Register a benchmark. The decorated function sets up fixed inputs and
+    returns the function to time with how many operations one run does
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, repeat)
+        return setup
+
+    return register
+
+def pinnedHands(count : int, size : int = 7, seed : int = SEED) -> list[list[Card]]:
+    """
+    Get the same random hands every run
+    """
+    rng = Random(seed)
+    return [rng.sample(Card.ALL, size) for _ in range(count)]
+
+@benchmark("handBuilder.init")
+def benchBuilderInit():
+    hands = pinnedHands(HAND_COUNT)
+    return (lambda: [HandBuilder(hand) for hand in hands], len(hands))
+
+def checkBenchmark(check_name : str):
+    @benchmark("handBuilder." + check_name)
+    def setup():
+        builders = [HandBuilder(hand) for hand in pinnedHands(HAND_COUNT)]
+        checks = [getattr(builder, check_name) for builder in builders]
+        return (lambda: [check() for check in checks], len(checks))
+
+for check_name in ("checkStraightFlush", "checkFOK", "checkFullHouse", "checkFlush", "checkStraight",
+                   "checkTOK", "checkTwoPairs", "checkPair", "checkHighCard"):
+    checkBenchmark(check_name)
+
+@benchmark("bestHandStrat.execute")
+def benchBestHandStrat():
+    hands = pinnedHands(HAND_COUNT)
+
+    def run():
+        for hand in hands:
+            strat = BestHandStrat()
+            strat.takeInCards(hand)
+            strat.execute()
+
+    return (run, len(hands))
+
+@benchmark("handEvaluator.evaluate")
+def benchEvaluate():
+    hands = pinnedHands(HAND_COUNT * 10)
+    return (lambda: [HandEvaluator.evaluate(hand) for hand in hands], len(hands))
+
+def getProbsBenchmark(known : int, count : int, repeat : int):
+    @benchmark("probabilitySim.getProbs.{}".format(known), repeat)
+    def setup():
+        hands = pinnedHands(count, known)
+
+        def run():
+            for hand in hands:
+                ProbabilitySim.CACHE.clear() # time the work, not the cache
+                ProbabilitySim.getProbs(hand)
+
+        return (run, len(hands))
+
+for known, count, repeat in ((2, 1000, 5), (5, 50, 5), (6, 200, 5), (7, 1000, 5)):
+    getProbsBenchmark(known, count, repeat)
+
+@benchmark("probabilitySim.enumerate.2", repeat=3)
+def benchEnumeratePreflop():
+    # full pre-flop enumeration, what getProbs does without the pre-flop table
+    hand = pinnedHands(1, 2)[0]
+    return (lambda: ProbabilitySim._simulate(hand, [0] * 10, 0), 1)
+
+def tableGame(seats : int) -> Game:
+    """
+    Make a headless table of optimal bots with a hand started
+    """
+    players = [Player("bot " + str(seat + 1), 800, LookupHandStrat(), ArguablyOptimalStrat(Random(seat)),
+                      is_agent=True) for seat in range(seats)]
+    game = Game(seats, players=players, events=NullSink(), rng=Random(SEED))
+    game.start_hand()
+    return game
+
+def shuffleBenchmark(name : str, count : int, batch : int):
+    @benchmark(name)
+    def setup():
+        deck = Deck(Random(SEED), batch)
+        shuffles = 2000
+
+        def run():
+            for _ in range(shuffles):
+                deck.shuffle(count)
+                for _ in range(count):
+                    deck.deal()
+
+        return (run, shuffles)
+
+# a 6 seat hand deals 2 * 6 + 8 cards
+shuffleBenchmark("deck.shuffle.6", 20, 0)
+shuffleBenchmark("deck.shuffle.6.batch", 20, 1000)
+
+def showdownBenchmark(seats : int):
+    @benchmark("game.showdown.{}".format(seats))
+    def setup():
+        game = tableGame(seats)
+        game.field = [game.deck.deal() for _ in range(5)]
+        showdowns = 200
+        return (lambda: [game.showdown() for _ in range(showdowns)], showdowns)
+
+for seats in (2, 6, 9, 22):
+    showdownBenchmark(seats)
+
+def decisionBenchmark(street : str, board_size : int, seats : int, repeat : int):
+    @benchmark("arguablyOptimalStrat.determineBet.{}.{}".format(street, seats), repeat)
+    def setup():
+        game = tableGame(seats)
+        player = game.to_act()
+        board = [game.deck.deal() for _ in range(board_size)]
+        decisions = 5
+
+        def run():
+            for _ in range(decisions):
+                # a cold decision: nothing cached or kept from earlier in the hand
+                ProbabilitySim.CACHE.clear()
+                player.bet_strat.determineBet(10, 20, 20, player.pocket_cards, board,
+                                              player.getName(), context=DecisionContext(),
+                                              table=game.table_state())
+
+        return (run, decisions)
+
+for street, board_size in (("preflop", 0), ("flop", 3), ("turn", 4), ("river", 5)):
+    for seats, repeat in ((2, 3), (6, 3)):
+        decisionBenchmark(street, board_size, seats, repeat)
+
+def runBenchmarks(pattern : str = "") -> dict:
+    """
+    Run every benchmark with pattern in its name, giving seconds per
+    operation (best and median of the repeats)
+    """
+    results = {}
+    for name, (setup, repeat) in BENCHMARKS.items():
+        if pattern not in name:
+            continue
+
+        run, operations = setup()
+        run() # warm up
+        times = []
+        for _ in range(repeat):
+            start = perf_counter()
+            run()
+            times.append((perf_counter() - start) / operations)
+
+        results[name] = {"best": min(times), "median": median(times),
+                         "repeat": repeat, "operations": operations}
+        print("{:<45} {:>12.2f} us/op (best {:.2f})".format(name, results[name]["median"] * 1e6,
+                                                          results[name]["best"] * 1e6))
+
+    return {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "platform": platform.platform(), "time": time(), "seed": SEED},
+            "results": results}
+
+def compareRuns(old : dict, new : dict, threshold : float = 0.1) -> list[str]:
+    """
+    Compare the best times of two runs (the least noisy), returns the
+    benchmarks more than threshold (a fraction) slower in the new run
+    """
+    regressions = []
+    for name, new_result in new["results"].items():
+        old_result = old["results"].get(name)
+        if old_result is None:
+            print("{:<45} new".format(name))
+            continue
+
+        ratio = new_result["best"] / old_result["best"]
+        status = ""
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            status = "faster"
+        print("{:<45} {:>12.2f} -> {:>12.2f} us/op {:>6.2f}x {}".format(
+            name, old_result["best"] * 1e6, new_result["best"] * 1e6, ratio, status))
+
+    return regressions
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the hand evaluation and bot decision paths")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--out", help="write the results to this JSON file")
+    run_parser.add_argument("--filter", default="", help="only run benchmarks with this in their name")
+    compare_parser = commands.add_parser("compare", help="flag regressions between two runs")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="slowdown (fraction) counted as a regression")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = runBenchmarks(args.filter)
+        if args.out:
+            with open(args.out, "w") as results_file:
+                json.dump(results, results_file, indent=2)
+    else:
+        with open(args.old) as old_file, open(args.new) as new_file:
+            regressions = compareRuns(json.load(old_file), json.load(new_file), args.threshold)
+        if regressions:
+            print("{} regression(s): {}".format(len(regressions), ", ".join(regressions)))
+            sys.exit(1)
@@ -1,9 +1,14 @@
 from card import Card
 from enum import IntEnum
 from oddsForPot import potOdds
-from probabilitySim import ProbabilitySim
-from copy import deepcopy
-from random import randint
+from tableState import TableState
+from probabilitySim import ProbabilitySim, ProbEstimate
+from equitySim import EquitySim
+from preflopTable import PreflopTable
+from decisionContext import DecisionContext
+from metrics import Metrics
+from time import perf_counter
+import random
 
 class BetType(IntEnum):
     FOLD = 0
@@ -12,12 +17,35 @@ class BetType(IntEnum):
     RAISE = 3
     CALL = 4
 
+class DecisionEstimate:
+    """
+    What a decision was based on: the samples behind its estimates (boards
+    enumerated count too), the largest standard error of any of them (0 when
+    all were exact) and how long it took
+    """
+    def __init__(self) -> None:
+        self.bet : tuple["BetType", int] | None = None
+        self.samples = 0
+        self.std_error = 0.0
+        self.elapsed = 0.0
+
+    def add(self, samples : int, std_error : float) -> None:
+        self.samples += samples
+        self.std_error = max(self.std_error, std_error)
+
+    def __repr__(self) -> str:
+        return "DecisionEstimate(bet={}, samples={}, std_error={:.4f}, elapsed={:.4f})".format(
+            self.bet, self.samples, self.std_error, self.elapsed)
+
 class BetStrat:
     """
     A strategy for betting. Core of AI will be a betting strategy
+
+    rng is used for every random choice and sample (the random module by
+    default), give each strategy a seeded one to replay games
     """
-    def __init__(self):
-        pass
+    def __init__(self, rng : random.Random | None = None):
+        self.rng = rng if rng is not None else random
 
     @staticmethod
     def averageHandValue(hand_probs : list[float]) -> float:
@@ -41,19 +69,112 @@ class BetStrat:
                 highest_prob = prob
         
         return highest_prob
+
+    @staticmethod
+    def headsUpEquity(pocket_cards : list[Card], community_cards : list[Card]) -> float:
+        """
+        Get the exact share of the pot the pocket cards can expect against one
+        opponent (needs at least the flop)
+        """
+        return EquitySim.equity(EquitySim.headsUp(pocket_cards, community_cards))
+
+    @staticmethod
+    def multiwayEquity(pocket_cards : list[Card], community_cards : list[Card],
+                       opponents : int, std_error : float = 0.01,
+                       context : DecisionContext | None = None,
+                       rng : random.Random | None = None,
+                       deadline : float | None = None,
+                       report : DecisionEstimate | None = None) -> float:
+        """
+        Get the share of the pot the pocket cards can expect against some
+        number of opponents, exact heads-up after the flop and from the
+        pre-flop table when possible, sampled otherwise
+
+        With a context, results already found earlier in the hand are reused.
+        With a deadline (a perf_counter() time) sampling stops when it passes,
+        and exact heads-up on the flop (the slowest street) is sampled too
+        unless the context already has it. Samples used go in the report
+        """
+        if opponents == 1 and len(community_cards) >= 3:
+            if (deadline is None or len(community_cards) > 3
+                or (context is not None and context.runout_equity is not None)):
+                if context is not None:
+                    return context.headsUpEquity(pocket_cards, community_cards)
+                return BetStrat.headsUpEquity(pocket_cards, community_cards)
+
+        if not community_cards and opponents <= PreflopTable.MAX_OPPONENTS:
+            table_equity = PreflopTable.getEquity(pocket_cards, opponents)
+            if table_equity is not None:
+                return table_equity
+
+        def compute():
+            return EquitySim.multiway(pocket_cards, community_cards, opponents, std_error,
+                                      batch_size=500 if deadline is None else 100,
+                                      rng=rng, deadline=deadline)
+
+        if context is not None:
+            estimate = context.reuse(pocket_cards, community_cards,
+                                     ("multiway", opponents, std_error, deadline is not None), compute)
+        else:
+            estimate = compute()
+
+        if report is not None:
+            report.add(estimate.samples, estimate.std_error)
+        return estimate.equity
     
     def probsToBet(self, pocket_cards : list[Card], community_cards : list[Card], 
                    current_bet : int, value_threshold : int, big_blind : int,
-                   cutoff : int = 0) -> tuple[BetType, int]:
-        self_cards = deepcopy(pocket_cards)
-        self_cards.extend(community_cards)
-        self_chances = ProbabilitySim.getProbs(self_cards, cutoff)
-        opponent_chances = ProbabilitySim.getProbs(community_cards, cutoff)
+                   table : TableState, cutoff : int = 0, std_error : float = 0,
+                   win_chance : float | None = None,
+                   context : DecisionContext | None = None,
+                   deadline : float | None = None,
+                   report : DecisionEstimate | None = None) -> tuple[BetType, int]:
+        """
+        Decide on a bet by comparing the hand chances of own cards against the
+        chances of the community cards alone (what an opponent can expect).
+        Pre-flop both are lookups (PreflopTable and NO_CARD_PROBS)
+
+        A win_chance (equity) is checked against the pot odds (from the
+        table) when given, otherwise the chance of the most likely hand is
+
+        With a context the chances are reused or conditioned from the flop.
+        With a deadline (a perf_counter() time) the chances of the community
+        cards are sampled until it passes, their samples go in the report
+        (own chances are exact lookups or conditioned after the flop)
+        """
+        with Metrics.timer("bet_strat.simulation"):
+            if context is not None:
+                self_chances = context.handProbs(pocket_cards, community_cards, cutoff, std_error, self.rng)
+            elif deadline is not None:
+                self_chances = self._reported(self.estimateChances(pocket_cards + community_cards,
+                                                                   std_error, deadline), report)
+            else:
+                self_chances = ProbabilitySim.getProbs(pocket_cards + community_cards, cutoff,
+                                                       std_error, rng=self.rng)
+
+            if deadline is not None:
+                def estimate() -> ProbEstimate:
+                    return self.estimateChances(community_cards, std_error, deadline)
+
+                if context is not None:
+                    board_estimate = context.reuse(pocket_cards, community_cards,
+                                                   ("board", std_error, "deadline"), estimate)
+                else:
+                    board_estimate = estimate()
+                opponent_chances = self._reported(board_estimate, report)
+            elif context is not None:
+                opponent_chances = context.reuse(pocket_cards, community_cards, ("board", cutoff, std_error),
+                                                 lambda: ProbabilitySim.getProbs(community_cards, cutoff,
+                                                                                 std_error, rng=self.rng))
+            else:
+                opponent_chances = ProbabilitySim.getProbs(community_cards, cutoff, std_error, rng=self.rng)
 
         self_hand_value = BetStrat.averageHandValue(self_chances)
         opponent_hand_value = BetStrat.averageHandValue(opponent_chances)
 
         self_highest_prob = BetStrat.highestHandProb(self_chances)
+        if win_chance is not None:
+            self_highest_prob = win_chance
 
         if current_bet == 0:
             # no bets/only checks
@@ -61,26 +182,58 @@ class BetStrat:
                 return (BetType.CHECK, 0)
             else:
                 return (BetType.BET, big_blind)
+
+        # previous player has made a bet
+        with Metrics.timer("bet_strat.pot_odds"):
+            pot_equity = potOdds(table).potEquity(current_bet)
+
+        if ((opponent_hand_value - self_hand_value <= (value_threshold / 2)) 
+             and (self_highest_prob >= pot_equity)):
+            return (BetType.RAISE, current_bet + big_blind)
+        elif ((opponent_hand_value - self_hand_value <= (value_threshold * 1.5)) 
+              and (self_highest_prob >= pot_equity)):
+            return (BetType.CALL, current_bet)
         else:
-            # previous player has made a bet
-            if ((opponent_hand_value - self_hand_value <= (value_threshold / 2)) 
-                 and (self_highest_prob >= potOdds().potEquity(current_bet))):
-                return (BetType.RAISE, current_bet + big_blind)
-            elif ((opponent_hand_value - self_hand_value <= (value_threshold * 1.5)) 
-                  and (self_highest_prob >= potOdds().potEquity(current_bet))):
-                return (BetType.CALL, current_bet)
-            else:
-                return (BetType.FOLD, 0)
+            return (BetType.FOLD, 0)
+
+    @staticmethod
+    def _reported(estimate : ProbEstimate, report : DecisionEstimate | None) -> list[float]:
+        """
+        Add the samples of an estimate to the report and get its chances
+        """
+        if report is not None:
+            report.add(estimate.samples, estimate.std_error)
+        return estimate.probs
+
+    def estimateChances(self, cards : list[Card], std_error : float,
+                        deadline : float) -> ProbEstimate:
+        """
+        Get the hand chances of some cards, sampled until std_error or the
+        deadline. Cards that are a lookup (none, pocket cards only, a full
+        hand) or a few boards away stay exact
+        """
+        if len(cards) in (0, 2, 7):
+            probs = ProbabilitySim.getProbs(cards, rng=self.rng)
+            return ProbEstimate(probs, [(prob, prob) for prob in probs], 0, 0, True)
+
+        # small batches so the deadline is checked often
+        return ProbabilitySim.estimateProbs(cards, std_error, batch_size=250,
+                                            rng=self.rng, deadline=deadline)
 
     def determineBet(self, small_blind : int, big_blind : int, 
                      current_bet : int,
                      pocket_cards : list[Card], 
                      community_cards : list[Card],
-                     player_name : str) -> tuple[BetType, int]:
+                     player_name : str,
+                     table : TableState,
+                     context : DecisionContext | None = None) -> tuple[BetType, int]:
         """
         Determine what the bet will be based off the blinds 
         and the current round of betting.
 
+        The context (owned by the player) keeps work done earlier in the hand,
+        the table (made by the game) tells the pot and what the others did
+
         Returns bet type and amount of bet (if applicable)
         """
         if small_blind < 0 or big_blind < 0 or current_bet < 0:
@@ -103,24 +256,24 @@ class RandomStrat(BetStrat):
     """
     Entirely random betting
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng : random.Random | None = None):
+        super().__init__(rng)
     
     def determineBet(self, small_blind, big_blind, current_bet, 
-                     pocket_cards, community_cards, player_name):
+                     pocket_cards, community_cards, player_name, table, context=None):
         super().determineBet(small_blind, big_blind, current_bet, 
                                     pocket_cards, 
                                     community_cards,
-                                    player_name)
+                                    player_name, table)
 
         bet = -1
         if current_bet == 0:
-            bet = randint(1, 2)
+            bet = self.rng.randint(1, 2)
         else:
-            bet = randint(3, 8)
+            bet = self.rng.randint(3, 8)
 
         # ~8% fold chance
-        if randint(1, 12) == 1:
+        if self.rng.randint(1, 12) == 1:
             return (BetType.FOLD, pocket_cards)
         
         if bet == BetType.BET.value:
@@ -140,51 +293,92 @@ class ArguablyOptimalStrat(BetStrat):
 
     Assumptions: Limit Texas Hold'Em rules for betting simplicity
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng : random.Random | None = None, deadline : float | None = None):
+        """
+        deadline is the time (seconds) a decision may take. Simulations are
+        then refined until it runs out instead of to a fixed accuracy, and
+        last_decision tells what each decision was based on
+        """
+        super().__init__(rng)
+        self.deadline = deadline
+        self.last_decision : DecisionEstimate | None = None
     
     def determineBet(self, small_blind, big_blind, current_bet, 
-                     pocket_cards, community_cards, player_name) -> tuple[BetType, int]:
+                     pocket_cards, community_cards, player_name, table,
+                     context=None) -> tuple[BetType, int]:
         super().determineBet(small_blind, big_blind, current_bet, 
-                             pocket_cards, community_cards, player_name)
+                             pocket_cards, community_cards, player_name, table)
         
-        sim_cutoff = 500000 # arbitrary cutoff for number of hands to simulate, bigger the better but slower
+        sim_std_error = 0.005 # accuracy of simulated hand chances, smaller the better but slower
+        equity_std_error = 0.01 # accuracy of sampled multiway equity
         value_threshold = 0.5 # acceptable difference in average hand values
+        start = perf_counter()
+        deadline = None
+        report = DecisionEstimate()
+        if self.deadline is not None:
+            # anytime: keep refining (to a much finer accuracy) until the time runs out
+            sim_std_error = 0.001
+            equity_std_error = 0.001
+            deadline = start + self.deadline
         
-        if current_bet != 0:
-            if potOdds().autoProfit(current_bet, player_name):
+        with Metrics.timer("bet_strat.pot_odds"):
+            odds = potOdds(table)
+            if current_bet != 0 and odds.autoProfit(current_bet, player_name):
                 # auto win, so raise to the big blind
-                return (BetType.RAISE, big_blind)
+                return self._decided((BetType.RAISE, big_blind), report, start)
+
+            opponents = odds.opponentCount()
+
+        # chance of beating every player still in the hand, gets half the time
+        with Metrics.timer("bet_strat.simulation"):
+            win_chance = BetStrat.multiwayEquity(pocket_cards, community_cards,
+                                                 opponents, equity_std_error, context, self.rng,
+                                                 None if deadline is None else start + self.deadline / 2,
+                                                 report)
         
         # get probabilites from simulation
-        return self.probsToBet(pocket_cards, community_cards, 
-                                current_bet, value_threshold, 
-                                big_blind, sim_cutoff)
+        return self._decided(self.probsToBet(pocket_cards, community_cards, 
+                                             current_bet, value_threshold, 
+                                             big_blind, std_error=sim_std_error,
+                                             win_chance=win_chance, context=context,
+                                             deadline=deadline, report=report,
+                                             table=table),
+                             report, start)
+
+    def _decided(self, bet : tuple[BetType, int], report : DecisionEstimate,
+                 start : float) -> tuple[BetType, int]:
+        """
+        Finish the report of a decision and keep it as the last decision
+        """
+        report.bet = bet
+        report.elapsed = perf_counter() - start
+        self.last_decision = report
+        return bet
 
 if __name__ == "__main__":
     from poker import Game
     game = Game(5)
+    game.reset_game() # blinds and pocket cards
     player = game.current_players[0]
-    game.deal()
-    bet = player.makeBet(1, 2, 0, game.field)
+    bet = player.makeBet(1, 2, 0, game.field, game.table_state())
     print("Pre flop bet: {}".format(bet))
 
     if bet[0] != BetType.FOLD:
         game.flop()
-        game.pot = 10
-        bet = player.makeBet(1, 2, 2, game.field)
+        game.current_pot = 10
+        bet = player.makeBet(1, 2, 2, game.field, game.table_state())
         print("Post flop bet: {}".format(bet))
 
         if bet[0] != BetType.FOLD:
             game.turn()
-            game.pot = 20
-            bet = player.makeBet(1, 2, 4, game.field)
+            game.current_pot = 20
+            bet = player.makeBet(1, 2, 4, game.field, game.table_state())
             print("Turn bet: {}".format(bet))
             
             if bet[0] != BetType.FOLD:
                 game.river()
-                game.pot = 30
-                bet = player.makeBet(1, 2, 6, game.field)
+                game.current_pot = 30
+                bet = player.makeBet(1, 2, 6, game.field, game.table_state())
                 print("River bet: {}".format(bet))
     
     print("End of betting")
\ No newline at end of file
@@ -0,0 +1,146 @@
+from player import Player
+from betStrategy import BetType
+from card import Card
+from tableState import TableState
+from decisionContext import DecisionContext
+from metrics import Metrics
+from typing import Hashable
+import itertools
+import queue
+import threading
+
+class BotWorker:
+    """
+    Makes bot bet decisions on a background thread so a window stays
+    responsive while a bot simulates. Results are picked up with poll from
+    the thread that owns the game (the Tk event loop), which then makes the bet
+
+    Every job carries a move id, so a result for a move that no longer
+    matters (ex: a new hand was started) can be told apart and ignored
+
+    While the thread would otherwise be idle (a human is thinking) it can
+    speculate: decide ahead for bots that are likely to act next. Speculative
+    jobs only run when no real move is waiting, their decisions are kept by
+    a key describing the table they were made for, and the simulations they
+    run stay in the bot's DecisionContext, so even a guess that misses makes
+    the real decision cheaper
+    """
+    MOVE = 0
+    SPECULATION = 1
+
+    def __init__(self) -> None:
+        self.jobs : queue.PriorityQueue = queue.PriorityQueue()
+        self.results : queue.Queue = queue.Queue()
+        self.prepared : dict[Hashable, tuple[BetType, int]] = {}
+        self.generation = 0 # speculation submitted under an older generation is dropped
+        self.cleared = 0    # speculation started before the last clearPrepared isn't kept
+        self._order = itertools.count() # keeps jobs of the same priority in order
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="bot worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, move_id : int, player : Player, small_blind : int, big_blind : int,
+               current_bet : int, community_cards : list[Card], table : TableState) -> None:
+        """
+        Start deciding a bet for the player. The cards are copied and the
+        player's DecisionContext taken as it is now, so the game can go on to
+        a new hand (which gives the player a new context) meanwhile
+        """
+        self.jobs.put((BotWorker.MOVE, next(self._order),
+                       (move_id, player, list(player.pocket_cards), player.context, small_blind, big_blind,
+                        current_bet, list(community_cards), table)))
+
+    def speculate(self, key : Hashable, player : Player, small_blind : int, big_blind : int,
+                  current_bet : int, community_cards : list[Card], table : TableState) -> None:
+        """
+        Decide ahead for a bot that may act soon, the decision is kept under
+        key (see takePrepared). Only worth it if the key holds everything the
+        decision depends on. Cards and context are taken as in submit
+        """
+        with self._lock:
+            stamp = (self.generation, self.cleared)
+        self.jobs.put((BotWorker.SPECULATION, next(self._order),
+                       (stamp, key, player, list(player.pocket_cards), player.context, small_blind, big_blind,
+                        current_bet, list(community_cards), table)))
+
+    def cancelSpeculation(self) -> None:
+        """
+        Drop speculation that hasn't started yet, cheap as it only bumps the
+        generation. A guess already running is finished, and decisions
+        already made are kept as their keys say what they were made for
+        """
+        with self._lock:
+            self.generation += 1
+
+    def clearPrepared(self) -> None:
+        """
+        Drop every speculation (ex: a new hand was dealt)
+        """
+        with self._lock:
+            self.generation += 1
+            self.cleared += 1
+            self.prepared.clear()
+
+    def takePrepared(self, key : Hashable) -> tuple[BetType, int] | None:
+        """
+        Get the decision speculated for key, None if there is none
+        """
+        with self._lock:
+            decision = self.prepared.pop(key, None)
+        if Metrics.enabled:
+            Metrics.count("bot_worker.speculation_hits" if decision else "bot_worker.speculation_misses")
+        return decision
+
+    def poll(self) -> tuple[int, tuple[BetType, int] | Exception] | None:
+        """
+        Get a finished decision as (move id, bet or the exception raised),
+        None if there is none yet
+        """
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def stop(self) -> None:
+        """
+        Let the thread end once it is done with its current job
+        """
+        self.jobs.put((BotWorker.MOVE, next(self._order), None))
+
+    def _run(self) -> None:
+        while True:
+            priority, _, job = self.jobs.get()
+            if job is None:
+                return
+
+            if priority == BotWorker.SPECULATION:
+                self._speculate(*job)
+                continue
+
+            move_id, player, pocket_cards, context, small_blind, big_blind, current_bet, community_cards, table = job
+            try:
+                result = player.decideBet(small_blind, big_blind, current_bet, community_cards, table,
+                                          pocket_cards, context)
+            except Exception as error:
+                result = error # raised again on the game's thread
+            self.results.put((move_id, result))
+
+    def _speculate(self, stamp : tuple[int, int], key : Hashable, player : Player,
+                   pocket_cards : list[Card], context : DecisionContext, small_blind : int,
+                   big_blind : int, current_bet : int, community_cards : list[Card],
+                   table : TableState) -> None:
+        generation, cleared = stamp
+        if generation != self.generation:
+            return # the table moved on before this guess started
+
+        try:
+            decision = player.decideBet(small_blind, big_blind, current_bet, community_cards, table,
+                                        pocket_cards, context)
+        except Exception:
+            return # the real move will decide again and raise it where it's seen
+
+        with self._lock:
+            # kept if cancelled meanwhile, the key only matches a table it's right for,
+            # but not once the hand it was made for is over
+            if cleared == self.cleared:
+                self.prepared[key] = decision
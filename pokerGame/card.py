@@ -22,11 +22,102 @@ class Rank(IntEnum):
     ACE = 14
 
 class Card:
+    """
+    A playing card. There is only one Card object for each rank and suit
+    (Card(rank, suit) always returns it), so cards are cheap to compare, hash
+    and copy. Each card also has an index (0-51, suit major) and a mask
+    (1 << index) so sets of cards can be stored as a single int
+    """
+    __slots__ = ("rank", "suit", "index", "mask", "_name")
+
+    ALL : tuple["Card", ...] = ()   # every card, ordered by index
+    FULL_MASK = (1 << 52) - 1
+    TEXT : tuple[str, ...] = ()     # every card in the usual notation ("As"), ordered by index
+    BY_TEXT : dict[str, "Card"] = {}
+
     # All cards have some rank and suit
-    def __init__(self, rank : Rank, suit : Suit) -> None:
-        self.rank = rank
-        self.suit = suit
+    def __new__(cls, rank : Rank, suit : Suit) -> "Card":
+        if not (Rank.TWO <= rank <= Rank.ACE and Suit.CLUB <= suit <= Suit.SPADE):
+            raise Exception("Invalid card: rank {} and suit {}!".format(rank, suit))
+
+        return Card.ALL[(suit - 1) * 13 + (rank - 2)]
+
+    @staticmethod
+    def _make(rank : Rank, suit : Suit) -> "Card":
+        """
+        Create the single object for a card, only used to build Card.ALL
+        """
+        suit_symbols = {Suit.CLUB: "C", Suit.DIAMOND: "D", Suit.HEART: "H", Suit.SPADE: "S"}
+        rank_symbols = {Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5", Rank.SIX: "6", 
+                        Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9", Rank.TEN: "10", Rank.JACK: "J", 
+                        Rank.QUEEN: "Q", Rank.KING: "K", Rank.ACE: "A"}
+        card = object.__new__(Card)
+        index = (suit.value - 1) * 13 + (rank.value - 2)
+        object.__setattr__(card, "rank", rank)
+        object.__setattr__(card, "suit", suit)
+        object.__setattr__(card, "index", index)
+        object.__setattr__(card, "mask", 1 << index)
+        object.__setattr__(card, "_name", f"{suit_symbols[suit]}{rank_symbols[rank]}")
+        return card
+
+    @staticmethod
+    def fromIndex(index : int) -> "Card":
+        return Card.ALL[index]
+
+    @staticmethod
+    def toMask(cards : list["Card"]) -> int:
+        """
+        Get the card set mask of a list of cards
+        """
+        mask = 0
+        for card in cards:
+            mask |= card.mask
+        
+        return mask
+
+    @staticmethod
+    def fromMask(mask : int) -> list["Card"]:
+        """
+        Get the cards in a card set mask, ordered by index
+        """
+        cards = []
+        while mask:
+            low_bit = mask & -mask
+            cards.append(Card.ALL[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        
+        return cards
+
+    @staticmethod
+    def toCards(cards : "list[Card] | list[int] | int") -> list["Card"]:
+        """
+        Get a list of cards from cards, card indexes or a card set mask
+        """
+        if isinstance(cards, int):
+            return Card.fromMask(cards)
+        
+        return [Card.ALL[card] if isinstance(card, int) else card for card in cards]
     
+    @staticmethod
+    def toText(cards : list["Card"]) -> str:
+        """
+        Write cards in the usual notation, rank then suit ("AsKd")
+        """
+        return "".join([Card.TEXT[card.index] for card in cards])
+
+    @staticmethod
+    def fromText(text : str) -> list["Card"]:
+        """
+        Read cards written in the usual notation ("AsKd", "Th9h")
+        """
+        if len(text) % 2:
+            raise Exception("Cards are written as rank and suit pairs!")
+
+        try:
+            return [Card.BY_TEXT[text[i:i + 2]] for i in range(0, len(text), 2)]
+        except KeyError:
+            raise Exception("Unknown card in {}".format(text))
+
     def getRank(self) -> Rank:
         return self.rank
 
@@ -34,30 +125,40 @@ class Card:
         return self.suit
     
     def __repr__(self) -> str:
-        suit_symbols = {Suit.CLUB: "C", Suit.DIAMOND: "D", Suit.HEART: "H", Suit.SPADE: "S"}
-        rank_symbols = {Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5", Rank.SIX: "6", 
-                        Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9", Rank.TEN: "10", Rank.JACK: "J", 
-                        Rank.QUEEN: "Q", Rank.KING: "K", Rank.ACE: "A"}
-        return f"{suit_symbols[self.suit]}{rank_symbols[self.rank]}"
+        return self._name
     
     def __eq__(self, other):
-        if isinstance(other, Card):
-            return (self.getRank().value == other.getRank().value 
-                    and self.getSuit().value == other.getSuit().value)
-        
-        return False
+        # only one object exists per card
+        return self is other
     
     def __gt__(self, other):
         if isinstance(other, Card):
-            return self.getRank().value > other.getRank().value
+            return self.rank > other.rank
 
         return False
     
     def __lt__(self, other):
         if isinstance(other, Card):
-            return self.getRank().value < other.getRank().value
+            return self.rank < other.rank
         
         return False
     
     def __hash__(self):
-        return hash(self.rank.value + (100 * self.suit.value))
\ No newline at end of file
+        return self.index
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Cards can't be changed")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        # unpickle to the existing card object
+        return (Card, (self.rank, self.suit))
+
+Card.ALL = tuple(Card._make(rank, suit) for suit in Suit for rank in Rank)
+Card.TEXT = tuple("23456789TJQKA"[card.rank - 2] + "cdhs"[card.suit - 1] for card in Card.ALL)
+Card.BY_TEXT = {text: card for text, card in zip(Card.TEXT, Card.ALL)}
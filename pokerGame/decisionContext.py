@@ -0,0 +1,187 @@
+from card import Card
+from handEvaluator import HandEvaluator
+from equitySim import EquitySim
+from probabilitySim import ProbabilitySim
+from itertools import combinations
+from random import Random
+from typing import Any, Callable
+
+class DecisionContext:
+    """
+    What a player has worked out about the hand being played, kept between
+    their decisions. Results for a board that hasn't changed (ex: acting again
+    after a re-raise) are reused, and turn and river results are read from
+    counts made at the flop instead of simulating again
+
+    At the flop every way to finish the board (1081 turn and river pairs) is
+    gone through once. Conditioning on the turn card is then adding up the
+    pairs holding it, and the river is a single pair
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget everything, for a new hand
+        """
+        self.pocket_mask = 0
+        self.board_mask = 0
+        self.results : dict[tuple, Any] = {}    # results for the current board
+        self.flop_mask = 0                      # flop the counts below were made on
+        self.runout_categories : dict[int, int] | None = None  # turn and river mask -> own HandVal
+        self.card_categories : list[list[int]] | None = None   # turn card -> HandVal counts, index 0 is total
+        self.runout_equity : dict[int, tuple[int, int, int]] | None = None  # mask -> (wins, ties, losses)
+        self.card_equity : list[list[int]] | None = None       # turn card -> (wins, ties, losses)
+        self.hits = 0                           # results reused or conditioned instead of computed
+
+    def _update(self, pocket_cards : list[Card], community_cards : list[Card]) -> None:
+        """
+        Start over for new pocket cards and drop the results of an old board
+        """
+        pocket_mask = Card.toMask(pocket_cards)
+        if pocket_mask != self.pocket_mask:
+            self.reset()
+            self.pocket_mask = pocket_mask
+
+        board_mask = Card.toMask(community_cards)
+        if board_mask != self.board_mask:
+            self.board_mask = board_mask
+            self.results.clear()
+            if len(community_cards) == 3 and board_mask != self.flop_mask:
+                self.flop_mask = board_mask
+                self.runout_categories = self.card_categories = None
+                self.runout_equity = self.card_equity = None
+
+    def _runout(self) -> int | None:
+        """
+        Get the mask of the cards dealt since the flop, None if the counts made
+        at the flop don't apply to the current board
+        """
+        if not self.flop_mask or self.board_mask & self.flop_mask != self.flop_mask:
+            return None
+
+        return self.board_mask ^ self.flop_mask
+
+    def reuse(self, pocket_cards : list[Card], community_cards : list[Card],
+              key : tuple, compute : Callable[[], Any]) -> Any:
+        """
+        Get a result for the current board, only computing it the first time
+        it is asked for
+        """
+        self._update(pocket_cards, community_cards)
+        if key in self.results:
+            self.hits += 1
+            return self.results[key]
+
+        result = compute()
+        self.results[key] = result
+        return result
+
+    def handProbs(self, pocket_cards : list[Card], community_cards : list[Card],
+                  cutoff : int = 0, std_error : float = 0,
+                  rng : Random | None = None) -> list[float]:
+        """
+        Get the hand probabilities of the pocket and community cards (same
+        layout as ProbabilitySim.getProbs), exact from the flop on
+        """
+        def compute() -> list[float]:
+            if cutoff == 0 and 3 <= len(community_cards) <= 5:
+                counts = self._categoryCounts(pocket_cards, community_cards)
+                if counts is not None:
+                    return [0] + [count / counts[0] for count in counts[1:]]
+
+            return ProbabilitySim.getProbs(pocket_cards + community_cards, cutoff, std_error, rng=rng)
+
+        return list(self.reuse(pocket_cards, community_cards, ("probs", cutoff, std_error), compute))
+
+    def headsUpEquity(self, pocket_cards : list[Card], community_cards : list[Card]) -> float:
+        """
+        Get the exact share of the pot the pocket cards can expect against one
+        opponent (needs at least the flop)
+        """
+        def compute() -> float:
+            results = self._equityCounts(pocket_cards, community_cards)
+            if results is None:
+                return EquitySim.equity(EquitySim.headsUp(pocket_cards, community_cards))
+
+            total = sum(results)
+            return EquitySim.equity((results[0] / total, results[1] / total, results[2] / total))
+
+        return self.reuse(pocket_cards, community_cards, ("heads up",), compute)
+
+    def _categoryCounts(self, pocket_cards : list[Card], community_cards : list[Card]) -> list[int] | None:
+        """
+        Get how often each HandVal is made on the current board, None if it
+        isn't a board coming from the counted flop
+        """
+        if len(community_cards) == 3 and self.runout_categories is None:
+            keys = HandEvaluator.CARD_KEYS
+            known = pocket_cards + community_cards
+            key = sum(keys[card.index] for card in known)
+            mask = Card.toMask(known)
+            unseen = [card.index for card in Card.ALL if not card.mask & mask]
+            self.runout_categories = {}
+            self.card_categories = [[0] * 10 for _ in range(52)]
+            for first, second in combinations(unseen, 2):
+                runout = (1 << first) | (1 << second)
+                category = HandEvaluator.evaluateKey(key + keys[first] + keys[second],
+                                                     mask | runout) >> HandEvaluator.CATEGORY_SHIFT
+                self.runout_categories[runout] = category
+                for index in (first, second):
+                    self.card_categories[index][0] += 1
+                    self.card_categories[index][category] += 1
+
+        runout = self._runout()
+        if runout is None or self.runout_categories is None:
+            return None
+
+        if not runout:
+            counts = [0] * 10
+            for category in self.runout_categories.values():
+                counts[0] += 1
+                counts[category] += 1
+            return counts
+
+        self.hits += 1
+        if runout.bit_count() == 1:
+            return self.card_categories[runout.bit_length() - 1]
+
+        counts = [0] * 10
+        counts[0] = 1
+        counts[self.runout_categories[runout]] = 1
+        return counts
+
+    def _equityCounts(self, pocket_cards : list[Card],
+                      community_cards : list[Card]) -> list[int] | None:
+        """
+        Get the number of opponent hands beaten, tied and lost to on the
+        current board, None if it isn't a board coming from the counted flop
+        """
+        if len(community_cards) == 3 and self.runout_equity is None:
+            self.runout_equity = {}
+            self.card_equity = [[0, 0, 0] for _ in range(52)]
+            for runout, wins, ties, losses in EquitySim.runouts(pocket_cards, community_cards):
+                self.runout_equity[runout] = (wins, ties, losses)
+                for card in Card.toCards(runout):
+                    results = self.card_equity[card.index]
+                    results[0] += wins
+                    results[1] += ties
+                    results[2] += losses
+
+        runout = self._runout()
+        if runout is None or self.runout_equity is None:
+            return None
+
+        if not runout:
+            results = [0, 0, 0]
+            for wins, ties, losses in self.runout_equity.values():
+                results[0] += wins
+                results[1] += ties
+                results[2] += losses
+            return results
+
+        self.hits += 1
+        if runout.bit_count() == 1:
+            return self.card_equity[runout.bit_length() - 1]
+
+        return list(self.runout_equity[runout])
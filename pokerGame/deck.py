@@ -0,0 +1,92 @@
+from card import Card
+from handEvaluator import np
+import random
+
+class Deck:
+    """
+    A deck of the interned cards that deals by moving a cursor along a fixed
+    list, so a hand allocates nothing
+
+    shuffle only randomizes the cards a hand will deal (a partial
+    Fisher-Yates over the first count cards), any card dealt past those is
+    shuffled in as it's dealt, so every deal is still uniformly random. The
+    cards are never put back in order, a Fisher-Yates from any order gives
+    a uniform shuffle
+
+    With batch set (needs numpy) the shuffles are made batch hands at a time
+    with numpy's random generator (seeded from rng), each shuffle then just
+    takes the next one
+    """
+    SIZE = 52
+
+    def __init__(self, rng : random.Random | None = None, batch : int = 0) -> None:
+        if batch and np is None:
+            raise Exception("Batch shuffling needs numpy installed!")
+
+        self.rng = rng or random
+        self.cards = list(Card.ALL)
+        self.cursor = 0   # next card dealt
+        self.shuffled = 0 # cards before this are randomized
+        self.batch = batch
+        self._generator = None
+        self._orders : list[list[int]] = [] # batched shuffles, card indexes
+        self._batch_count = 0 # cards randomized in each batched shuffle
+
+    def shuffle(self, count : int = SIZE) -> None:
+        """
+        Start a new hand, randomizing the first count cards to be dealt
+        """
+        count = min(count, Deck.SIZE)
+        self.cursor = 0
+        if self.batch:
+            if not self._orders:
+                self._orders = self._batchOrders(count)
+                self._batch_count = count
+            self.cards = [Card.ALL[index] for index in self._orders.pop()]
+            self.shuffled = self._batch_count
+            return
+
+        cards = self.cards
+        draw = self.rng.random
+        for i in range(count):
+            j = i + int(draw() * (Deck.SIZE - i))
+            cards[i], cards[j] = cards[j], cards[i]
+        self.shuffled = count
+
+    def _batchOrders(self, count : int) -> list[list[int]]:
+        """
+        Run batch partial Fisher-Yates shuffles of the first count cards at
+        once, a swap is one vectorized step for every shuffle
+        """
+        if self._generator is None:
+            self._generator = np.random.default_rng(self.rng.getrandbits(64))
+
+        orders = np.tile(np.arange(Deck.SIZE, dtype=np.int8), (self.batch, 1))
+        rows = np.arange(self.batch)
+        draws = self._generator.random((self.batch, count))
+        for i in range(count):
+            j = i + (draws[:, i] * (Deck.SIZE - i)).astype(np.intp)
+            picked = orders[rows, j]
+            orders[rows, j] = orders[:, i]
+            orders[:, i] = picked
+
+        return orders.tolist()
+
+    def deal(self) -> Card:
+        """
+        Deal the next card
+        """
+        cursor = self.cursor
+        if cursor >= self.shuffled:
+            if cursor >= Deck.SIZE:
+                raise Exception("No cards left in the deck!")
+            # dealing past what was shuffled for, shuffle in one more card
+            j = cursor + int(self.rng.random() * (Deck.SIZE - cursor))
+            self.cards[cursor], self.cards[j] = self.cards[j], self.cards[cursor]
+            self.shuffled = cursor + 1
+
+        self.cursor = cursor + 1
+        return self.cards[cursor]
+
+    def __len__(self) -> int:
+        return Deck.SIZE - self.cursor
@@ -0,0 +1,253 @@
+from card import Card
+from handEvaluator import HandEvaluator
+from itertools import combinations
+from random import Random
+from math import sqrt
+from time import perf_counter
+
+class EquityEstimate:
+    """
+    Equity estimated by sampling, with its confidence interval
+    """
+    def __init__(self, equity : float, interval : tuple[float, float],
+                 samples : int, std_error : float) -> None:
+        self.equity = equity        # expected share of the pot
+        self.interval = interval    # (low, high) confidence interval
+        self.samples = samples      # number of deals looked at
+        self.std_error = std_error  # standard error of the equity
+
+    def __repr__(self) -> str:
+        return "EquityEstimate(equity={:.4f}, samples={}, std_error={:.4f})".format(self.equity,
+                                                                                 self.samples,
+                                                                                 self.std_error)
+
+class EquitySim:
+    """
+    Works out how often a pocket hand beats the cards of opponents, instead of
+    only how good the hand is on its own
+    """
+
+    @staticmethod
+    def headsUp(pocket_cards : list[Card], community_cards : list[Card]) -> tuple[float, float, float]:
+        """
+        Exact win, tie and lose probabilities against one opponent, found by
+        going through every opponent pocket hand and every way to finish the
+        board. Needs at least the flop (3 community cards)
+        """
+        wins = ties = losses = 0
+        for _, runout_wins, runout_ties, runout_losses in EquitySim.runouts(pocket_cards, community_cards):
+            wins += runout_wins
+            ties += runout_ties
+            losses += runout_losses
+
+        total = wins + ties + losses
+        return (wins / total, ties / total, losses / total)
+
+    @staticmethod
+    def runouts(pocket_cards : list[Card], community_cards : list[Card]):
+        """
+        Go through every way to finish the board, giving the mask of the cards
+        still to come with the number of opponent pocket hands the pocket
+        cards beat, tie and lose to on that board
+        """
+        if len(pocket_cards) != 2:
+            raise Exception("Equity needs exactly 2 pocket cards!")
+
+        if len(community_cards) < 3 or len(community_cards) > 5:
+            raise Exception("Exact equity needs 3-5 community cards: {}".format(community_cards))
+
+        keys = HandEvaluator.CARD_KEYS
+        rank_table = HandEvaluator.RANK_TABLE
+        rank_keys = HandEvaluator.RANK_KEYS
+        rank_part = HandEvaluator.RANK_PART
+        pocket_key = keys[pocket_cards[0].index] + keys[pocket_cards[1].index]
+        pocket_mask = pocket_cards[0].mask | pocket_cards[1].mask
+        board_key = sum(keys[card.index] for card in community_cards)
+        board_mask = Card.toMask(community_cards)
+        unseen = [card for card in Card.ALL if not card.mask & (board_mask | pocket_mask)]
+
+        for runout in combinations(unseen, 5 - len(community_cards)):
+            wins = ties = losses = 0
+            full_key = board_key
+            full_mask = board_mask
+            for card in runout:
+                full_key += keys[card.index]
+                full_mask |= card.mask
+
+            own = HandEvaluator.evaluateKey(full_key + pocket_key, full_mask | pocket_mask)
+            remaining = [card for card in unseen if not card.mask & full_mask]
+
+            # only a suit with 3+ cards on the board can give the opponent a
+            # flush, every other pocket hand is decided by its ranks alone,
+            # unless the board is a flush every player has
+            flush_suit = -1
+            board_flush = 0
+            for suit in range(4):
+                suited_count = ((full_mask >> (13 * suit)) & 0x1FFF).bit_count()
+                if suited_count >= 3:
+                    flush_suit = suit
+                if suited_count >= 5:
+                    board_flush = HandEvaluator.evaluateKey(full_key, full_mask)
+
+            suited = [card for card in remaining if card.index // 13 == flush_suit]
+            others = [card for card in remaining if card.index // 13 != flush_suit]
+
+            rank_counts = [0] * 13
+            for card in others:
+                rank_counts[card.index % 13] += 1
+
+            board_ranks = full_key & rank_part
+            for high in range(13):
+                if not rank_counts[high]:
+                    continue
+
+                for low in range(high + 1):
+                    if low == high:
+                        hands = rank_counts[high] * (rank_counts[high] - 1) // 2
+                    else:
+                        hands = rank_counts[high] * rank_counts[low]
+                    if not hands:
+                        continue
+
+                    opponent = max(rank_table[board_ranks + rank_keys[high] + rank_keys[low]], board_flush)
+                    if own > opponent:
+                        wins += hands
+                    elif own == opponent:
+                        ties += hands
+                    else:
+                        losses += hands
+
+            # hands with a card of the flush suit need the full evaluation
+            for i, first in enumerate(suited):
+                for second in suited[i + 1:] + others:
+                    opponent = HandEvaluator.evaluateKey(full_key + keys[first.index] + keys[second.index],
+                                                         full_mask | first.mask | second.mask)
+                    if own > opponent:
+                        wins += 1
+                    elif own == opponent:
+                        ties += 1
+                    else:
+                        losses += 1
+
+            yield (full_mask ^ board_mask, wins, ties, losses)
+
+    @staticmethod
+    def multiway(pocket_cards : list[Card], community_cards : list[Card], opponents : int,
+                 std_error : float = 0.01, max_samples : int = 0, batch_size : int = 500,
+                 z : float = 1.96, rng : Random | None = None,
+                 deadline : float | None = None) -> EquityEstimate:
+        """
+        Estimate the share of the pot the pocket cards can expect against some
+        number of opponents holding random cards
+
+        Every sample deals the rest of the board once and evaluates it with
+        each opponent's cards, so a sample costs one hand evaluation per
+        player. Samples are taken in batches until the standard error is at
+        most std_error, max_samples deals were made or perf_counter() passes
+        the deadline (checked between batches, the first batch always runs)
+        """
+        if len(pocket_cards) != 2:
+            raise Exception("Equity needs exactly 2 pocket cards!")
+
+        if len(community_cards) > 5:
+            raise Exception("Can't have more than 5 community cards")
+
+        if opponents < 1 or 2 * opponents + 7 > 52:
+            raise Exception("Invalid number of opponents: {}".format(opponents))
+
+        if std_error <= 0 and max_samples <= 0 and deadline is None:
+            raise Exception("Need a target standard error, a sample budget or a deadline!")
+
+        rng = rng if rng is not None else Random()
+        keys = HandEvaluator.CARD_KEYS
+        rank_table = HandEvaluator.RANK_TABLE
+        rank_part = HandEvaluator.RANK_PART
+        pocket_key = keys[pocket_cards[0].index] + keys[pocket_cards[1].index]
+        pocket_mask = pocket_cards[0].mask | pocket_cards[1].mask
+        board_key = sum(keys[card.index] for card in community_cards)
+        board_mask = Card.toMask(community_cards)
+        unseen = [card.index for card in Card.ALL if not card.mask & (board_mask | pocket_mask)]
+        missing = 5 - len(community_cards)
+        dealt_count = missing + 2 * opponents
+
+        samples = 0
+        mean = 0.0
+        squares = 0.0   # sum of squared differences from the mean (Welford)
+        while True:
+            batch = batch_size
+            if max_samples > 0:
+                batch = min(batch, max_samples - samples)
+
+            for _ in range(batch):
+                dealt = rng.sample(unseen, dealt_count)
+                full_key = board_key
+                full_mask = board_mask
+                for index in dealt[:missing]:
+                    full_key += keys[index]
+                    full_mask |= 1 << index
+
+                own = HandEvaluator.evaluateKey(full_key + pocket_key, full_mask | pocket_mask)
+                # without 3 cards of a suit on the board nobody has a flush,
+                # opponents are then a single rank lookup each
+                flush_possible = any(((full_mask >> (13 * suit)) & 0x1FFF).bit_count() >= 3
+                                     for suit in range(4))
+                best = 0
+                ties = 0
+                for i in range(missing, dealt_count, 2):
+                    first, second = dealt[i], dealt[i + 1]
+                    hand_key = full_key + keys[first] + keys[second]
+                    if flush_possible:
+                        opponent = HandEvaluator.evaluateKey(hand_key, full_mask | (1 << first) | (1 << second))
+                    else:
+                        opponent = rank_table[hand_key & rank_part]
+
+                    if opponent > best:
+                        best = opponent
+                        ties = 0
+                    if opponent == best:
+                        ties += 1
+
+                share = 0.0
+                if own > best:
+                    share = 1.0
+                elif own == best:
+                    share = 1 / (ties + 1)
+
+                samples += 1
+                difference = share - mean
+                mean += difference / samples
+                squares += difference * (share - mean)
+
+            error = sqrt(squares / (samples - 1) / samples) if samples > 1 else 1.0
+            if ((std_error > 0 and error <= std_error)
+                or (max_samples > 0 and samples >= max_samples)
+                or (deadline is not None and perf_counter() >= deadline)):
+                break
+
+        interval = (max(0.0, mean - z * error), min(1.0, mean + z * error))
+        return EquityEstimate(mean, interval, samples, error)
+
+    @staticmethod
+    def equity(win_tie_lose : tuple[float, float, float]) -> float:
+        """
+        Share of the pot expected from win, tie and lose probabilities
+        (a tie against one opponent splits the pot)
+        """
+        return win_tie_lose[0] + win_tie_lose[1] / 2
+
+if __name__ == "__main__":
+    from random import sample
+    from time import perf_counter
+
+    cards = sample(Card.ALL, 7)
+    for board_size in (3, 4, 5):
+        start = perf_counter()
+        result = EquitySim.headsUp(cards[:2], cards[2:2 + board_size])
+        print("{} on {}: win {:.3f} tie {:.3f} lose {:.3f} ({:.1f} ms)".format(
+            cards[:2], cards[2:2 + board_size], *result, (perf_counter() - start) * 1000))
+
+    for opponents in (1, 3, 8):
+        start = perf_counter()
+        estimate = EquitySim.multiway(cards[:2], cards[2:5], opponents)
+        print("{} opponents on the flop: {} ({:.1f} ms)".format(opponents, estimate,
+                                                               (perf_counter() - start) * 1000))
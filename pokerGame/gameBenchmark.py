@@ -0,0 +1,73 @@
+from poker import Game
+from player import Player
+from handStrategy import LookupHandStrat
+from betStrategy import RandomStrat, ArguablyOptimalStrat
+from gameEvents import NullSink
+from tableHost import TableHost
+from metrics import Metrics
+from time import perf_counter
+
+def botTable(seats : int, optimal : int = 0, deadline : float | None = None) -> Game:
+    """
+    Make a headless table of bots, the last optimal seats use
+    ArguablyOptimalStrat (with a per decision deadline if given) and the
+    others bet randomly
+    """
+    players = [Player("random agent " + str(x + 1), 800, LookupHandStrat(), RandomStrat(), is_agent=True)
+               for x in range(seats - optimal)]
+    players += [Player("optimal agent " + str(x + 1), 800, LookupHandStrat(), ArguablyOptimalStrat(deadline=deadline),
+                       is_agent=True)
+                for x in range(optimal)]
+    return Game(seats, players=players, events=NullSink())
+
+def handsPerSecond(seats : int, hands : int, optimal : int = 0, deadline : float | None = None) -> float:
+    """
+    Play full hands at a table of bots, stacks are topped up before every
+    hand so the table never shrinks
+    """
+    game = botTable(seats, optimal, deadline)
+    start = perf_counter()
+    for _ in range(hands):
+        for player in game.players:
+            player.money = 800
+        game.play_hand()
+
+    return hands / (perf_counter() - start)
+
+def hostedHandsPerSecond(tables : int, seats : int, hands : int, optimal : int = 0,
+                         deadline : float | None = None) -> float:
+    """
+    Play hands across many tables of bots hosted in this process, giving
+    the hands per second of all of them together
+    """
+    host = TableHost([botTable(seats, optimal, deadline) for _ in range(tables)], stack=800)
+    start = perf_counter()
+    played = host.run(hands)
+    return played / (perf_counter() - start)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure full hands per second of bot tables")
+    parser.add_argument("--hands", type=int, default=2000)
+    parser.add_argument("--optimal", type=int, default=0, help="seats played by ArguablyOptimalStrat")
+    parser.add_argument("--seats", type=int, nargs="+", default=[2, 6, 9, 22])
+    parser.add_argument("--deadline", type=float, help="seconds each optimal bot decision may take")
+    parser.add_argument("--tables", type=int, help="host this many tables at once, hands are counted across them")
+    parser.add_argument("--metrics", help="record metrics to this file (.prom for Prometheus, else JSON)")
+    args = parser.parse_args()
+    if args.metrics:
+        Metrics.enable()
+
+    for seats in args.seats:
+        if args.tables:
+            rate = hostedHandsPerSecond(args.tables, seats, args.hands, args.optimal, args.deadline)
+            print("{:>2} seats, {} tables: {:>9.1f} hands/s".format(seats, args.tables, rate))
+        else:
+            print("{:>2} seats: {:>9.1f} hands/s".format(seats, handsPerSecond(seats, args.hands, args.optimal,
+                                                                                  args.deadline)))
+
+    if args.metrics and args.metrics.endswith(".prom"):
+        Metrics.writePrometheus(args.metrics)
+    elif args.metrics:
+        Metrics.writeJson(args.metrics)
@@ -0,0 +1,53 @@
+class EventSink:
+    """
+    Receives what happens in a game (blinds, bets, folds, streets, winners).
+    Events have a kind, a message to show and the values that fill it in.
+    The message is only formatted by sinks that show it, so a game nobody is
+    watching doesn't pay for building text. Events that are costly to make
+    are skipped when the sink isn't watching
+    """
+    watching = True
+
+    def emit(self, kind : str, message : str, **data) -> None:
+        pass
+
+class NullSink(EventSink):
+    """
+    Ignores every event, for games played without anyone watching
+    """
+    watching = False
+
+class PrintSink(EventSink):
+    """
+    Prints every event, how a game in the terminal is shown
+    """
+    def emit(self, kind : str, message : str, **data) -> None:
+        print(message.format(**data))
+
+class ListSink(EventSink):
+    """
+    Keeps every event as (kind, data), for tests and replays
+    """
+    def __init__(self) -> None:
+        self.events : list[tuple[str, dict]] = []
+        self._messages : list[str] = []
+
+    def emit(self, kind : str, message : str, **data) -> None:
+        self.events.append((kind, data))
+        self._messages.append(message)
+
+    def kinds(self) -> list[str]:
+        """
+        Get the kind of every event in order
+        """
+        return [kind for kind, _ in self.events]
+
+    def messages(self) -> list[str]:
+        """
+        Get every event as the text it would have printed
+        """
+        return [message.format(**data) for message, (_, data) in zip(self._messages, self.events)]
+
+    def clear(self) -> None:
+        self.events.clear()
+        self._messages.clear()
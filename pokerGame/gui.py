@@ -4,20 +4,34 @@ from PIL import Image, ImageTk
 from poker import Game  # Assuming your game class is in game.py
 from player import Player
 from betStrategy import BetType
+from card import Card
+from botWorker import BotWorker
 import time
 
 class PokerGUI:
+    POLL_MS = 20 # how often to check for a finished bot decision
+    SPECULATE_BOTS = 2 # how many of the bots after the human to decide ahead for
+    CARD_SIZE = (100, 140) # card images are resized to fit in the GUI
+    LOG_LINES = 500 # lines of the game log kept
+
     def __init__(self, root, player_count=1, bot_count=2):
         self.root = root
         self.root.title("Poker Game")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+
+        # bots decide on a background thread, results come back through poll_bot
+        self.worker = BotWorker()
+        self.move_id = 0 # id of the bot move being waited for
+        self.bot_thinking = False
+        self.speculated_for = None # table the current speculation was started for
         
         self.game = Game(player_count, bot_count)
         self.winner = tk.StringVar()
 
         self.game.reset_game()
         self.real_player = self.game.players[0]
-        self.players_acted = {player: False for player in self.game.current_players} 
 
+        self.load_card_images()
         self.create_widgets()
         self.log(f"\nSmall Blind: {self.game.sb_player.getName()}")
         self.log(f"Big Blind: {self.game.bb_player.getName()}\n")
@@ -39,6 +53,8 @@ class PokerGUI:
         # Frame for community cards images
         self.community_cards_frame = tk.Frame(self.root)
         self.community_cards_frame.pack()
+        self.community_slots = [tk.Label(self.community_cards_frame) for _ in range(5)]
+        self.shown_community = [None] * 5
 
         # Player Display
         self.players_frame = tk.Frame(self.root)
@@ -73,9 +89,11 @@ class PokerGUI:
         self.pocket_cards_label = tk.Label(self.root, text="Pocket Cards:")
         self.pocket_cards_label.pack()
 
-        # Frame for community cards images
+        # Frame for pocket cards images
         self.pocket_cards_frame = tk.Frame(self.root)
         self.pocket_cards_frame.pack()
+        self.pocket_slots = [tk.Label(self.pocket_cards_frame) for _ in range(2)]
+        self.shown_pocket = [None] * 2
         
         # Log Area
         self.log_label = tk.Label(self.root, text="Game Log:")
@@ -102,42 +120,44 @@ class PokerGUI:
                     widget.pack(side=tk.LEFT)
                 self.bet_entry.pack()
 
-            # Clear the current community card images (and previously shown text)
-            for widget in self.community_cards_frame.winfo_children():
-                widget.destroy()
-
-            # Display images of community cards
-
-            for card in self.game.field:
-                img_path = f"pokerGame/images/{card}.png"  # Get the image path for the card
-                try:
-                    image = Image.open(img_path)
-                    image = image.resize((100, 140))  # Resize the image to fit in the GUI
-                    photo = ImageTk.PhotoImage(image)
-
-                    card_label = tk.Label(self.community_cards_frame, image=photo)
-                    card_label.image = photo  # Keep a reference to the image object
-                    card_label.pack(side=tk.LEFT)
-                except FileNotFoundError:
-                    print(f"Image for {card} not found.")
-
+            # only card slots whose card changed are touched
+            self.show_cards(self.community_slots, self.shown_community, self.game.field)
             self.update_money()
-
-            for widget in self.pocket_cards_frame.winfo_children():
-                widget.destroy()
-
-            for card in self.real_player.pocket_cards:
-                img_path = f"pokerGame/images/{card}.png"  # Get the image path for the card
-                try:
-                    image = Image.open(img_path)
-                    image = image.resize((100, 140))  # Resize the image to fit in the GUI
-                    photo = ImageTk.PhotoImage(image)
-
-                    card_label = tk.Label(self.pocket_cards_frame, image=photo)
-                    card_label.image = photo  # Keep a reference to the image object
-                    card_label.pack(side=tk.LEFT)
-                except FileNotFoundError:
-                    print(f"Image for {card} not found.")
+            self.show_cards(self.pocket_slots, self.shown_pocket, self.real_player.pocket_cards)
+
+    def load_card_images(self):
+        """
+        Open and resize every card image once, redraws reuse the PhotoImages
+        """
+        self.card_images = {}
+        for card in Card.ALL:
+            img_path = f"pokerGame/images/{card}.png"  # Get the image path for the card
+            try:
+                image = Image.open(img_path)
+                image = image.resize(self.CARD_SIZE)  # Resize the image to fit in the GUI
+                self.card_images[card] = ImageTk.PhotoImage(image)
+            except FileNotFoundError:
+                print(f"Image for {card} not found.")
+
+    def show_cards(self, slots, shown, cards):
+        """
+        Show cards in a row of card labels, leaving slots that already show
+        the right card alone. Cards fill the slots from the left, so hiding
+        and showing again keeps them in order
+        """
+        for i, slot in enumerate(slots):
+            card = cards[i] if i < len(cards) else None
+            if card is shown[i]:
+                continue
+
+            image = self.card_images.get(card)
+            if image is None:
+                slot.pack_forget()
+            else:
+                slot.config(image=image)
+                if shown[i] is None:
+                    slot.pack(side=tk.LEFT)
+            shown[i] = card if image is not None else None
 
     def check(self):
         curr_player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
@@ -146,12 +166,13 @@ class PokerGUI:
             self.log(f"{curr_player.getName()} checked.")
         else:
             self.log(f"{curr_player.getName()} called for {amount}.")
-        self.game.current_turn = (self.game.current_turn + 1) % len(self.game.current_players)
-        self.players_acted[curr_player] = True
+        self.game.seats.act(self.game.current_turn)
+        self.game.current_turn = self.game.seats.next(self.game.current_turn)
         self.update_display()
     
     def make_bet(self):
-        max_bet = min([(player.getMoney() + player.getBet()) for player in self.game.current_players if player != 0])
+        max_bet = min(self.game.current_players[seat].getMoney() + self.game.current_players[seat].getBet()
+                      for seat in self.game.seats)
         print(max_bet)
         try:
             curr_player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
@@ -161,8 +182,6 @@ class PokerGUI:
                     if amount - self.game.current_bet >= self.game.big_blind_amount:
                         curr_player._bet(amount)
                         self.cpuBet(amount)
-                        self.players_acted = {player: False for player in self.game.current_players if player != 0} 
-                        self.players_acted[curr_player] = True
                     else:
                         messagebox.showerror("Invalid Input", "You can only raise by at least the big blind")
                 else:
@@ -175,54 +194,133 @@ class PokerGUI:
     def fold(self):
         curr_player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
         self.log(f"{curr_player.getName()} folded.")
-        self.game.fold(self.game.current_turn)
-        self.game.current_turn = (self.game.current_turn) % len(self.game.current_players)
-        self.players_acted[curr_player] = True
+        self.game.fold(self.game.current_turn) # moves the turn on
         self.update_display()
     
     def cpuBet(self, amount : int):
         curr_player : Player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
         self.log(f"{curr_player.getName()} bet ${amount}.")
-        self.game.current_turn = (self.game.current_turn + 1) % len(self.game.current_players)
+        self.game.seats.raised(self.game.current_turn)
+        self.game.current_turn = self.game.seats.next(self.game.current_turn)
         self.game.current_pot += amount
         self.game.current_bet = curr_player.getBet()
-        self.players_acted = {player: False for player in self.game.current_players if player != 0}
-        self.players_acted[curr_player] = True
         self.update_display()
 
     def raiseBet(self, raise_amount : int):
         curr_player : Player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
         print(curr_player.getName())
         self.log(f"{curr_player.getName()} raises by ${raise_amount} to ${curr_player.getBet()}.")
-        self.game.current_turn = (self.game.current_turn + 1) % len(self.game.current_players)
+        self.game.seats.raised(self.game.current_turn)
+        self.game.current_turn = self.game.seats.next(self.game.current_turn)
         self.game.current_pot += raise_amount
         self.game.current_bet = curr_player.getBet()
         self.update_display()
-        self.players_acted = {player: False for player in self.game.current_players if player != 0} 
-        self.players_acted[curr_player] = True
 
     def callBet(self, call_difference : int):
         curr_player : Player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
         print(curr_player.getName())
         self.log(f"{curr_player.getName()} calls previous bet of ${self.game.current_bet}.")
-        self.game.current_turn = (self.game.current_turn + 1) % len(self.game.current_players)
+        self.game.seats.act(self.game.current_turn)
+        self.game.current_turn = self.game.seats.next(self.game.current_turn)
         self.game.current_pot += call_difference
         if self.game.current_bet != curr_player.getBet():
             raise Exception("Call is not equal to previous bet!")
         
         self.update_display() 
-        self.players_acted[curr_player] = True
 
     def log(self, message):
+        """
+        Add to the game log, which keeps only the last LOG_LINES lines so it
+        doesn't grow over a long session
+        """
         self.log_text.insert(tk.END, message + "\n")
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1
+        if lines > self.LOG_LINES:
+            self.log_text.delete("1.0", f"{lines - self.LOG_LINES + 1}.0")
         self.log_text.see(tk.END)
 
     def cpu_move(self):
+        """
+        Start the current bot's decision on the worker thread, the window keeps
+        running and poll_bot makes the bet once it's decided
+        """
         curr_player : Player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
-        bet_result = curr_player.makeBet(self.game.small_blind_amount, 
-                      self.game.big_blind_amount, 
-                      self.game.current_bet,
-                      self.game.field)
+        prepared = self.worker.takePrepared(self.decision_key(curr_player, self.game.current_bet))
+        if prepared is not None:
+            # decided while the human was thinking, for exactly this table
+            self.apply_cpu_move(prepared)
+            self.root.after(100, self.play)
+            return
+
+        # the table isn't what was guessed, the rest of the guesses are stale too
+        self.worker.cancelSpeculation()
+        self.move_id += 1
+        self.bot_thinking = True
+        self.worker.submit(self.move_id, curr_player,
+                           self.game.small_blind_amount,
+                           self.game.big_blind_amount,
+                           self.game.current_bet,
+                           self.game.field,
+                           self.game.table_state())
+        self.root.after(self.POLL_MS, self.poll_bot)
+
+    def decision_key(self, player : Player, current_bet : int):
+        """
+        Everything a bot's decision depends on, a speculated decision is only
+        used if the table still matches it
+        """
+        return (player.getName(), tuple(player.pocket_cards), tuple(self.game.field), current_bet,
+                self.game.current_pot, self.game.currnum_players, self.game.rounds)
+
+    def speculate(self):
+        """
+        While the human thinks, decide ahead for the next bots to act facing
+        the current bet (what they see if the human checks or calls). A guess
+        is used as is if the table is unchanged when the bot acts, otherwise
+        the simulations it ran are still kept by the bot's DecisionContext,
+        and they don't depend on the bet size, so the real decision is quick
+        """
+        bots = []
+        seat = self.game.current_turn
+        for _ in range(len(self.game.seats) - 1):
+            seat = self.game.seats.next(seat)
+            player = self.game.current_players[seat]
+            if player.is_agent and len(bots) < self.SPECULATE_BOTS:
+                bots.append(player)
+
+        for player in bots:
+            self.worker.speculate(self.decision_key(player, self.game.current_bet), player,
+                                  self.game.small_blind_amount,
+                                  self.game.big_blind_amount,
+                                  self.game.current_bet,
+                                  self.game.field,
+                                  self.game.table_state())
+
+    def poll_bot(self):
+        """
+        Check for the bot's decision, make the bet once it's there and only
+        then move on to the next turn
+        """
+        if not self.bot_thinking:
+            return # move was cancelled (new hand)
+
+        result = self.worker.poll()
+        while result is not None and result[0] != self.move_id:
+            result = self.worker.poll() # decision for a cancelled move
+        if result is None:
+            self.root.after(self.POLL_MS, self.poll_bot)
+            return
+
+        self.bot_thinking = False
+        if isinstance(result[1], Exception):
+            raise result[1]
+
+        self.apply_cpu_move(result[1])
+        self.root.after(100, self.play)
+
+    def apply_cpu_move(self, decision):
+        curr_player : Player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
+        bet_result = curr_player.applyBet(decision)
         
         if bet_result[0] == BetType.CHECK:
             self.check()
@@ -234,18 +332,21 @@ class PokerGUI:
             self.raiseBet(bet_result[1])
         else: # must be a call
             self.callBet(bet_result[1])
-        for key in self.players_acted:
-            if key != 0:
-                print(key.getName(), self.players_acted[key])
-        print('')
+
+    def close(self):
+        self.bot_thinking = False
+        self.worker.stop()
+        self.root.destroy()
 
     def play_again(self):
         self.continue_button.destroy()
+        self.bot_thinking = False # a decision still running is for the old hand
+        self.worker.clearPrepared()
+        self.speculated_for = None
         self.game.reset_game()
         if self.game.currnum_players <= 1:
             self.log("\n\n\n\n\n\n\n\n\n\n\n\n\nNot enough players to continue.")
             return
-        self.players_acted = {player: False for player in self.game.current_players if player != 0} 
         self.winner.set(f"")
         self.log("\n\n\n\n\n\n\n\n\n\n\n\n\n\n\nStarting New Match...")
         self.log(f"Small Blind: {self.game.sb_player.getName()}")
@@ -275,23 +376,21 @@ class PokerGUI:
 
 
     def play(self):
+            if self.bot_thinking:
+                return # poll_bot carries on once the bot has acted
+
             if self.game.currnum_players <= 1:
-                print(self.game.current_players[0])
-                self.players_acted = {player: False for player in self.game.players} 
-                for player in self.game.current_players:
-                    if player != 0:
-                        self.game_over([player])
-                        return
+                if len(self.game.seats):
+                    self.game_over([self.game.current_players[self.game.seats.first(0)]])
                 return
             
             curr_player = self.game.current_players[self.game.current_turn % len(self.game.current_players)]
 
             if curr_player != 0:
-                if False not in self.players_acted.values() and len(self.players_acted.values()) > 1:
-                    for player in self.game.current_players:
-                        if player != 0:
-                            player.clearBet()
-                    self.players_acted = {player: False for player in self.game.current_players if player != 0}
+                if self.game.seats.complete() and len(self.game.seats) > 1:
+                    for seat in self.game.seats:
+                        self.game.current_players[seat].clearBet()
+                    self.game.seats.newRound()
                     self.log("---New Betting Round---")
                     if self.game.game_state == 0:
                         self.game.flop()
@@ -311,17 +410,21 @@ class PokerGUI:
                 if curr_player != 0:
                 # If the current player is a bot, use a delay before making their move
                     if curr_player.is_agent:
-                        # After CPU move is complete, call play again
+                        # play is called again by poll_bot after the CPU move is made
                         self.root.after(100, self.cpu_move)
-                        self.root.after(100, self.play)
                     else:
-                        # If it's not a bot's turn, continue the game
+                        # If it's not a bot's turn, think ahead for the bots once and continue the game
+                        table = (self.game.current_turn, len(self.game.field), self.game.current_bet,
+                                 self.game.current_pot, self.game.currnum_players)
+                        if table != self.speculated_for:
+                            self.speculated_for = table
+                            self.speculate()
                         self.root.after(100, self.play)
                 else:
-                    self.game.current_turn += 1
+                    self.game.current_turn = self.game.seats.next(self.game.current_turn)
                     self.root.after(100, self.play)
             else:
-                self.game.current_turn += 1
+                self.game.current_turn = self.game.seats.next(self.game.current_turn)
                 self.root.after(100, self.play)
 
 
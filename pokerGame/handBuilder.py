@@ -1,6 +1,5 @@
 from card import Card, Rank, Suit
 from enum import IntEnum, Enum
-from copy import deepcopy
 
 class HandVal(IntEnum):
     NO_HAND = 0
@@ -20,7 +19,9 @@ class HandBuilder:
     Used to build a full hand (5 cards) using the 2 pocket cards 
     and 5 community cards
     """
-    def __init__(self, cards : list[Card]) -> None:
+    def __init__(self, cards : list[Card] | list[int] | int) -> None:
+        # cards can also be given as card indexes or a card set mask
+        cards = Card.toCards(cards)
         if len(cards) != 7:
             raise Exception("Invalid number of cards for hand construction: {}".format(cards))
         
@@ -66,7 +67,8 @@ class HandBuilder:
         """
         Get cards not currently in the hand in order from highest to lowest rank
         """
-        other_cards = [card for card in self.cards if card not in cur_cards]
+        used_mask = Card.toMask(cur_cards)
+        other_cards = [card for card in self.cards if not card.mask & used_mask]
         sorted_cards = sorted(other_cards)
         sorted_cards.reverse()
         return sorted_cards
@@ -84,7 +86,7 @@ class HandBuilder:
                     break
             
             if same_suit:
-                return (deepcopy(sequence), HandVal.STRAIGHT_FLUSH)
+                return (list(sequence), HandVal.STRAIGHT_FLUSH)
         
         return ([], HandVal.NO_HAND)
     
@@ -96,7 +98,7 @@ class HandBuilder:
             if len(vals) == 4:
                 # get another card to complete the hand
                 other_cards = self._getOtherCards(vals)
-                hand = deepcopy(vals)
+                hand = list(vals)
                 hand.append(other_cards[0])
                 return (hand, HandVal.FOUR_OF_KIND)
         
@@ -110,9 +112,9 @@ class HandBuilder:
         pair = []
         for vals in self.same_value.values():
             if len(vals) == 3:
-                tok = deepcopy(vals)
+                tok = list(vals)
             if len(vals) == 2:
-                pair = deepcopy(vals)
+                pair = list(vals)
 
             if tok and pair:
                 # TOK and pair found
@@ -130,7 +132,7 @@ class HandBuilder:
         """
         for suits in self.same_suit.values():
             if len(suits) == 5:
-                return (deepcopy(suits), HandVal.FLUSH)
+                return (list(suits), HandVal.FLUSH)
         
         return ([], HandVal.NO_HAND)
     
@@ -139,7 +141,7 @@ class HandBuilder:
         Return any Straight (five cards in sequential order)
         """
         if self.sequences:
-            return (deepcopy(self.sequences[0]), HandVal.STRAIGHT)
+            return (list(self.sequences[0]), HandVal.STRAIGHT)
     
         return ([], HandVal.NO_HAND)
 
@@ -152,7 +154,7 @@ class HandBuilder:
                 # get two cards to complete the hand
                 other_cards = self._getOtherCards(vals)
                 #list(set(self.cards) - set(vals))
-                hand = deepcopy(vals)
+                hand = list(vals)
                 hand.extend(other_cards[:2])
                 return (hand, HandVal.THREE_OF_KIND)
         
@@ -178,7 +180,7 @@ class HandBuilder:
             partial_hand = pair1 + pair2
             # get a card to complete the hand
             other_cards = self._getOtherCards(partial_hand)
-            hand = deepcopy(partial_hand)
+            hand = list(partial_hand)
             hand.append(other_cards[0])
             return (hand, HandVal.TWO_PAIRS)
         
@@ -192,7 +194,7 @@ class HandBuilder:
             if len(vals) == 2:
                 # get three cards to complete the hand
                 other_cards = self._getOtherCards(vals)
-                hand = deepcopy(vals)
+                hand = list(vals)
                 hand.extend(other_cards[:3])
                 return (hand, HandVal.PAIR)
         
@@ -0,0 +1,349 @@
+from card import Card
+from handBuilder import HandVal
+from itertools import combinations_with_replacement
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # batch evaluation needs numpy
+
+class HandEvaluator:
+    """
+    Evaluates 5 to 7 cards into a single hand strength integer using
+    precomputed tables instead of building the hand with HandBuilder
+
+    A strength is packed as the HandVal category followed by the ranks of the
+    5 cards in the order they are compared (4 bits each), so a higher strength
+    is always a better hand and equal strengths are exact ties
+    """
+    CATEGORY_SHIFT = 20
+
+    # Every card adds its rank digit (base 5, a rank appears at most 4 times)
+    # to the low bits and a 1 to its suit's 4 bit counter above SUIT_SHIFT
+    SUIT_SHIFT = 32
+    RANK_PART = (1 << SUIT_SHIFT) - 1
+    RANK_KEYS = [5 ** i for i in range(13)]
+    SUIT_KEYS = [1 << shift for shift in range(SUIT_SHIFT, SUIT_SHIFT + 16, 4)]
+    # rank key + suit counter of each card index
+    CARD_KEYS : list[int] = []
+    # adding 3 to every suit counter sets its top bit only if it holds 5+ cards
+    FLUSH_ADD = 0x3333 << SUIT_SHIFT
+    FLUSH_TEST = 0x8888 << SUIT_SHIFT
+
+    # rank part of the key -> strength, for every non-flush rank multiset
+    RANK_TABLE : dict[int, int] = {}
+    # 13 bit rank mask of the flush suit -> strength (flush or straight flush)
+    FLUSH_TABLE : list[int] = []
+    # numpy versions of the tables for evaluateBatch
+    _BATCH_TABLES : dict = {}
+
+    @staticmethod
+    def evaluate(cards : list[Card]) -> int:
+        """
+        Get the strength of the best 5 card hand that can be made from the cards
+        """
+        key = 0
+        for card in cards:
+            key += HandEvaluator.CARD_KEYS[card.index]
+
+        if (key + HandEvaluator.FLUSH_ADD) & HandEvaluator.FLUSH_TEST:
+            return HandEvaluator.evaluateKey(key, Card.toMask(cards))
+
+        return HandEvaluator.RANK_TABLE[key & HandEvaluator.RANK_PART]
+
+    @staticmethod
+    def evaluateKey(key : int, mask : int) -> int:
+        """
+        Get the strength of cards from the sum of their CARD_KEYS and their card
+        set mask, for callers that build the key up one card at a time
+        """
+        flush = (key + HandEvaluator.FLUSH_ADD) & HandEvaluator.FLUSH_TEST
+        if flush:
+            # only one suit can hold 5 of 7 cards, its bits in the card set
+            # mask are the ranks it holds
+            suit = (flush.bit_length() - HandEvaluator.SUIT_SHIFT) // 4 - 1
+            return HandEvaluator.FLUSH_TABLE[(mask >> (13 * suit)) & 0x1FFF]
+
+        return HandEvaluator.RANK_TABLE[key & HandEvaluator.RANK_PART]
+
+    @staticmethod
+    def evaluateBatch(cards : "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Evaluate many hands at once: cards is an (N, 5-7) array of card
+        indexes, one hand per row. Returns the strength and HandVal category
+        of every hand as arrays of length N (needs numpy)
+        """
+        tables = HandEvaluator._batchTables()
+        cards = np.asarray(cards, dtype=np.intp)
+        keys = tables["card_keys"][cards].sum(axis=1)
+        masks = np.bitwise_or.reduce(tables["card_masks"][cards], axis=1)
+        strengths = HandEvaluator.evaluateKeysBatch(keys, masks)
+        return (strengths, strengths >> HandEvaluator.CATEGORY_SHIFT)
+
+    @staticmethod
+    def evaluateKeysBatch(keys : "np.ndarray", masks : "np.ndarray") -> "np.ndarray":
+        """
+        Batch version of evaluateKey: keys are the summed CARD_KEYS (int64)
+        and masks the card set masks (uint64) of each hand
+        """
+        tables = HandEvaluator._batchTables()
+        # non flush hands, found by binary search over the sorted rank keys
+        rank_keys = keys & HandEvaluator.RANK_PART
+        positions = np.searchsorted(tables["rank_keys"], rank_keys)
+        strengths = tables["rank_strengths"][positions]
+
+        flush = ((keys + HandEvaluator.FLUSH_ADD) & HandEvaluator.FLUSH_TEST) != 0
+        if flush.any():
+            flush_keys = keys[flush] >> HandEvaluator.SUIT_SHIFT
+            suit_counts = np.stack([(flush_keys >> (4 * suit)) & 0xF for suit in range(4)], axis=1)
+            suits = suit_counts.argmax(axis=1).astype(np.uint64)
+            rank_masks = (masks[flush] >> (np.uint64(13) * suits)) & np.uint64(0x1FFF)
+            strengths[flush] = tables["flush_table"][rank_masks.astype(np.intp)]
+
+        return strengths
+
+    @staticmethod
+    def batchAvailable() -> bool:
+        return np is not None
+
+    @staticmethod
+    def _batchTables() -> dict:
+        """
+        Get numpy copies of the lookup tables, made on first use
+        """
+        if np is None:
+            raise Exception("Batch evaluation needs numpy installed!")
+
+        if not HandEvaluator._BATCH_TABLES:
+            rank_keys = sorted(HandEvaluator.RANK_TABLE)
+            HandEvaluator._BATCH_TABLES.update(
+                card_keys=np.array(HandEvaluator.CARD_KEYS, dtype=np.int64),
+                card_masks=np.array([card.mask for card in Card.ALL], dtype=np.uint64),
+                rank_keys=np.array(rank_keys, dtype=np.int64),
+                rank_strengths=np.array([HandEvaluator.RANK_TABLE[key] for key in rank_keys],
+                                        dtype=np.int64),
+                flush_table=np.array(HandEvaluator.FLUSH_TABLE, dtype=np.int64))
+
+        return HandEvaluator._BATCH_TABLES
+
+    @staticmethod
+    def handCategory(strength : int) -> HandVal:
+        """
+        Get the type of hand (ex: Flush) a strength represents
+        """
+        return HandVal(strength >> HandEvaluator.CATEGORY_SHIFT)
+
+    @staticmethod
+    def handRanks(strength : int) -> list[int]:
+        """
+        Get the rank values of the 5 hand cards in the order they are compared
+        """
+        return [(strength >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+
+    @staticmethod
+    def bestHand(cards : list[Card],
+                 strength : int | None = None) -> tuple[list[Card], HandVal]:
+        """
+        Build the 5 card hand a strength was made from, in the same form
+        HandStrat.execute returns
+        """
+        if strength is None:
+            strength = HandEvaluator.evaluate(cards)
+
+        category = HandEvaluator.handCategory(strength)
+        available = list(cards)
+        if category == HandVal.FLUSH or category == HandVal.STRAIGHT_FLUSH:
+            suit_counts = {}
+            for card in cards:
+                suit_counts[card.getSuit()] = suit_counts.get(card.getSuit(), 0) + 1
+
+            flush_suit = max(suit_counts, key=suit_counts.get)
+            available = [card for card in cards if card.getSuit() == flush_suit]
+
+        hand = []
+        for rank in HandEvaluator.handRanks(strength):
+            for card in available:
+                if card.getRank().value == rank:
+                    available.remove(card)
+                    hand.append(card)
+                    break
+
+        return (hand, category)
+
+    @staticmethod
+    def handKey(hand : list[Card], category : HandVal) -> int:
+        """
+        Get the strength of an already built hand of the given type, for hands
+        not made by evaluate (ex: from HandBuilder)
+        """
+        counts = {}
+        for card in hand:
+            counts[card.getRank().value] = counts.get(card.getRank().value, 0) + 1
+
+        # most of a kind first, then highest rank first
+        ordered = []
+        for rank in sorted(counts, key=lambda rank: (counts[rank], rank), reverse=True):
+            ordered.extend([rank] * counts[rank])
+
+        if category in (HandVal.STRAIGHT, HandVal.STRAIGHT_FLUSH) and ordered == [14, 5, 4, 3, 2]:
+            ordered = [5, 4, 3, 2, 14] # ace played low
+
+        ordered.extend([0] * (5 - len(ordered)))
+        strength = category.value
+        for rank in ordered[:5]:
+            strength = (strength << 4) | rank
+
+        return strength
+
+    @staticmethod
+    def _pack(category : HandVal, ranks : list[int]) -> int:
+        """
+        Pack a category and the 5 hand rank indexes (0 = TWO) into a strength
+        """
+        strength = category.value
+        for rank in ranks:
+            strength = (strength << 4) | (rank + 2)
+
+        return strength
+
+    @staticmethod
+    def _straightTop(rank_mask : int) -> int:
+        """
+        Get the rank index of the highest card of the best straight in the
+        mask, or -1 if there is no straight
+        """
+        for top in range(12, 3, -1):
+            window = 0x1F << (top - 4)
+            if rank_mask & window == window:
+                return top
+
+        # ace can be played low (A-2-3-4-5)
+        wheel = 0x100F
+        if rank_mask & wheel == wheel:
+            return 3
+
+        return -1
+
+    @staticmethod
+    def _straightRanks(top : int) -> list[int]:
+        """
+        Get the rank indexes of a straight from its highest card
+        """
+        if top == 3:
+            return [3, 2, 1, 0, 12]
+
+        return [top - i for i in range(5)]
+
+    @staticmethod
+    def _rankStrength(counts : list[int]) -> int:
+        """
+        Get the strength of the best non flush hand from how many cards of each
+        rank there are
+        """
+        # most of a kind first, then highest rank first
+        groups = sorted(((count, rank) for rank, count in enumerate(counts) if count),
+                        reverse=True)
+        ranks_desc = [rank for rank in range(12, -1, -1) if counts[rank]]
+        rank_mask = 0
+        for rank in ranks_desc:
+            rank_mask |= 1 << rank
+
+        def kickers(used : list[int], amount : int) -> list[int]:
+            return [rank for rank in ranks_desc if rank not in used][:amount]
+
+        top_count, top_rank = groups[0]
+        if top_count == 4:
+            return HandEvaluator._pack(HandVal.FOUR_OF_KIND,
+                                       [top_rank] * 4 + kickers([top_rank], 1))
+
+        if top_count == 3 and groups[1][0] >= 2:
+            pair_rank = groups[1][1]
+            return HandEvaluator._pack(HandVal.FULL_HOUSE,
+                                       [top_rank] * 3 + [pair_rank] * 2)
+
+        straight_top = HandEvaluator._straightTop(rank_mask)
+        if straight_top >= 0:
+            return HandEvaluator._pack(HandVal.STRAIGHT,
+                                       HandEvaluator._straightRanks(straight_top))
+
+        if top_count == 3:
+            return HandEvaluator._pack(HandVal.THREE_OF_KIND,
+                                       [top_rank] * 3 + kickers([top_rank], 2))
+
+        if top_count == 2 and groups[1][0] == 2:
+            low_rank = groups[1][1]
+            return HandEvaluator._pack(HandVal.TWO_PAIRS,
+                                       [top_rank] * 2 + [low_rank] * 2
+                                       + kickers([top_rank, low_rank], 1))
+
+        if top_count == 2:
+            return HandEvaluator._pack(HandVal.PAIR,
+                                       [top_rank] * 2 + kickers([top_rank], 3))
+
+        return HandEvaluator._pack(HandVal.HIGH_CARD, ranks_desc[:5])
+
+    @staticmethod
+    def _flushStrength(rank_mask : int) -> int:
+        """
+        Get the strength of the best hand from 5+ cards of the same suit
+        """
+        straight_top = HandEvaluator._straightTop(rank_mask)
+        if straight_top >= 0:
+            return HandEvaluator._pack(HandVal.STRAIGHT_FLUSH,
+                                       HandEvaluator._straightRanks(straight_top))
+
+        ranks_desc = [rank for rank in range(12, -1, -1) if rank_mask & (1 << rank)]
+        return HandEvaluator._pack(HandVal.FLUSH, ranks_desc[:5])
+
+    @staticmethod
+    def _buildTables() -> None:
+        """
+        Fill the lookup tables for every hand of 5, 6 or 7 cards
+        """
+        HandEvaluator.CARD_KEYS.extend(
+            HandEvaluator.RANK_KEYS[card.index % 13] + HandEvaluator.SUIT_KEYS[card.index // 13]
+            for card in Card.ALL)
+
+        for size in range(5, 8):
+            for ranks in combinations_with_replacement(range(13), size):
+                counts = [0] * 13
+                for rank in ranks:
+                    counts[rank] += 1
+
+                if max(counts) > 4:
+                    continue # not possible with one deck
+
+                key = sum(HandEvaluator.RANK_KEYS[rank] for rank in ranks)
+                HandEvaluator.RANK_TABLE[key] = HandEvaluator._rankStrength(counts)
+
+        HandEvaluator.FLUSH_TABLE.extend(
+            HandEvaluator._flushStrength(rank_mask) if rank_mask.bit_count() >= 5 else 0
+            for rank_mask in range(1 << 13))
+
+HandEvaluator._buildTables()
+
+if __name__ == "__main__":
+    from random import Random
+    from time import perf_counter
+    from handStrategy import BestHandStrat
+
+    # throughput comparison against the HandBuilder check chain
+    rng = Random(480)
+    deck = list(Card.ALL)
+    hands = [rng.sample(deck, 7) for _ in range(20000)]
+
+    start = perf_counter()
+    for hand in hands:
+        strat = BestHandStrat()
+        strat.takeInCards(hand)
+        strat.execute()
+    builder_time = perf_counter() - start
+
+    start = perf_counter()
+    for hand in hands:
+        HandEvaluator.evaluate(hand)
+    lookup_time = perf_counter() - start
+
+    print("BestHandStrat: {:.0f} hands/s".format(len(hands) / builder_time))
+    print("HandEvaluator: {:.0f} hands/s".format(len(hands) / lookup_time))
+    print("Speedup: {:.1f}x".format(builder_time / lookup_time))
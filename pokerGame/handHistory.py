@@ -0,0 +1,298 @@
+from card import Card
+from betStrategy import BetType
+from typing import Iterator
+import mmap
+import os
+import struct
+
+MAGIC = b"PHH1" # starts every hand history file
+LENGTH = struct.Struct("<I") # length of the record that follows
+
+class HandRecord:
+    """
+    What happened in one hand: who was dealt in (seat, stack before the
+    blinds, pocket cards), the board, every action in order as (seat, bet
+    type, amount) like Game.apply takes them, the winning seats and the pot
+
+    Stored as (ints as varints):
+        hand, then a byte each for seats, small blind seat, players dealt in
+        and board cards
+        each player's seat (a byte) and stack
+        every pocket card then every board card as 6 bit card indexes
+        the number of actions, then each as a byte (seat << 3 | bet type) and
+        its amount
+        the number of winners and a byte for each of their seats, then the pot
+    so a 6 player hand takes about 65 bytes
+    """
+    MAX_SEATS = 32 # a seat and a bet type share a byte
+
+    def __init__(self, hand : int, seats : int, small_blind : int,
+                 players : list[tuple[int, int, list[Card]]], board : list[Card],
+                 actions : list[tuple[int, BetType, int]], winners : list[int], pot : int) -> None:
+        if seats > HandRecord.MAX_SEATS:
+            raise Exception("Hand histories have at most {} seats!".format(HandRecord.MAX_SEATS))
+
+        self.hand = hand                # number of the hand at its table
+        self.seats = seats              # seats at the table
+        self.small_blind = small_blind  # seat of the small blind
+        self.players = players          # (seat, stack, pocket cards) of each player dealt in
+        self.board = board
+        self.actions = actions
+        self.winners = winners          # seats
+        self.pot = pot
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HandRecord) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return "HandRecord({})".format(self.toText())
+
+    def encode(self) -> bytes:
+        out = bytearray()
+        HandRecord._putVarint(out, self.hand)
+        out += bytes((self.seats, self.small_blind, len(self.players), len(self.board)))
+        for seat, stack, _ in self.players:
+            out.append(seat)
+            HandRecord._putVarint(out, stack)
+
+        cards = [card for _, _, pocket in self.players for card in pocket] + self.board
+        packed = 0
+        for i, card in enumerate(cards):
+            packed |= card.index << (6 * i)
+        out += packed.to_bytes((6 * len(cards) + 7) // 8, "little")
+
+        HandRecord._putVarint(out, len(self.actions))
+        for seat, bet_type, amount in self.actions:
+            out.append(seat << 3 | bet_type)
+            HandRecord._putVarint(out, amount)
+
+        out.append(len(self.winners))
+        out += bytes(self.winners)
+        HandRecord._putVarint(out, self.pot)
+        return bytes(out)
+
+    @staticmethod
+    def decode(data : bytes) -> "HandRecord":
+        hand, position = HandRecord._getVarint(data, 0)
+        seats, small_blind, player_count, board_count = data[position:position + 4]
+        position += 4
+        stacks = []
+        for _ in range(player_count):
+            seat = data[position]
+            stack, position = HandRecord._getVarint(data, position + 1)
+            stacks.append((seat, stack))
+
+        card_count = 2 * player_count + board_count
+        size = (6 * card_count + 7) // 8
+        packed = int.from_bytes(data[position:position + size], "little")
+        position += size
+        cards = [Card.ALL[packed >> (6 * i) & 63] for i in range(card_count)]
+        players = [(seat, stack, cards[2 * i:2 * i + 2]) for i, (seat, stack) in enumerate(stacks)]
+
+        action_count, position = HandRecord._getVarint(data, position)
+        actions = []
+        for _ in range(action_count):
+            packed_action = data[position]
+            amount, position = HandRecord._getVarint(data, position + 1)
+            actions.append((packed_action >> 3, BetType(packed_action & 7), amount))
+
+        winner_count = data[position]
+        winners = list(data[position + 1:position + 1 + winner_count])
+        pot, position = HandRecord._getVarint(data, position + 1 + winner_count)
+        return HandRecord(hand, seats, small_blind, players, cards[2 * player_count:], actions, winners, pot)
+
+    @staticmethod
+    def _putVarint(out : bytearray, value : int) -> None:
+        """
+        Add an int 7 bits a byte, the high bit set on all but the last
+        """
+        while value > 127:
+            out.append(value & 127 | 128)
+            value >>= 7
+        out.append(value)
+
+    @staticmethod
+    def _getVarint(data : bytes, position : int) -> tuple[int, int]:
+        """
+        Read an int added by _putVarint, returns it and the position after it
+        """
+        value = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 127) << shift
+            if byte < 128:
+                return (value, position)
+            shift += 7
+
+    def toText(self) -> str:
+        """
+        Write the hand as a line of text, fields split by |
+            hand|seats|small blind|seat:stack:cards ...|board|seat:action:amount ...|winner,...|pot
+        ex: 12|6|2|0:800:AsKd 1:780:7h7c|AhKc2d7s9s|0:call:20 1:fold:0|0|50
+        """
+        return "|".join((str(self.hand), str(self.seats), str(self.small_blind),
+                         " ".join("{}:{}:{}".format(seat, stack, Card.toText(pocket))
+                                  for seat, stack, pocket in self.players),
+                         Card.toText(self.board),
+                         " ".join("{}:{}:{}".format(seat, bet_type.name.lower(), amount)
+                                  for seat, bet_type, amount in self.actions),
+                         ",".join(str(seat) for seat in self.winners),
+                         str(self.pot)))
+
+    @staticmethod
+    def fromText(line : str) -> "HandRecord":
+        """
+        Read a hand written by toText
+        """
+        fields = line.strip().split("|")
+        if len(fields) != 8:
+            raise Exception("A hand has 8 fields, not {}: {}".format(len(fields), line))
+
+        hand, seats, small_blind, players, board, actions, winners, pot = fields
+        player_list = []
+        for player in players.split():
+            seat, stack, pocket = player.split(":")
+            player_list.append((int(seat), int(stack), Card.fromText(pocket)))
+        action_list = []
+        for action in actions.split():
+            seat, bet_type, amount = action.split(":")
+            action_list.append((int(seat), BetType[bet_type.upper()], int(amount)))
+
+        return HandRecord(int(hand), int(seats), int(small_blind), player_list, Card.fromText(board),
+                          action_list, [int(seat) for seat in winners.split(",") if seat], int(pot))
+
+class HandHistoryWriter:
+    """
+    Appends hands to a hand history file, through a large buffer so writing
+    a hand is usually just a copy in memory. Opening an existing file adds
+    to it, after cutting off a hand left half written (so it can't swallow
+    the hands written after it)
+    """
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, path : str) -> None:
+        self.file = open(path, "a+b", buffering=HandHistoryWriter.BUFFER_SIZE)
+        end = HandHistoryWriter._completeEnd(self.file, path)
+        self.file.truncate(end)
+        if end == 0:
+            self.file.write(MAGIC)
+        self.hands = 0 # written by this writer
+
+    @staticmethod
+    def _completeEnd(history, path : str) -> int:
+        """
+        Find where the last complete hand in a file ends by going through the
+        length of each, 0 if the file has no header yet
+        """
+        history.seek(0)
+        header = history.read(len(MAGIC))
+        if len(header) < len(MAGIC) and MAGIC.startswith(header):
+            return 0
+        if header != MAGIC:
+            raise Exception("{} is not a hand history file!".format(path))
+
+        size = os.fstat(history.fileno()).st_size
+        position = len(MAGIC)
+        while position + LENGTH.size <= size:
+            history.seek(position)
+            (length,) = LENGTH.unpack(history.read(LENGTH.size))
+            if position + LENGTH.size + length > size:
+                break
+            position += LENGTH.size + length
+
+        return position
+
+    def write(self, record : HandRecord) -> None:
+        body = record.encode()
+        self.file.write(LENGTH.pack(len(body)))
+        self.file.write(body)
+        self.hands += 1
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def readHands(path : str, memory_map : bool = False) -> Iterator[HandRecord]:
+    """
+    Go through the hands in a hand history file one at a time, so files of
+    any size can be read. With memory_map the file is mapped instead of read
+    in (the OS pages it in as needed). A hand cut short at the end (the
+    writer was stopped mid write) is left out
+    """
+    with open(path, "rb") as history:
+        if history.read(len(MAGIC)) != MAGIC:
+            raise Exception("{} is not a hand history file!".format(path))
+
+        if memory_map:
+            with mmap.mmap(history.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                position = len(MAGIC)
+                while position + LENGTH.size <= len(mapped):
+                    (length,) = LENGTH.unpack_from(mapped, position)
+                    start = position + LENGTH.size
+                    if start + length > len(mapped):
+                        return
+                    yield HandRecord.decode(mapped[start:start + length])
+                    position = start + length
+            return
+
+        while True:
+            prefix = history.read(LENGTH.size)
+            if len(prefix) < LENGTH.size:
+                return
+            (length,) = LENGTH.unpack(prefix)
+            body = history.read(length)
+            if len(body) < length:
+                return
+            yield HandRecord.decode(body)
+
+def exportText(history_path : str, text_path : str) -> int:
+    """
+    Write every hand of a hand history file as a line of text, returns the
+    number of hands
+    """
+    hands = 0
+    with open(text_path, "w") as text:
+        for record in readHands(history_path):
+            text.write(record.toText() + "\n")
+            hands += 1
+
+    return hands
+
+def importText(text_path : str, history_path : str) -> int:
+    """
+    Add the hands in a text file (a line each, see HandRecord.toText) to a
+    hand history file, returns the number of hands
+    """
+    with open(text_path) as text, HandHistoryWriter(history_path) as writer:
+        for line in text:
+            if line.strip():
+                writer.write(HandRecord.fromText(line))
+
+        return writer.hands
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert hand histories between binary and text")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="write a hand history file as text")
+    export_parser.add_argument("history")
+    export_parser.add_argument("text")
+    import_parser = commands.add_parser("import", help="add hands written as text to a hand history file")
+    import_parser.add_argument("text")
+    import_parser.add_argument("history")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print("{} hands exported".format(exportText(args.history, args.text)))
+    else:
+        print("{} hands imported".format(importText(args.text, args.history)))
@@ -1,4 +1,5 @@
 from handBuilder import HandBuilder, HandVal
+from handEvaluator import HandEvaluator
 from card import Card
 
 class HandStrat:
@@ -23,6 +24,14 @@ class HandStrat:
 
         return ([], HandVal.NO_HAND)
 
+    def handStrength(self) -> int:
+        """
+        Execute on the strategy and get the strength of the constructed hand,
+        higher strengths beat lower ones and equal strengths split the pot
+        """
+        hand = self.execute()
+        return HandEvaluator.handKey(hand[0], hand[1])
+
 class BestHandStrat(HandStrat):
     """
     Strategy where creating the best hand is attempted
@@ -71,4 +80,34 @@ class WorstHandStrat(HandStrat):
     def execute(self) -> tuple[list[Card], HandVal]:
         super().execute()
 
-        return self.builder.checkHighCard()
\ No newline at end of file
+        return self.builder.checkHighCard()
+
+class LookupHandStrat(HandStrat):
+    """
+    Strategy where the best hand is found with the precomputed tables
+    of HandEvaluator instead of the HandBuilder check chain
+    """
+    def __init__(self):
+        super().__init__()
+        self.cards : list[Card] = []
+
+    def takeInCards(self, cards : list[Card]) -> None:
+        # no HandBuilder needed, the cards are only looked up
+        self.cards = cards
+
+    def execute(self) -> tuple[list[Card], HandVal]:
+        if not self.cards:
+            raise Exception("Can't execute hand building strategy without getting cards first!")
+
+        result_hand = HandEvaluator.bestHand(self.cards)
+        self.cards = []
+        return result_hand
+
+    def handStrength(self) -> int:
+        if not self.cards:
+            raise Exception("Can't execute hand building strategy without getting cards first!")
+
+        # strength comes straight from the tables, no need to build the hand
+        strength = HandEvaluator.evaluate(self.cards)
+        self.cards = []
+        return strength
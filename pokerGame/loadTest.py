@@ -0,0 +1,111 @@
+from pokerServer import PokerServer
+from metrics import Histogram
+from random import Random
+from time import perf_counter
+import asyncio
+import json
+
+class LoadResult:
+    """
+    What the bots of a load test saw: actions taken, hands dealt and the
+    latency of each action (sent until the table showed it taken)
+    """
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.actions = 0
+        self.hands = 0
+        self.connected = 0
+        self.elapsed = 0.0
+
+    def report(self) -> str:
+        return ("{} bots, {} hands dealt, {} actions ({:.0f}/s)\n"
+                "action latency ms: p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}").format(
+            self.connected, self.hands, self.actions, self.actions / max(self.elapsed, 1e-9),
+            self.latency.percentile(50) * 1e3, self.latency.percentile(95) * 1e3,
+            self.latency.percentile(99) * 1e3, self.latency.max * 1e3)
+
+async def bot(number : int, result : LoadResult, stop : float, host : str, port : int,
+              path : str | None, think : float) -> None:
+    """
+    Join the server and play random legal actions until stop (a loop time)
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    rng = Random(number)
+    seat = None
+    sent = None # when the action being waited on was sent
+    try:
+        writer.write((json.dumps({"type": "join", "name": "load bot " + str(number)}) + "\n").encode())
+        while loop.time() < stop:
+            try:
+                line = await asyncio.wait_for(reader.readline(), stop - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "act":
+                if think:
+                    await asyncio.sleep(rng.random() * think)
+                action = rng.choice(message["legal"][1:] if rng.random() > 0.1 else message["legal"])
+                sent = perf_counter()
+                writer.write((json.dumps({"move": message["move"], "action": action[0]}) + "\n").encode())
+            elif kind == "action" and message["seat"] == seat and sent is not None:
+                result.latency.observe(perf_counter() - sent)
+                result.actions += 1
+                sent = None
+            elif kind == "hand":
+                result.hands += 1
+            elif kind == "seated":
+                seat = message["seat"]
+                result.connected += 1
+            elif kind == "full":
+                break
+    finally:
+        writer.close()
+
+async def loadTest(bots : int, duration : float, host : str = "127.0.0.1", port : int = 8765,
+                   path : str | None = None, think : float = 0.0, local_seats : int | None = None) -> LoadResult:
+    """
+    Connect bots to a server and play for duration seconds. With local_seats
+    a server with enough tables of that many seats is started in this process
+    first (the bots then share its event loop, so latencies include them)
+    """
+    server = None
+    if local_seats is not None:
+        server = PokerServer(-(-bots // local_seats), local_seats)
+        port = await server.start(host, 0, path) or port
+
+    result = LoadResult()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        await asyncio.gather(*(bot(number, result, start + duration, host, port, path, think)
+                               for number in range(bots)))
+    finally:
+        result.elapsed = loop.time() - start
+        if server is not None:
+            await server.stop()
+
+    return result
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test a poker server with many connected bots")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to play for")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to this Unix socket instead")
+    parser.add_argument("--think", type=float, default=0.0, help="most seconds a bot waits before acting")
+    parser.add_argument("--local", type=int, metavar="SEATS",
+                        help="start a server with tables of this many seats in this process")
+    args = parser.parse_args()
+    print(asyncio.run(loadTest(args.bots, args.duration, args.host, args.port, args.unix,
+                               args.think, args.local)).report())
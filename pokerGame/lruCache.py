@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Bounded memo that drops the least recently used entry when full, and
+    counts hits, misses and evictions
+    """
+    def __init__(self, max_size : int) -> None:
+        if max_size < 1:
+            raise ValueError("Cache must hold at least one entry")
+
+        self.max_size = max_size
+        self.entries : OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Get a cached value (marking it as recently used) or the default
+        """
+        if key not in self.entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, value) -> None:
+        """
+        Cache a value, evicting the least recently used entry if full
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry and reset the counters
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self.entries), "max_size": self.max_size,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
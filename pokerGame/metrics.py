@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+class Histogram:
+    """
+    Latencies (seconds) counted in buckets that grow by sqrt(2) from 1us to
+    about 20 minutes, so memory stays fixed however many are observed.
+    Percentiles are read from the bucket bounds (within ~20%)
+    """
+    BOUNDS = [1e-6 * 2 ** (i / 2) for i in range(61)]
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(Histogram.BOUNDS) + 1) # last bucket is above every bound
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds : float) -> None:
+        self.buckets[bisect_left(Histogram.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent : float) -> float:
+        """
+        Get the latency percent of the observations are at or below
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for i, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(Histogram.BOUNDS[i], self.max) if i < len(Histogram.BOUNDS) else self.max
+
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        return {"count": self.count, "sum": self.total,
+                "min": self.min if self.count else 0.0, "max": self.max,
+                "p50": self.percentile(50), "p95": self.percentile(95), "p99": self.percentile(99)}
+
+class _Timer:
+    """
+    Times a with block into a histogram
+    """
+    def __init__(self, histogram : Histogram) -> None:
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = perf_counter() - self.start
+        with Metrics._lock:
+            self.histogram.observe(elapsed)
+
+class _NullTimer:
+    """
+    Stands in for a timer while metrics are off
+    """
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+class Metrics:
+    """
+    Counters and latency histograms for the hot paths (hand evaluations,
+    cache hits, bot decisions, showdowns), by call site name
+
+    Off unless enabled (or the POKER_METRICS environment variable is set).
+    While off, call sites only check Metrics.enabled or get a timer that
+    does nothing, so they cost next to nothing
+    """
+    enabled = bool(os.environ.get("POKER_METRICS"))
+    counters : dict[str, int] = {}
+    timers : dict[str, Histogram] = {}
+    _lock = threading.Lock()
+    _NULL_TIMER = _NullTimer()
+
+    @staticmethod
+    def enable(enabled : bool = True) -> None:
+        Metrics.enabled = enabled
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Forget everything recorded so far
+        """
+        with Metrics._lock:
+            Metrics.counters.clear()
+            Metrics.timers.clear()
+
+    @staticmethod
+    def count(name : str, amount : int = 1) -> None:
+        """
+        Add to a counter (check Metrics.enabled first on hot paths)
+        """
+        if not Metrics.enabled:
+            return
+
+        with Metrics._lock:
+            Metrics.counters[name] = Metrics.counters.get(name, 0) + amount
+
+    @staticmethod
+    def timer(name : str) -> _Timer | _NullTimer:
+        """
+        Get a timer for a with block, recorded under name
+        """
+        if not Metrics.enabled:
+            return Metrics._NULL_TIMER
+
+        histogram = Metrics.timers.get(name)
+        if histogram is None:
+            with Metrics._lock:
+                histogram = Metrics.timers.setdefault(name, Histogram())
+
+        return _Timer(histogram)
+
+    @staticmethod
+    def snapshot() -> dict:
+        """
+        Get every counter and a summary (count, sum, percentiles) of every timer
+        """
+        with Metrics._lock:
+            return {"counters": dict(Metrics.counters),
+                    "timers": {name: histogram.summary() for name, histogram in Metrics.timers.items()}}
+
+    @staticmethod
+    def toPrometheus() -> str:
+        """
+        Get everything in the Prometheus text format: counters as counters and
+        timers as histograms in seconds
+        """
+        lines = []
+        with Metrics._lock:
+            for name, value in sorted(Metrics.counters.items()):
+                metric = Metrics._metricName(name) + "_total"
+                lines.append("# TYPE {} counter".format(metric))
+                lines.append("{} {}".format(metric, value))
+
+            for name, histogram in sorted(Metrics.timers.items()):
+                metric = Metrics._metricName(name) + "_seconds"
+                lines.append("# TYPE {} histogram".format(metric))
+                cumulative = 0
+                for bound, bucket in zip(Histogram.BOUNDS, histogram.buckets):
+                    cumulative += bucket
+                    lines.append('{}_bucket{{le="{:.6g}"}} {}'.format(metric, bound, cumulative))
+                lines.append('{}_bucket{{le="+Inf"}} {}'.format(metric, histogram.count))
+                lines.append("{}_sum {}".format(metric, histogram.total))
+                lines.append("{}_count {}".format(metric, histogram.count))
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _metricName(name : str) -> str:
+        return "poker_" + "".join(char if char.isalnum() else "_" for char in name)
+
+    @staticmethod
+    def writeJson(path : str) -> None:
+        Metrics._write(path, json.dumps(Metrics.snapshot(), indent=2))
+
+    @staticmethod
+    def writePrometheus(path : str) -> None:
+        Metrics._write(path, Metrics.toPrometheus())
+
+    @staticmethod
+    def _write(path : str, text : str) -> None:
+        """
+        Write a file in one step, so a reader never sees half of it
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as metrics_file:
+            metrics_file.write(text)
+        os.replace(temp_path, path)
@@ -1,13 +1,14 @@
+from tableState import TableState
+
 class potOdds:
-    def __init__(self):
-        from poker import Game
-        self.game = Game.getInstance()
+    def __init__(self, table : TableState):
+        self.table = table
         
     def potPercent(self, currentBet: int) -> float:
-        return self.game.getPot() / currentBet
+        return self.table.pot / currentBet
 
     def potOddRatio(self, currentBet: int) -> float:
-        return self.game.getPot() / currentBet if currentBet > 0 else float('inf')
+        return self.table.pot / currentBet if currentBet > 0 else float('inf')
 
     # might want to implement some sort of hand win logic so that they aren't betting on a duce and a 7
     def potEquity(self, currentBet: int) -> float:
@@ -20,19 +21,25 @@ class potOdds:
         return 1 / (self.potOddRatio(currentBet) + 1)
 
     def breakEven(self, currentBet: int):
-        return (currentBet/(self.game.getPot() + currentBet))
+        return (currentBet/(self.table.pot + currentBet))
     
     def calcOpponentFold(self, player_name : str) -> float:
         perc = 0
         currMax = 0
-        for oppFold in self.game.opponentFold:
+        for oppFold in self.table.opponent_folds:
             if oppFold.name == player_name:
                 pass
-            elif self.game.opponentFold[oppFold] > currMax:
-                currMax = self.game.opponentFold[oppFold]
-        if self.game.rounds == 0:
+            elif self.table.opponent_folds[oppFold] > currMax:
+                currMax = self.table.opponent_folds[oppFold]
+        if self.table.rounds == 0:
             return perc
-        return (currMax / self.game.rounds)
+        return (currMax / self.table.rounds)
+
+    def opponentCount(self) -> int:
+        """
+        Number of other players still in the hand (not folded)
+        """
+        return max(1, self.table.players_in - 1)
 
     def autoProfit(self, currentBet: int, player_name : str):
         """
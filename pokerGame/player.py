@@ -1,8 +1,10 @@
 from card import Card
-from copy import deepcopy
 from handStrategy import HandStrat
 from handBuilder import HandVal
 from betStrategy import BetStrat, BetType
+from decisionContext import DecisionContext
+from tableState import TableState
+from metrics import Metrics
 
 class Player:
     def __init__(self, name : str, money : int, 
@@ -17,6 +19,7 @@ class Player:
         self.hand_strat = hand_strat
         self.bet_strat = bet_strat
         self.is_agent = is_agent
+        self.context = DecisionContext() # work done for the current hand
     
     def getName(self) -> str:
         return self.name
@@ -49,20 +52,42 @@ class Player:
         return True
     
     def makeBet(self, small_blind : int, big_blind : int, current_bet : int,
-                community_cards : list[Card]) -> tuple[BetType, list[Card] | int]:
+                community_cards : list[Card],
+                table : TableState) -> tuple[BetType, list[Card] | int]:
         """
-        Bet, Call, Fold, Check, or Raise based on betting strategy, blinds, and shown
-        community cards
+        Bet, Call, Fold, Check, or Raise based on betting strategy, blinds, shown
+        community cards and the state of the table
 
         Returns a tuple with the bet type and the bet amount (fold returns the pocket hand)
         """
+        return self.applyBet(self.decideBet(small_blind, big_blind, current_bet, community_cards, table))
 
-        bet_result = self.bet_strat.determineBet(small_blind, big_blind,
-                                                 current_bet,
-                                                 deepcopy(self.pocket_cards), 
-                                                 deepcopy(community_cards),
-                                                 self.name)
-        
+    def decideBet(self, small_blind : int, big_blind : int, current_bet : int,
+                  community_cards : list[Card],
+                  table : TableState,
+                  pocket_cards : list[Card] | None = None,
+                  context : DecisionContext | None = None) -> tuple[BetType, int]:
+        """
+        Ask the betting strategy for a bet without making it, nothing about the
+        player changes so this can run away from the game (ex: on another thread)
+
+        Pocket cards and a context taken when the decision was asked for are
+        used instead of the player's own, so the game can deal a new hand
+        while it is made
+        """
+        with Metrics.timer("player.make_bet"):
+            return self.bet_strat.determineBet(small_blind, big_blind,
+                                               current_bet,
+                                               self.pocket_cards if pocket_cards is None else pocket_cards, 
+                                               community_cards,
+                                               self.name,
+                                               table,
+                                               context=self.context if context is None else context)
+
+    def applyBet(self, bet_result : tuple[BetType, int]) -> tuple[BetType, list[Card] | int]:
+        """
+        Make a bet decided by decideBet
+        """
         if bet_result[0] == BetType.CHECK:
             return (BetType.CHECK, self._check())
         elif bet_result[0] == BetType.FOLD or self.money == 0:
@@ -74,7 +99,7 @@ class Player:
             return (BetType.CALL, self._call(bet_result[1]))
         else: # only bet type left is raise
             return (BetType.RAISE, self._raiseBet(bet_result[1]))
-     
+
     def _fold(self) -> list[Card]:
         """
         Fold and give up pocket cards
@@ -82,7 +107,7 @@ class Player:
         if not self.pocket_cards:
             assert Exception("Can't fold if there are no pocket cards!")
 
-        old_cards = deepcopy(self.pocket_cards)
+        old_cards = list(self.pocket_cards)
         self.clearPocket()
         return old_cards
      
@@ -135,6 +160,9 @@ class Player:
 
         self.pocket_cards.append(card1)
         self.pocket_cards.append(card2)
+        # a new context rather than a reset one, a decision still being made
+        # for the last hand (on another thread) keeps the old one to itself
+        self.context = DecisionContext()
 
     def clearPocket(self) -> None:
         """
@@ -150,8 +178,7 @@ class Player:
         if not self.pocket_cards:
             raise Exception("Can't build a hand if there are no pocket cards!")
 
-        all_cards = deepcopy(self.pocket_cards)
-        all_cards.extend(community_cards)
+        all_cards = self.pocket_cards + community_cards
 
         if len(all_cards) != 7:
             raise Exception("Should have exatly 7 cards to build hand: {}".format(all_cards))
@@ -159,6 +186,21 @@ class Player:
         self.hand_strat.takeInCards(all_cards)
         return self.hand_strat.execute()
 
+    def handStrength(self, community_cards : list[Card]) -> int:
+        """
+        Get the strength of the hand that would be presented for showdown
+        without building the hand, for comparing against other players
+        """
+        if not self.pocket_cards:
+            raise Exception("Can't build a hand if there are no pocket cards!")
+
+        all_cards = self.pocket_cards + community_cards
+        if len(all_cards) != 7:
+            raise Exception("Should have exatly 7 cards to build hand: {}".format(all_cards))
+
+        self.hand_strat.takeInCards(all_cards)
+        return self.hand_strat.handStrength()
+
     def __str__(self):
         return f'Player: {self.name} Cards: {self.pocket_cards} Money: {self.money}'
     
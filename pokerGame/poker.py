@@ -1,17 +1,37 @@
 from player import Player as game_player
-from card import Card, Suit, Rank
-from handStrategy import BestHandStrat
-from betStrategy import RandomStrat, ArguablyOptimalStrat
-from random import shuffle
-from collections import deque
-from handBuilder import HandVal
+from handStrategy import LookupHandStrat
+from betStrategy import RandomStrat, ArguablyOptimalStrat, BetType
+import random
+from deck import Deck
+from seatRing import SeatRing
+from tableState import TableState
+from handHistory import HandRecord, HandHistoryWriter
+from gameEvents import EventSink, PrintSink
+from metrics import Metrics
 
 class Game:
-    GAME = None
-
-    def __init__(self, player_count: int, bot_count=0):
+    MAX_RAISES = 4  # bets and raises allowed in a betting round (limit rules)
+    # legal actions to fall back on, closest first, when a strategy's choice isn't allowed
+    CLOSEST_ACTIONS = {BetType.FOLD: (BetType.FOLD,),
+                       BetType.CHECK: (BetType.CHECK, BetType.CALL),
+                       BetType.CALL: (BetType.CALL, BetType.CHECK),
+                       BetType.BET: (BetType.BET, BetType.RAISE, BetType.CALL, BetType.CHECK),
+                       BetType.RAISE: (BetType.RAISE, BetType.BET, BetType.CALL, BetType.CHECK)}
+
+    def __init__(self, player_count: int, bot_count=0,
+                 players : list[game_player] | None = None,
+                 events : EventSink | None = None,
+                 rng : random.Random | None = None,
+                 deck_batch : int = 0,
+                 history : HandHistoryWriter | None = None):
         """
         Creates a game and initializes players with hands.
+
+        players seats those players instead of the default table, events
+        receives what happens in the game (printed by default) and rng
+        shuffles the deck (the random module by default, seed one to replay games).
+        deck_batch makes deck shuffles that many hands at a time with numpy.
+        history gets a record of every hand played with the headless api
         """
 
         """
@@ -27,12 +47,21 @@ class Game:
             not currently doing anything
         """
 
-        if player_count > 22 or player_count < 1:
-            raise ValueError("Player count must be between 1 and 22")
-        
-        self.players = [game_player("player " + str(x+1), 800, BestHandStrat(), RandomStrat()) for x in range(player_count)]
-        self.players += [game_player("random agent " + str(x+1), 800, BestHandStrat(), RandomStrat(), is_agent=True) for x in range(int(bot_count-1))]
-        self.players += [game_player("optimal agent " + str(x+1), 800, BestHandStrat(), ArguablyOptimalStrat(), is_agent=True) for x in range(1)]
+        if players is not None:
+            if len(players) > 22 or len(players) < 2:
+                raise ValueError("Player count must be between 2 and 22")
+            self.players = list(players)
+        else:
+            if player_count > 22 or player_count < 1:
+                raise ValueError("Player count must be between 1 and 22")
+
+            self.players = [game_player("player " + str(x+1), 800, LookupHandStrat(), RandomStrat()) for x in range(player_count)]
+            self.players += [game_player("random agent " + str(x+1), 800, LookupHandStrat(), RandomStrat(), is_agent=True) for x in range(int(bot_count-1))]
+            self.players += [game_player("optimal agent " + str(x+1), 800, LookupHandStrat(), ArguablyOptimalStrat(), is_agent=True) for x in range(1)]
+        self.events = events if events is not None else PrintSink()
+        self.rng = rng if rng is not None else random
+        self.deck = Deck(self.rng, deck_batch)
+        self.history = history
         # set the players to agents somewhere here by setting "player".is_agent to True
         self.game_state = 0
         self.moves = ("check", "bet", "fold")
@@ -40,15 +69,20 @@ class Game:
         self.opponentFold = {player: 0.0 for player in self.players}
         self.rounds = 0
         self.currnum_players = len(self.players)
+        self.seats = SeatRing([True] * len(self.players))
+        self.stake_cap = 0
+        self.hand_over = True # no hand being played by the headless api
         #self.reset_game()
-        Game.GAME = self
-    
-    @staticmethod
-    def getInstance():
-        return Game.GAME
     
     def getPot(self) -> int:
         return self.current_pot
+
+    def table_state(self) -> TableState:
+        """
+        Get what bet strategies may know about this table, passed to each
+        decision (the fold counts are the game's own, not a copy)
+        """
+        return TableState(self.current_pot, self.currnum_players, self.opponentFold, self.rounds)
         
     def reset_game(self):
         """
@@ -65,8 +99,6 @@ class Game:
         big_blind_amount: i think this and the next are self explanatory
         small_blind_amount
         """
-        self.deck = deque([Card(rank, suit) for suit in Suit for rank in Rank])
-        self.shuffle_deck()
         self.field = []
         self.current_players = []
         for player in self.players:
@@ -75,7 +107,9 @@ class Game:
                 player.clearBet()
             else:
                 self.current_players.append(0)
-        self.currnum_players = len(self.current_players)
+        self.seats = SeatRing([player != 0 for player in self.current_players])
+        self.currnum_players = len(self.seats)
+        self.shuffle_deck()
         self.current_bet = self.current_turn = self.total_pot = self.current_pot = self.game_state = 0
         self.max_bet = min([player.getMoney() for player in self.current_players if player != 0]) # the max bet a player can make is the maximum amount of money the poorest player has
         self.big_blind_amount = 20
@@ -90,13 +124,8 @@ class Game:
 
         # rotate blinds
         # ^ players currently active in a round I'm assuming?
-        self.blind_position = (self.blind_position + 1) % len(self.current_players)
-        while self.current_players[self.blind_position] == 0:
-            self.blind_position = (self.blind_position + 1) % len(self.current_players)
-        
-        bbpos = (self.blind_position + 1) % len(self.current_players)
-        while self.current_players[bbpos] == 0:
-            bbpos = (bbpos + 1) % len(self.current_players)
+        self.blind_position = self.seats.next(self.blind_position % len(self.current_players))
+        bbpos = self.seats.next(self.blind_position)
 
         # blind logic
         self.small_blind = {"bet": self.small_blind_amount, "index": self.blind_position}
@@ -104,8 +133,8 @@ class Game:
         self.sb_player = self.current_players[self.small_blind['index']]
         self.bb_player = self.current_players[self.big_blind['index']]
 
-        print(f"Small Blind: {self.sb_player.getName()}")
-        print(f"Big Blind: {self.bb_player.getName()}")
+        self.events.emit("blinds", "Small Blind: {small}\nBig Blind: {big}",
+                         small=self.sb_player.getName(), big=self.bb_player.getName())
 
         if self.max_bet > 10:
             self.sb_player.makeBetManual(self.small_blind_amount)
@@ -129,51 +158,55 @@ class Game:
         # setting the stage
         self.deal()
     
-        self.current_turn = (self.big_blind["index"] + 1) % len(self.current_players)
+        self.current_turn = self.seats.next(self.big_blind["index"])
+        self._update_cap()
     
     def shuffle_deck(self) -> None:
-        """Shuffles the deck."""
-        shuffle(self.deck)
+        """Shuffles the cards the hand can deal (2 per player, 5 on the field and 3 burns)."""
+        self.deck.shuffle(2 * self.currnum_players + 8)
     
     def deal(self) -> None:
         """Deals pocket cards to all active players."""
-        for player in self.current_players:
-            if player != 0:
-                player.pocket_cards.clear() # maybe need to remove?  
-                player.recievePocket(self.deck.popleft(), self.deck.popleft())
+        for seat in self.seats:
+            player = self.current_players[seat]
+            player.pocket_cards.clear() # maybe need to remove?  
+            player.recievePocket(self.deck.deal(), self.deck.deal())
     
     def flop(self) -> None:
         self.burn()
         self.current_bet = 0
-        self.field.extend([self.deck.popleft() for _ in range(3)])
+        self.field.extend([self.deck.deal() for _ in range(3)])
         self.game_state = 1
-        self.current_turn = self.blind_position
+        self.current_turn = self.seats.first(self.blind_position)
     
     def turn(self) -> None:
         self.burn()
         self.current_bet = 0
-        self.field.append(self.deck.popleft())
+        self.field.append(self.deck.deal())
         self.game_state = 2
-        self.current_turn = self.blind_position
+        self.current_turn = self.seats.first(self.blind_position)
     
     def river(self) -> None:
         self.current_bet = 0
         self.burn()
-        self.field.append(self.deck.popleft())
+        self.field.append(self.deck.deal())
         self.game_state = 3
-        self.current_turn = self.blind_position
+        self.current_turn = self.seats.first(self.blind_position)
     
     def burn(self) -> None:
-        self.deck.popleft()
+        self.deck.deal()
     
     def fold(self, index):
 
         player = self.current_players[index]
-        print(f"{player.getName()} has folded.")
+        self.events.emit("fold", "{player} has folded.", player=player.getName())
         self.currnum_players -= 1
 
         # removes player
         self.current_players[index] = 0
+        self.seats.fold(index)
+        if self.currnum_players > 1 and player.bet + player.money == self.stake_cap:
+            self._update_cap() # the poorest player left
 
         # fold stuff
         if player in self.opponentFold:
@@ -181,7 +214,7 @@ class Game:
 
         # turns
         if self.currnum_players > 0:
-            self.current_turn = (self.current_turn + 1) % len(self.current_players)  
+            self.current_turn = self.seats.next(self.current_turn)
         else:
             self.current_turn = 0  
 
@@ -194,53 +227,47 @@ class Game:
         """Betting Rounds"""
 
         if self.game_state == 0:
-            self.current_turn = (self.blind_position + 2) % len(self.current_players)
+            self.current_turn = self.seats.next(self.big_blind["index"])
         else:
-            self.current_turn = self.blind_position
+            self.current_turn = self.seats.first(self.blind_position)
 
         if self.currnum_players <= 1:
             return  
 
-        print("\n--- Betting Round ---")
+        self.events.emit("round", "\n--- Betting Round ---")
 
-        players_acted = {player: False for player in self.current_players if player != 0}  
+        self.seats.newRound()
 
         while True:
 
             if self.currnum_players <= 1:
-                for player in self.current_players:
-                    if player != 0:
-                        p = player 
-                        break
-                print(f"{p.getName()} wins the round!")
+                p = self.current_players[self.seats.first(0)]
+                self.events.emit("win", "{player} wins the round!", player=p.getName())
 
                 self.total_pot+=self.current_pot
                 p.money += self.total_pot
-                for player in self.current_players:
-                    if player != 0:
-                        player.clearBet()
+                p.clearBet()
                 return  
 
             player = self.current_players[self.current_turn]
 
-            if players_acted[player] and all(p.money == 0 or players_acted[p] for p in self.current_players):
-                for player in self.current_players:
-                    if player != 0:
-                        player.clearBet()
+            if self.seats.complete():
+                for seat in self.seats:
+                    self.current_players[seat].clearBet()
                 break  
 
             # more info in the round
-            print(f"The total pot is: ${self.total_pot}.")
-            print(f"The current pot is: ${self.current_pot}.")
-            print(f"The current bet is : ${self.current_bet}.")
-            print(f"The max bet is : ${self.max_bet}.")
+            self.events.emit("pot", "The total pot is: ${total}.\nThe current pot is: ${current}.\n"
+                             "The current bet is : ${bet}.\nThe max bet is : ${max_bet}.",
+                             total=self.total_pot, current=self.current_pot,
+                             bet=self.current_bet, max_bet=self.max_bet)
 
             # prompt
             while True:
                 action = input(f"{player.getName()}, enter action (check, bet, fold): ").strip().lower()
                 if action in self.moves:
                     break
-                print("Invalid choice, try again.")
+                self.events.emit("prompt", "Invalid choice, try again.")
 
             if action == "fold":
                 self.fold(self.current_turn)
@@ -251,24 +278,24 @@ class Game:
                         bet_amount = int(input(f"{player.getName()}, enter bet amount: "))
                         # checks if the bet is more than player money, if so go all in
                         if bet_amount > player.money:
-                            print("You don't have enough chips! Using all your money for checks instead.")
+                            self.events.emit("prompt", "You don't have enough chips! Using all your money for checks instead.")
                             bet_amount = player.money
                         # checks if bet is more than current bet
                             # this one is currenlt broken and needs fixing, I put comments below
                         if bet_amount < self.current_bet:
-                            print("Your bet is not high enough, please try again.")
+                            self.events.emit("prompt", "Your bet is not high enough, please try again.")
                         # checks for the max bet
                         elif bet_amount > self.max_bet:
-                            print("Your bet amount exceeds the max bet amount, please try again.")
+                            self.events.emit("prompt", "Your bet amount exceeds the max bet amount, please try again.")
                         else:
-                            print(f"Your bet amount of ${bet_amount} was accepted.")
+                            self.events.emit("prompt", "Your bet amount of ${amount} was accepted.", amount=bet_amount)
                             break
                     except ValueError:
-                        print("Invalid amount. Please enter a number.")
+                        self.events.emit("prompt", "Invalid amount. Please enter a number.")
                 
                 # different betting method if it is an agent
                 if player.is_agent:
-                    player.makeBet(1, bet_amount, self.current_bet, self.field)
+                    player.makeBet(1, bet_amount, self.current_bet, self.field, self.table_state())
                     # idk how u wanna implement this wiht the pot stuff
                 # player uses manual bets
                 else:
@@ -277,19 +304,19 @@ class Game:
 
                 self.current_bet += bet_amount # broken, need to change how this works
                 self.max_bet = min(player.getMoney() for player in self.players)
-                players_acted = {p: False for p in self.current_players}  
+                self.seats.raised(self.current_turn)
             elif action == "check":
                 # note that it should never occur that the player cannot check since 
                 # it should always check for the least amount of money
                 self.check(player) # need to change how current_bet works
+                self.seats.act(self.current_turn)
 
-            players_acted[player] = True
-            self.current_turn = (self.current_turn + 1) % len(self.current_players)  # Rotate 
+            if player.money == 0:
+                self.seats.allIn(self.current_turn)
+            self.current_turn = self.seats.next(self.current_turn)  # Rotate 
 
-        print("\n--- Betting done ---")
-
-        for player in self.players:
-            print(f"{player.getName()} - Money: ${player.getMoney()}")
+        self.events.emit("round", "\n--- Betting done ---")
+        self.display_balances()
 
         self.total_pot+=self.current_pot
         self.current_pot = 0 # reset current pot for new round
@@ -310,7 +337,7 @@ class Game:
             action = input(f"{player.getName()}, (check, bet, fold): ").strip().lower()
             if action in self.moves:
                 return action
-            print("invalid.")
+            self.events.emit("prompt", "invalid.")
 
     def showdown(self) -> list[game_player]:
         """
@@ -320,64 +347,40 @@ class Game:
         If multiple players have the exact same hand (playing the board) 
         then the pot is split between all remaining players
         """
+        with Metrics.timer("game.showdown"):
+            return self._showdown()
+
+    def _showdown(self) -> list[game_player]:
         if len(self.current_players) == 1:
             winner = self.current_players[0]
-            print(f"{winner.getName()} wins. Only player left")
+            self.events.emit("showdown", "{player} wins. Only player left", player=winner.getName())
             return [winner]
 
-        print("\n--- Showdown ---")
-        print("Field: {}".format(self.field))
-        
-        hands = {}
+        self.events.emit("showdown", "\n--- Showdown ---\nField: {field}", field=list(self.field))
         
-        # Get the player(s) associated with each hand
+        # Get the strength of each player's hand, strengths order hands
+        # completely (type of hand, then the ranks that break ties)
+        strengths = {}
         for player in self.current_players:
             if player != 0:
-                pocket_cards = player.pocket_cards 
-                print("{} shows: {}".format(player.getName(), pocket_cards))
-                
-                result = player.constructHand(self.field)
-                # convert list->tuple so hand can be a dictionary key
-                player_hand = (tuple(result[0]), result[1]) 
-                print("{} shows: {}".format(player.getName(), 
-                                            player_hand[0]))
-
-                if hands.get(player_hand) is not None:
-                    hands.get(player_hand).append(player)
-                else:
-                    hands[player_hand] = [player]
+                self.events.emit("show", "{player} shows: {cards}", player=player.getName(),
+                                 cards=list(player.pocket_cards))
+                strengths[player] = player.handStrength(self.field)
+
+        # player(s) with the strongest hand, more than one means a split pot
+        best_strength = max(strengths.values())
+        winners : list[game_player] = [player for player, strength in strengths.items()
+                                       if strength == best_strength]
+
+        self.events.emit("showdown", "There are {count} winners:", count=len(winners))
+        if not self.events.watching:
+            return winners
 
-        # Find the highest hand type (ex: Flush)
-        best_value = 0
-        for hand in hands.keys():
-            if hand[1].value > best_value:
-                best_value = hand[1].value
-        
-        # Get all hands of the highest type (ex: all Flushes)
-        best_hands = []
-        for hand in hands.keys():
-            if hand[1].value == best_value:
-                best_hands.append(hand)
-        
-        # Get the hand with the highest cards (ex: royal flush vs Q-8 Straight Flush)
-        highest_hand = ((Card(Rank.TWO, Suit.SPADE),
-                         Card(Rank.TWO, Suit.SPADE),
-                         Card(Rank.TWO, Suit.SPADE),
-                         Card(Rank.TWO, Suit.SPADE),
-                         Card(Rank.TWO, Suit.SPADE)), 
-                        HandVal.NO_HAND)
-        for hand in best_hands:
-            for i in range(0, 5):
-                if hand[0][i].getRank() > highest_hand[0][i].getRank():
-                    highest_hand = hand
-        
-        # get player(s) associated with the highest hand
-        winners : list[game_player] = hands.get(highest_hand)
-        print(hands)
-        print(self.field)
-        print("There are {} winners:".format(len(winners)))
         for best_player in winners:
-            print("\n{} wins with the strongest cards.".format(best_player.getName()))
+            # only build the 5 card hand when it's shown
+            best_hand = best_player.constructHand(self.field)
+            self.events.emit("best hand", "\n{player} wins with the strongest cards: {hand} ({value})",
+                             player=best_player.getName(), hand=best_hand[0], value=best_hand[1].name)
         
         return winners
 
@@ -400,48 +403,47 @@ class Game:
         """
         while True:
             if len([p for p in self.players if p.money > 0]) < 2:
-                print("Not enough players to continue. Game Over!")
+                self.events.emit("game over", "Not enough players to continue. Game Over!")
                 break
 
-            print("\n===== Starting a New Round =====")
+            self.events.emit("new hand", "\n===== Starting a New Round =====")
 
             self.reset_game()
             
             # Player Balances
-            print("\n--- Player Balances ---")
-            for player in self.players:
-                print(f"{player.getName()} - Money: ${player.getMoney()}")
+            self.events.emit("round", "\n--- Player Balances ---")
+            self.display_balances()
 
             # Pre-flop betting round
-            print("\n--- Pre-Flop Betting Round ---")
+            self.events.emit("street", "\n--- Pre-Flop Betting Round ---")
             self.play_turns()
             
             if len(self.current_players) <= 1:
-                print(f"{self.current_players[0].getName()} wins this round!")
+                self.events.emit("win", "{player} wins this round!", player=self.current_players[0].getName())
                 continue  # Move to next round if only one player remains
 
             # Flop
-            print("\n--- Flop ---")
+            self.events.emit("street", "\n--- Flop ---")
             self.flop()
             self.display_field()
             self.play_turns()
 
             if len(self.current_players) <= 1:
-                print(f"{self.current_players[0].getName()} wins this round!")
+                self.events.emit("win", "{player} wins this round!", player=self.current_players[0].getName())
                 continue
 
             # Turn
-            print("\n--- Turn ---")
+            self.events.emit("street", "\n--- Turn ---")
             self.turn()
             self.display_field()
             self.play_turns()
 
             if len(self.current_players) <= 1:
-                print(f"{self.current_players[0].getName()} wins this round!")
+                self.events.emit("win", "{player} wins this round!", player=self.current_players[0].getName())
                 continue
 
             # River
-            print("\n--- River ---")
+            self.events.emit("street", "\n--- River ---")
             self.river()
             self.display_field()
             self.play_turns()
@@ -458,11 +460,213 @@ class Game:
             input("\nPress Enter to start the next round...")
 
 
+    # Headless api: a hand is a state machine moved along by apply, so games
+    # can run without input() or a GUI. Actions are (BetType, amount) like the
+    # bet strategies return: CALL and RAISE give the bet to reach, BET the amount
+
+    def start_hand(self) -> bool:
+        """
+        Start a new hand (blinds posted, pocket cards dealt), returns False if
+        there aren't enough players with money left
+        """
+        self.reset_game()
+        if self.currnum_players < 2:
+            self.hand_over = True
+            return False
+
+        self.hand_over = False
+        self.raises = 0
+        if self.history is not None:
+            # stacks from before the blinds, pocket cards before anyone folds
+            self.hand_players = [(seat, self.current_players[seat].money + self.current_players[seat].bet,
+                                  list(self.current_players[seat].pocket_cards)) for seat in self.seats]
+            self.hand_actions = []
+        return True
+
+    def _update_cap(self) -> None:
+        """
+        Find the most the poorest player still in can put in this street
+        (their bet plus money, which betting doesn't change)
+        """
+        self.stake_cap = min(self.current_players[seat].bet + self.current_players[seat].money
+                             for seat in self.seats)
+
+    def to_act(self) -> game_player:
+        """
+        Get the player whose turn it is
+        """
+        if self.hand_over:
+            raise Exception("No hand is being played!")
+
+        return self.current_players[self.current_turn]
+
+    def legal_actions(self) -> list[tuple[BetType, int]]:
+        """
+        Get the actions the player to act can take. Raises are limited to
+        MAX_RAISES a street and to what every player still in can call, so
+        nobody is ever all in for less (no side pots)
+        """
+        player = self.to_act()
+        actions = [(BetType.FOLD, 0)]
+        if player.bet == self.current_bet:
+            actions.append((BetType.CHECK, 0))
+        else:
+            actions.append((BetType.CALL, self.current_bet))
+
+        raise_to = self.current_bet + self.big_blind_amount
+        if self.raises < Game.MAX_RAISES and raise_to <= self.stake_cap:
+            if self.current_bet == 0:
+                actions.append((BetType.BET, self.big_blind_amount))
+            else:
+                actions.append((BetType.RAISE, raise_to))
+
+        return actions
+
+    def bot_action(self) -> tuple[BetType, int]:
+        """
+        Ask the bet strategy of the player to act what to do, turned into the
+        closest legal action (ex: a raise that isn't allowed becomes a call)
+        """
+        player = self.to_act()
+        with Metrics.timer("game.bot_action"):
+            decision = player.bet_strat.determineBet(self.small_blind_amount, self.big_blind_amount,
+                                                     self.current_bet, player.pocket_cards,
+                                                     self.field, player.getName(),
+                                                     context=player.context,
+                                                     table=self.table_state())
+        legal = {action[0]: action for action in self.legal_actions()}
+        for bet_type in Game.CLOSEST_ACTIONS[decision[0]]:
+            if bet_type in legal:
+                return legal[bet_type]
+
+        return legal[BetType.FOLD]
+
+    def apply(self, action : tuple[BetType, int]) -> None:
+        """
+        Make the player to act take an action, then move on to the next
+        player, street or settle the hand
+        """
+        if action not in self.legal_actions():
+            raise Exception("Illegal action: {}".format(action))
+
+        seat = self.current_turn
+        player = self.current_players[seat]
+        bet_type = action[0]
+        if self.history is not None:
+            self.hand_actions.append((seat, bet_type, action[1]))
+        if bet_type == BetType.FOLD:
+            self.fold(seat)
+            if self.currnum_players == 1:
+                self.settle()
+                return
+        elif bet_type == BetType.CHECK or bet_type == BetType.CALL:
+            amount = self.check(player)
+            if amount == 0:
+                self.events.emit("check", "{player} checked.", player=player.getName())
+            else:
+                self.events.emit("call", "{player} called for ${amount}.",
+                                 player=player.getName(), amount=amount)
+            self.seats.act(seat)
+        else:
+            raise_to = action[1] if bet_type == BetType.RAISE else self.current_bet + action[1]
+            amount = raise_to - player.bet
+            player.makeBetManual(amount)
+            self.add_to_pot(amount)
+            self.current_bet = raise_to
+            self.raises += 1
+            self.events.emit("raise", "{player} raises the bet to ${bet}.",
+                             player=player.getName(), bet=raise_to)
+            self.seats.raised(seat)
+
+        if self.seats.complete():
+            self.advance_street()
+        else:
+            self.current_turn = self.seats.next(seat)
+
+    def advance_street(self) -> None:
+        """
+        Close the betting round and deal the next street, or settle the hand
+        after the river. Streets are dealt without betting when at most one
+        player still has money to bet with
+        """
+        while True:
+            for seat in self.seats:
+                self.current_players[seat].clearBet()
+            self.total_pot += self.current_pot
+            self.current_pot = 0
+            self.raises = 0
+            self.seats.newRound()
+
+            if self.game_state == 3:
+                self.settle()
+                return
+
+            if self.game_state == 0:
+                self.flop()
+            elif self.game_state == 1:
+                self.turn()
+            else:
+                self.river()
+            self.events.emit("street", "Cards: {field}", field=list(self.field))
+
+            self._update_cap()
+            betting = sum(1 for seat in self.seats if self.current_players[seat].money > 0)
+            if betting > 1:
+                return
+
+    def settle(self) -> list[game_player]:
+        """
+        Give the pot to the winner(s) of the hand. A split pot is shared evenly,
+        odd chips go to the first winners
+        """
+        remaining = [self.current_players[seat] for seat in self.seats]
+        if len(remaining) == 1:
+            winners = remaining
+        else:
+            winners = self.showdown()
+
+        pot = self.total_pot + self.current_pot
+        share, odd_chips = divmod(pot, len(winners))
+        for i, winner in enumerate(winners):
+            winner.money += share + (1 if i < odd_chips else 0)
+            self.events.emit("win", "{player} wins ${amount}.", player=winner.getName(),
+                             amount=share + (1 if i < odd_chips else 0))
+
+        for player in remaining:
+            player.clearBet()
+        if self.history is not None and not self.hand_over:
+            self.history.write(HandRecord(self.rounds, len(self.current_players), self.small_blind["index"],
+                                          self.hand_players, list(self.field), self.hand_actions,
+                                          [self.current_players.index(winner) for winner in winners], pot))
+        self.total_pot = self.current_pot = self.current_bet = 0
+        self.rounds += 1
+        self.hand_over = True
+        return winners
+
+    def play_hand(self) -> bool:
+        """
+        Play a whole hand with every player acting by their bet strategy,
+        returns False if no hand could be started
+        """
+        if not self.start_hand():
+            return False
+
+        while not self.hand_over:
+            self.apply(self.bot_action())
+
+        return True
+
     def display_field(self):
         """displays cards"""
-        print("Cards:", " ".join(str(card) for card in self.field))
+        self.events.emit("field", "Cards: {field}", field=" ".join(str(card) for card in self.field))
         return
 
+    def display_balances(self):
+        """shows how much money every player has"""
+        for player in self.players:
+            self.events.emit("balance", "{player} - Money: ${money}",
+                             player=player.getName(), money=player.getMoney())
+
 
 #Start game session
 #g = Game(5)
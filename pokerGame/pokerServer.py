@@ -0,0 +1,329 @@
+from poker import Game
+from player import Player
+from handStrategy import LookupHandStrat
+from betStrategy import BetType, RandomStrat, ArguablyOptimalStrat
+from gameEvents import NullSink
+from metrics import Metrics
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+
+class Client:
+    """
+    A connection to a player, sends messages without waiting and queues
+    the actions it answers with
+    """
+    MAX_BUFFER = 1 << 16 # bytes waiting to be sent before the client counts as too slow
+
+    def __init__(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.actions : asyncio.Queue = asyncio.Queue()
+        self.closed = False
+
+    def send(self, message : dict) -> None:
+        if self.closed:
+            return
+
+        self.writer.write((json.dumps(message, separators=(",", ":")) + "\n").encode())
+        if self.writer.transport.get_write_buffer_size() > Client.MAX_BUFFER:
+            Metrics.count("server.slow_clients")
+            self.close()
+
+    async def nextAction(self, move_id : int, timeout : float) -> str | None:
+        """
+        Wait for the client's answer to a move, None if it doesn't come in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.closed:
+            try:
+                answer = await asyncio.wait_for(self.actions.get(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                return None
+            if answer is not None and answer.get("move") == move_id:
+                return answer.get("action")
+
+        return None
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.actions.put_nowait(None) # wakes up a table waiting on an answer
+            self.writer.close()
+
+class Table:
+    """
+    A Game with the clients sitting at it, seats without a client or a bot
+    have no money so hands are dealt without them
+    """
+    def __init__(self, number : int, seats : int, bots : int, stack : int) -> None:
+        self.number = number
+        self.stack = stack
+        players = [Player("seat " + str(seat + 1), 0, LookupHandStrat(), RandomStrat(), is_agent=False)
+                   for seat in range(seats - bots)]
+        players += [Player("bot " + str(bot + 1), stack, LookupHandStrat(), ArguablyOptimalStrat(deadline=0.05),
+                           is_agent=True) for bot in range(bots)]
+        self.game = Game(seats, players=players, events=NullSink())
+        self.clients : list[Client | None] = [None] * seats
+        self.owners : list[Client | None] = [None] * seats # client whose money is on each seat
+        self.seated = asyncio.Event() # set when someone sits down
+        self.move_id = 0
+        self.stacks : list[int] | None = None # money of each seat before the hand being played
+
+    def freeSeat(self) -> int | None:
+        for seat, player in enumerate(self.game.players):
+            if not player.is_agent and self.clients[seat] is None:
+                return seat
+        return None
+
+    def players(self) -> int:
+        return sum(1 for seat, player in enumerate(self.game.players)
+                   if player.is_agent or self.clients[seat] is not None)
+
+    def refund(self) -> None:
+        """
+        Give up the hand being played, every seat gets back what it put in
+        """
+        game = self.game
+        if self.stacks is not None and not game.hand_over:
+            for player, stack in zip(game.players, self.stacks):
+                player.money = stack
+                player.clearBet()
+            game.total_pot = game.current_pot = game.current_bet = 0
+        game.hand_over = True
+
+    def broadcast(self, message : dict) -> None:
+        for client in self.clients:
+            if client is not None:
+                client.send(message)
+
+class PokerServer:
+    """
+    Hosts tables, each played by its own task, and seats clients as they
+    join over TCP or a Unix socket. Bot seats decide on one worker thread
+    so they never hold up the event loop (and share the simulation cache
+    safely)
+
+    Every message is one line of JSON. A client sends
+        {"type": "join", "name": "..."}
+    and gets {"type": "seated", "table": t, "seat": s} (or {"type": "full"}).
+    Then for every hand it is dealt into it gets
+        {"type": "hand", "cards": ["HA", "S10"], "money": 780}
+    when it's its turn
+        {"type": "act", "move": 12, "legal": [["fold", 0], ["call", 20], ["raise", 40]],
+         "bet": 20, "pot": 30, "board": []}
+    which it answers with {"move": 12, "action": "call"}, everyone at the table
+    gets each action taken {"type": "action", "seat": 2, "action": "call", "amount": 20}
+    and at the end of the hand {"type": "end", "money": 800}
+
+    A player that doesn't answer within the timeout checks (or folds if it
+    can't), one that can't keep up with what it's sent is disconnected. Either
+    way only its own table waits, and for at most the timeout
+    """
+    def __init__(self, tables : int, seats : int = 6, bots : int = 0,
+                 stack : int = 800, timeout : float = 5.0) -> None:
+        if bots >= seats:
+            raise Exception("A table needs a seat for clients!")
+
+        self.tables = [Table(number, seats, bots, stack) for number in range(tables)]
+        self.timeout = timeout # seconds a client has to act
+        self.hands = 0
+        self.bot_executor = ThreadPoolExecutor(max_workers=1)
+        self.server : asyncio.AbstractServer | None = None
+        self.tasks : list[asyncio.Task] = []
+        self.running = False
+
+    async def start(self, host : str = "127.0.0.1", port : int = 8765,
+                    path : str | None = None) -> int | None:
+        """
+        Start listening (on a Unix socket if a path is given) and playing,
+        returns the port listened on
+        """
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path, backlog=4096)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        self.running = True
+        self.tasks = [asyncio.create_task(self.playTable(table)) for table in self.tables]
+        if path is not None:
+            return None
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stop listening, disconnect every client and end the tables once their
+        current action is done
+        """
+        self.running = False
+        if self.server is not None:
+            self.server.close()
+        for table in self.tables:
+            table.seated.set() # wakes up tables waiting for players
+            for client in table.clients:
+                if client is not None:
+                    client.close() # wakes up tables waiting on an answer
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+        self.bot_executor.shutdown(wait=False)
+
+    async def handle(self, reader : asyncio.StreamReader, writer : asyncio.StreamWriter) -> None:
+        """
+        Seat a new connection, then queue its answers until it leaves
+        """
+        client = Client(reader, writer)
+        try:
+            join = json.loads(await asyncio.wait_for(reader.readline(), self.timeout))
+        except (asyncio.TimeoutError, ValueError, ConnectionError):
+            client.close()
+            return
+        if not isinstance(join, dict) or join.get("type") != "join":
+            client.close()
+            return
+
+        table, seat = self.seat(client)
+        if table is None:
+            client.send({"type": "full"})
+            client.close()
+            return
+        client.send({"type": "seated", "table": table.number, "seat": seat})
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    answer = json.loads(line)
+                except ValueError:
+                    continue # not a message, ignored
+                if isinstance(answer, dict):
+                    client.actions.put_nowait(answer)
+        except ConnectionError:
+            pass
+        finally:
+            client.close()
+            table.clients[seat] = None # the seat sits out from the next hand
+
+    def seat(self, client : Client) -> tuple[Table | None, int | None]:
+        """
+        Put a client in the first free seat, filling tables in order
+        """
+        for table in self.tables:
+            seat = table.freeSeat()
+            if seat is not None:
+                table.clients[seat] = client
+                table.seated.set()
+                return (table, seat)
+
+        return (None, None)
+
+    async def playTable(self, table : Table) -> None:
+        """
+        Play hands at a table for as long as it has two players
+        """
+        while self.running:
+            if table.players() < 2:
+                table.seated.clear()
+                await table.seated.wait()
+                continue
+
+            try:
+                await self.playHand(table)
+            except Exception:
+                # a bad hand mustn't end the table for everyone at it, it's given up
+                Metrics.count("server.table_errors")
+                table.refund()
+            await asyncio.sleep(0) # a table of bots mustn't starve the others
+
+    async def playHand(self, table : Table) -> None:
+        """
+        Buy in the players seated and play a hand with them
+        """
+        game = table.game
+        for seat, player in enumerate(game.players):
+            client = table.clients[seat]
+            if player.is_agent:
+                if player.money == 0:
+                    player.money = table.stack # buy back in
+            elif client is not None:
+                if client is not table.owners[seat] or player.money == 0:
+                    player.money = table.stack # a new client buys in, never keeps the last one's money
+                    table.owners[seat] = client
+            else:
+                player.money = 0 # empty seat, sits out
+                table.owners[seat] = None
+        table.stacks = [player.money for player in game.players]
+        if not game.start_hand():
+            return
+
+        for seat in game.seats:
+            client = table.clients[seat]
+            if client is not None:
+                client.send({"type": "hand", "cards": [str(card) for card in game.players[seat].pocket_cards],
+                             "money": game.players[seat].money})
+
+        while not game.hand_over and self.running:
+            seat = game.current_turn
+            action = await self.decide(table, seat)
+            game.apply(action)
+            table.broadcast({"type": "action", "seat": seat, "action": action[0].name.lower(),
+                             "amount": action[1]})
+
+        self.hands += 1
+        for seat, client in enumerate(table.clients):
+            if client is not None:
+                client.send({"type": "end", "money": game.players[seat].money})
+
+    async def decide(self, table : Table, seat : int) -> tuple[BetType, int]:
+        """
+        Get the action of the player to act, from its client or bot strategy
+        """
+        game = table.game
+        legal = game.legal_actions()
+        try:
+            if game.players[seat].is_agent:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.bot_executor, game.bot_action)
+
+            client = table.clients[seat]
+            answer = None
+            if client is not None:
+                table.move_id += 1
+                client.send({"type": "act", "move": table.move_id,
+                             "legal": [[action[0].name.lower(), action[1]] for action in legal],
+                             "bet": game.current_bet, "pot": game.total_pot + game.current_pot,
+                             "board": [str(card) for card in game.field]})
+                answer = await client.nextAction(table.move_id, self.timeout)
+
+            for action in legal:
+                if action[0].name.lower() == answer:
+                    return action
+        except Exception:
+            Metrics.count("server.decide_errors") # the player checks or folds instead
+
+        Metrics.count("server.default_actions")
+        return legal[1] if legal[1][0] == BetType.CHECK else legal[0] # check, or fold
+
+async def serve(args) -> None:
+    server = PokerServer(args.tables, args.seats, args.bots, timeout=args.timeout)
+    port = await server.start(args.host, args.port, args.unix)
+    print("Serving {} tables on {}".format(args.tables, args.unix or "{}:{}".format(args.host, port)))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Host poker tables for clients over sockets")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--seats", type=int, default=6)
+    parser.add_argument("--bots", type=int, default=0, help="seats at each table played by the server's own bots")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds a client has to act")
+    asyncio.run(serve(parser.parse_args()))
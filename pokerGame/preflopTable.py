@@ -0,0 +1,232 @@
+from card import Card
+from array import array
+from random import Random
+import os
+import struct
+import sys
+
+class PreflopTable:
+    """
+    Precomputed pre-flop results for the 169 strategically different starting
+    hands (13 pairs, 78 suited and 78 offsuit rank pairs). For each one the
+    table holds the chance of ending with each HandVal and the equity
+    (chance of winning, ties shared) against 1-9 random opponents
+
+    The table is built offline by running this file and stored as a small
+    binary file, see save for the layout
+    """
+    DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflopTable.bin")
+    MAGIC = b"PF69"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHII")    # magic, version, classes, category samples, equity samples
+    CLASSES = 169
+    MAX_OPPONENTS = 9
+    ROW_SIZE = 9 + MAX_OPPONENTS        # HandVal 1-9 probabilities, then equity vs 1-9 opponents
+
+    _rows : array | None = None
+    _loaded = False
+
+    @staticmethod
+    def classIndex(cards : list[Card]) -> int:
+        """
+        Get the starting hand class (0-168) of 2 pocket cards. Classes are laid
+        out as a 13x13 grid of ranks: pairs on the diagonal, suited hands with
+        the high rank as the row, offsuit hands with the high rank as the column
+        """
+        if len(cards) != 2:
+            raise Exception("Starting hand needs exactly 2 cards!")
+
+        high = max(cards[0].index % 13, cards[1].index % 13)
+        low = min(cards[0].index % 13, cards[1].index % 13)
+        if cards[0].getSuit() == cards[1].getSuit():
+            return high * 13 + low
+
+        return low * 13 + high
+
+    @staticmethod
+    def className(class_index : int) -> str:
+        """
+        Get the usual name of a starting hand class (ex: AKs, 72o, QQ)
+        """
+        symbols = "23456789TJQKA"
+        row, column = divmod(class_index, 13)
+        if row == column:
+            return symbols[row] * 2
+        if row > column:
+            return symbols[row] + symbols[column] + "s"
+
+        return symbols[column] + symbols[row] + "o"
+
+    @staticmethod
+    def classCards(class_index : int) -> list[Card]:
+        """
+        Get 2 cards that belong to a starting hand class
+        """
+        row, column = divmod(class_index, 13)
+        if row > column:
+            # suited, both clubs
+            return [Card.ALL[row], Card.ALL[column]]
+
+        # pair or offsuit, club and diamond
+        return [Card.ALL[column], Card.ALL[13 + row]]
+
+    @staticmethod
+    def load(path : str | None = None) -> bool:
+        """
+        Load the table from its file, returns False if there is no table
+        """
+        PreflopTable._loaded = True
+        PreflopTable._rows = None
+        path = path if path is not None else PreflopTable.DEFAULT_PATH
+        if not os.path.exists(path):
+            return False
+
+        with open(path, "rb") as table_file:
+            header = table_file.read(PreflopTable.HEADER.size)
+            magic, version, classes, _, _ = PreflopTable.HEADER.unpack(header)
+            if (magic != PreflopTable.MAGIC or version != PreflopTable.VERSION
+                or classes != PreflopTable.CLASSES):
+                raise Exception("Invalid pre-flop table file: {}".format(path))
+
+            rows = array("f")
+            rows.frombytes(table_file.read())
+
+        if sys.byteorder == "big":
+            rows.byteswap() # stored little endian
+
+        if len(rows) != PreflopTable.CLASSES * PreflopTable.ROW_SIZE:
+            raise Exception("Invalid pre-flop table file: {}".format(path))
+
+        PreflopTable._rows = rows
+        return True
+
+    @staticmethod
+    def save(path : str, rows : list[list[float]],
+             category_samples : int, equity_samples : int) -> None:
+        """
+        Write the table: a 16 byte header (see HEADER) then one row of
+        ROW_SIZE float32 values per class (all little endian). Sample counts
+        of 0 mean the values are exact
+        """
+        values = array("f", [value for row in rows for value in row])
+        if sys.byteorder == "big":
+            values.byteswap()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as table_file:
+            table_file.write(PreflopTable.HEADER.pack(PreflopTable.MAGIC, PreflopTable.VERSION,
+                                                      PreflopTable.CLASSES, category_samples,
+                                                      equity_samples))
+            table_file.write(values.tobytes())
+
+    @staticmethod
+    def _row(cards : list[Card]) -> int | None:
+        """
+        Get where the row for the cards starts, None if there is no table
+        """
+        if not PreflopTable._loaded:
+            PreflopTable.load()
+
+        if PreflopTable._rows is None:
+            return None
+
+        return PreflopTable.classIndex(cards) * PreflopTable.ROW_SIZE
+
+    @staticmethod
+    def getProbs(cards : list[Card]) -> list[float] | None:
+        """
+        Get the hand probabilities (same layout as ProbabilitySim.getProbs)
+        for 2 pocket cards, None if there is no table
+        """
+        start = PreflopTable._row(cards)
+        if start is None:
+            return None
+
+        return [0] + PreflopTable._rows[start:start + 9].tolist()
+
+    @staticmethod
+    def getEquity(cards : list[Card], opponents : int) -> float | None:
+        """
+        Get the equity of 2 pocket cards against some number of random
+        opponents, None if there is no table
+        """
+        if opponents < 1 or opponents > PreflopTable.MAX_OPPONENTS:
+            raise Exception("Pre-flop equity only known for 1-{} opponents".format(PreflopTable.MAX_OPPONENTS))
+
+        start = PreflopTable._row(cards)
+        if start is None:
+            return None
+
+        return PreflopTable._rows[start + 8 + opponents]
+
+def _sampleEquity(cards : list[Card], opponents : int, samples : int, rng : Random) -> float:
+    """
+    Estimate the equity of the cards against random opponents by dealing
+    random opponent hands and boards
+    """
+    from handEvaluator import HandEvaluator
+
+    keys = HandEvaluator.CARD_KEYS
+    dead_mask = Card.toMask(cards)
+    own_key = sum(keys[card.index] for card in cards)
+    unseen = [card.index for card in Card.ALL if not card.mask & dead_mask]
+    share = 0.0
+    for _ in range(samples):
+        dealt = rng.sample(unseen, 5 + 2 * opponents)
+        board_key = 0
+        board_mask = 0
+        for index in dealt[:5]:
+            board_key += keys[index]
+            board_mask |= 1 << index
+
+        own = HandEvaluator.evaluateKey(board_key + own_key, board_mask | dead_mask)
+        best = 0
+        ties = 0
+        for i in range(5, len(dealt), 2):
+            first, second = dealt[i], dealt[i + 1]
+            strength = HandEvaluator.evaluateKey(board_key + keys[first] + keys[second],
+                                                 board_mask | (1 << first) | (1 << second))
+            if strength > best:
+                best = strength
+                ties = 0
+            if strength == best:
+                ties += 1
+
+        if own > best:
+            share += 1
+        elif own == best:
+            share += 1 / (ties + 1)
+
+    return share / samples
+
+def generate(path : str, equity_samples : int, seed : int = 169) -> None:
+    """
+    Build every row of the table: hand probabilities by full enumeration and
+    equity by sampling
+    """
+    from probabilitySim import ProbabilitySim
+
+    rng = Random(seed)
+    rows = []
+    for class_index in range(PreflopTable.CLASSES):
+        cards = PreflopTable.classCards(class_index)
+        counts = [0] * 10
+        ProbabilitySim._simulate(cards, counts, 0)
+        row = [count / counts[0] for count in counts[1:]]
+        for opponents in range(1, PreflopTable.MAX_OPPONENTS + 1):
+            row.append(_sampleEquity(cards, opponents, equity_samples, rng))
+
+        rows.append(row)
+        print("{:>4} {:.3f} {:.3f}".format(PreflopTable.className(class_index), row[9], row[17]))
+
+    PreflopTable.save(path, rows, 0, equity_samples)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the pre-flop starting hand table")
+    parser.add_argument("--out", default=PreflopTable.DEFAULT_PATH)
+    parser.add_argument("--equity-samples", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=169)
+    args = parser.parse_args()
+    generate(args.out, args.equity_samples, args.seed)
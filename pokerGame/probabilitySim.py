@@ -1,73 +1,476 @@
-from card import Card, Suit, Rank
+from card import Card
 from handBuilder import HandVal
-from handStrategy import BestHandStrat
-from random import sample
+from handEvaluator import HandEvaluator, np
+from preflopTable import PreflopTable
+from suitCanonicalizer import SuitCanonicalizer
+from lruCache import LRUCache
+from metrics import Metrics
+from random import Random, sample
+from math import comb, sqrt
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from time import perf_counter
+from typing import Iterator
+import os
+
+class ProbEstimate:
+    """
+    Hand probabilities estimated from random boards, with a confidence
+    interval for each probability
+    """
+    def __init__(self, probs : list[float], intervals : list[tuple[float, float]],
+                 samples : int, std_error : float, exact : bool) -> None:
+        self.probs = probs          # same layout as ProbabilitySim.getProbs
+        self.intervals = intervals  # (low, high) for each probability
+        self.samples = samples      # number of boards looked at
+        self.std_error = std_error  # largest standard error of any probability
+        self.exact = exact          # True if every board was enumerated instead
+
+    def __repr__(self) -> str:
+        return "ProbEstimate(samples={}, std_error={:.4f}, exact={})".format(self.samples,
+                                                                             self.std_error,
+                                                                             self.exact)
 
 class ProbabilitySim:
     """
     Runs a simulation to get card hand probabilities
     """
-    DECK = [Card(rank, suit) for suit in Suit for rank in Rank]
+    DECK = list(Card.ALL)
     NO_CARD_PROBS = [0, 0.174, 0.438, 0.235, 0.0483, 0.0462, 0.0303, 0.026, 0.00168, 0.000311]
+    # results of earlier calls, shared by every card set with the same suit
+    # pattern (see SuitCanonicalizer)
+    CACHE = LRUCache(4096)
+    # enumerations with at least this many boards are scored with numpy
+    # (when installed) in chunks of BATCH_SIZE boards
+    BATCH_MIN_BOARDS = 20000
+    BATCH_SIZE = 1 << 18
+    # largest enumeration done instead of sampling against a deadline
+    # (enumerating a board is ~10x quicker than sampling one)
+    DEADLINE_EXACT_BOARDS = 5000
+    # combination arrays of at most BATCH_SIZE rows, kept between calls
+    _COMBINATIONS : dict = {}
+    # process pool for parallel simulations, kept between calls
+    WORKERS = os.cpu_count() or 1
+    _POOL : ProcessPoolExecutor | None = None
 
     @staticmethod
-    def getProbs(cards : list[Card], cutoff : int = 0) -> list[float]:
+    def getProbs(cards : list[Card] | list[int] | int, cutoff : int = 0,
+                 std_error : float = 0, parallel : bool = False,
+                 rng : Random | None = None) -> list[float]:
         """
         Gets the probabilities of getting certain hands based on the current
-        known cards
+        known cards (cards, card indexes or a card set mask)
         
-        Will need to use cutoff for pre-flop probabilites (2 cards) as the 
-        simulations will take to long otherwise. Will result in a less accurate
-        probability prediction
+        Pre-flop (2 cards) probabilities come from PreflopTable when it has
+        been built. Otherwise every board is enumerated once, so even pre-flop
+        (~2.1M boards) runs in about a second. A cutoff stops the search early after
+        that many boards, at the cost of a less accurate (and biased towards
+        low cards) probability prediction
+
+        Giving a std_error samples random boards instead until every
+        probability is that accurate (see estimateProbs, rng seeds the samples)
+
+        Exact results (no cutoff or std_error) are cached, repeated boards are
+        a lookup. Sampled results aren't, each call draws its own samples.
+        With parallel the work is split over the process pool (see getPool),
+        giving the same result as running it here
         """
+        cards = Card.toCards(cards)
         if len(cards) > 7:
             raise Exception("Invalid number of cards given!")
         
         if len(cards) == 0:
             # can just use probs with no cards
             return ProbabilitySim.NO_CARD_PROBS
-        
-        # index 0 tracks number of 7 card combinations, 1-9 measures the number
-        # of times each hand appears (1 = High card hand, 9 = straigth flush)
-        counts = [0] * 10
-        ProbabilitySim._simulate(cards, counts, cutoff)
-        probs = [0] # filler spot to make getting probabilites easier
-        for i in range(1, len(counts)):
-            probs.append(counts[i] / counts[0])
+
+        if len(cards) == 2:
+            # pre-flop, look up the starting hand (built offline by preflopTable.py)
+            table_probs = PreflopTable.getProbs(cards)
+            if table_probs is not None:
+                return table_probs
+
+        cache_key = None
+        if cutoff == 0 and std_error == 0:
+            # a cutoff search depends on the order of the cards, can't share it
+            cache_key = SuitCanonicalizer.canonicalMask(cards)
+            cached_probs = ProbabilitySim.CACHE.get(cache_key)
+            if Metrics.enabled:
+                Metrics.count("probability_sim.cache_hits" if cached_probs is not None
+                              else "probability_sim.cache_misses")
+            if cached_probs is not None:
+                return list(cached_probs)
+
+        if std_error > 0:
+            probs = ProbabilitySim.estimateProbs(cards, std_error, rng=rng, parallel=parallel).probs
+        else:
+            # index 0 tracks number of 7 card combinations, 1-9 measures the number
+            # of times each hand appears (1 = High card hand, 9 = straigth flush)
+            counts = [0] * 10
+            if parallel and cutoff == 0:
+                ProbabilitySim._simulateParallel(cards, counts)
+            else:
+                ProbabilitySim._simulate(cards, counts, cutoff)
+            probs = [0] # filler spot to make getting probabilites easier
+            for i in range(1, len(counts)):
+                probs.append(counts[i] / counts[0])
+
+        if cache_key is not None:
+            ProbabilitySim.CACHE.put(cache_key, list(probs))
 
         return probs
     
+    @staticmethod
+    def estimateProbs(cards : list[Card] | list[int] | int, std_error : float = 0,
+                      max_samples : int = 0, batch_size : int = 1000,
+                      z : float = 1.96, rng : Random | None = None,
+                      parallel : bool = False, deadline : float | None = None) -> ProbEstimate:
+        """
+        Estimates the probabilities of getting certain hands by sampling random
+        boards, unbiased unlike a cutoff
+
+        Sampling stops as soon as the standard error of every probability is at
+        most std_error, after max_samples boards or once perf_counter() passes
+        the deadline (at least one is needed, a deadline still samples one
+        batch). If enumerating every board would take no more boards than
+        that, the exact probabilities are returned instead (with a deadline,
+        only if it is at most DEADLINE_EXACT_BOARDS boards)
+
+        Each batch gets its own seed from rng. With parallel, batches run
+        together on the process pool and are merged in order, so the result
+        is the same as sampling them one after another here
+        """
+        if std_error <= 0 and max_samples <= 0 and deadline is None:
+            raise Exception("Need a target standard error, a sample budget or a deadline!")
+
+        cards = Card.toCards(cards)
+        if len(cards) > 7:
+            raise Exception("Invalid number of cards given!")
+
+        rng = rng if rng is not None else Random()
+        dead_mask = Card.toMask(cards)
+        unseen = [card for card in ProbabilitySim.DECK if not card.mask & dead_mask]
+        missing = 7 - len(cards)
+
+        # worst case (p = 0.5) number of samples needed for the target error
+        needed = max_samples if std_error <= 0 else int(0.25 / std_error ** 2) + 1
+        if max_samples > 0:
+            needed = min(needed, max_samples)
+        if deadline is not None:
+            # enumerating can't be stopped at the deadline, keep it about as
+            # quick as a batch of samples
+            exact_limit = ProbabilitySim.DEADLINE_EXACT_BOARDS
+            needed = exact_limit if needed <= 0 else min(needed, exact_limit)
+
+        counts = [0] * 10
+        if comb(len(unseen), missing) <= needed:
+            ProbabilitySim._simulate(cards, counts, 0)
+            probs = [0] + [count / counts[0] for count in counts[1:]]
+            return ProbEstimate(probs, [(prob, prob) for prob in probs], counts[0], 0, True)
+
+        card_indexes = [card.index for card in cards]
+        batches_per_round = ProbabilitySim.WORKERS if parallel else 1
+        worst_error = 0
+        done = False
+        while not done:
+            batch_sizes = []
+            for _ in range(batches_per_round):
+                samples = batch_size
+                if max_samples > 0:
+                    samples = min(samples, max_samples - counts[0] - sum(batch_sizes))
+                if samples > 0:
+                    batch_sizes.append(samples)
+
+            seeds = [rng.getrandbits(64) for _ in batch_sizes]
+            if parallel:
+                results = ProbabilitySim.getPool().map(ProbabilitySim._sampleBatch,
+                                                       repeat(card_indexes), batch_sizes, seeds)
+            else:
+                results = [ProbabilitySim._sampleBatch(card_indexes, batch_sizes[0], seeds[0])]
+
+            for batch_counts in results:
+                for i in range(len(counts)):
+                    counts[i] += batch_counts[i]
+
+                worst_error = ProbabilitySim._worstError(counts)
+                if ((std_error > 0 and worst_error <= std_error)
+                    or (max_samples > 0 and counts[0] >= max_samples)
+                    or (deadline is not None and perf_counter() >= deadline)):
+                    done = True # later batches of the round are thrown away
+                    break
+
+        if Metrics.enabled:
+            Metrics.count("probability_sim.samples", counts[0])
+
+        probs = [0] + [count / counts[0] for count in counts[1:]]
+        intervals = [(0, 0)] + [ProbabilitySim._wilsonInterval(count, counts[0], z)
+                                for count in counts[1:]]
+        return ProbEstimate(probs, intervals, counts[0], worst_error, False)
+
+    @staticmethod
+    def _sampleBatch(card_indexes : list[int], samples : int, seed : int) -> list[int]:
+        """
+        Count the best hands of some random boards completing the cards
+        """
+        rng = Random(seed)
+        dead_mask = 0
+        key = 0
+        for index in card_indexes:
+            dead_mask |= 1 << index
+            key += HandEvaluator.CARD_KEYS[index]
+
+        unseen = [card for card in ProbabilitySim.DECK if not card.mask & dead_mask]
+        unseen_keys = [HandEvaluator.CARD_KEYS[card.index] for card in unseen]
+        unseen_masks = [card.mask for card in unseen]
+        positions = range(len(unseen))
+        missing = 7 - len(card_indexes)
+        counts = [0] * 10
+        for _ in range(samples):
+            full_key = key
+            mask = dead_mask
+            for pos in rng.sample(positions, missing):
+                full_key += unseen_keys[pos]
+                mask |= unseen_masks[pos]
+
+            counts[HandEvaluator.evaluateKey(full_key, mask) >> HandEvaluator.CATEGORY_SHIFT] += 1
+
+        counts[0] = samples
+        return counts
+
+    @staticmethod
+    def _worstError(counts : list[int]) -> float:
+        """
+        Largest standard error of the hand probabilities in counts. Counts get
+        one imaginary hit and miss so unseen hands still count as uncertain
+        """
+        total = counts[0]
+        worst = 0
+        for count in counts[1:]:
+            prob = (count + 1) / (total + 2)
+            worst = max(worst, sqrt(prob * (1 - prob) / total))
+
+        return worst
+
+    @staticmethod
+    def _wilsonInterval(count : int, total : int, z : float) -> tuple[float, float]:
+        """
+        Wilson score interval for a probability, stays sensible for hands
+        that are rare or never seen
+        """
+        prob = count / total
+        denominator = 1 + z * z / total
+        center = (prob + z * z / (2 * total)) / denominator
+        spread = z * sqrt(prob * (1 - prob) / total + z * z / (4 * total * total)) / denominator
+        return (max(0, center - spread), min(1, center + spread))
+
     @staticmethod
     def _simulate(cards : list[Card], counts : list[int], cutoff : int) -> None:
         """
         Searches through all possible 7 card combinations for the best hand for 
         each combination
+
+        Each set of unseen cards is only visited once (in order of index), the
+        order the cards would be dealt in doesn't change the hand
         """
+        dead_mask = Card.toMask(cards)
+        unseen = [card for card in ProbabilitySim.DECK if not card.mask & dead_mask]
+        key = 0
+        for card in cards:
+            key += HandEvaluator.CARD_KEYS[card.index]
+
+        evaluated = counts[0]
         if len(cards) == 7:
-            # full cards reached, check for best hand
-            best_hand_strat = BestHandStrat()
-            best_hand_strat.takeInCards(cards)
-            hand = best_hand_strat.execute()
+            # full cards known, only one hand possible
+            counts[0] += 1
+            counts[HandEvaluator.evaluateKey(key, dead_mask) >> HandEvaluator.CATEGORY_SHIFT] += 1
+        else:
+            ProbabilitySim._simulateFrom(unseen, 7 - len(cards), key, dead_mask, counts, cutoff)
 
-            counts[0] += 1              # increase total
-            counts[hand[1].value] += 1  # increase hand count
+        if Metrics.enabled:
+            Metrics.count("probability_sim.evaluations", counts[0] - evaluated)
+
+    @staticmethod
+    def _simulateFrom(unseen : list[Card], missing : int, key : int, mask : int,
+                      counts : list[int], cutoff : int) -> None:
+        """
+        Count every way to add missing of the unseen cards to the cards with
+        the given key and mask, with numpy if it's worth it
+        """
+        if (cutoff == 0 and HandEvaluator.batchAvailable()
+            and comb(len(unseen), missing) >= ProbabilitySim.BATCH_MIN_BOARDS):
+            ProbabilitySim._simulateBatch([card.index for card in unseen], missing,
+                                          key, mask, counts)
+            return
+
+        ProbabilitySim._walk([HandEvaluator.CARD_KEYS[card.index] for card in unseen],
+                             [card.mask for card in unseen],
+                             0, missing, key, mask, counts, cutoff)
+
+    @staticmethod
+    def _simulateParallel(cards : list[Card], counts : list[int]) -> None:
+        """
+        Same as _simulate, split into one task per lowest unseen card of the
+        board (the next card dealt in index order) on the process pool
+        """
+        missing = 7 - len(cards)
+        if missing < 2:
+            ProbabilitySim._simulate(cards, counts, 0)
+            return
+
+        card_indexes = [card.index for card in cards]
+        first_positions = range(52 - len(cards) - missing + 1)
+        for shard_counts in ProbabilitySim.getPool().map(ProbabilitySim._simulateShard,
+                                                         repeat(card_indexes), first_positions):
+            for i in range(len(counts)):
+                counts[i] += shard_counts[i]
+
+    @staticmethod
+    def _simulateShard(card_indexes : list[int], first_position : int) -> list[int]:
+        """
+        Count the boards whose lowest unseen card is unseen[first_position]
+        """
+        cards = Card.toCards(card_indexes)
+        dead_mask = Card.toMask(cards)
+        unseen = [card for card in ProbabilitySim.DECK if not card.mask & dead_mask]
+        first = unseen[first_position]
+        key = HandEvaluator.CARD_KEYS[first.index]
+        for card in cards:
+            key += HandEvaluator.CARD_KEYS[card.index]
+
+        counts = [0] * 10
+        ProbabilitySim._simulateFrom(unseen[first_position + 1:], 6 - len(cards), key,
+                                     dead_mask | first.mask, counts, 0)
+        return counts
+
+    @staticmethod
+    def getPool() -> ProcessPoolExecutor:
+        """
+        Get the process pool used for parallel simulations. It starts on first
+        use and is kept for later calls, so workers only start up once
+        """
+        if ProbabilitySim._POOL is None:
+            ProbabilitySim._POOL = ProcessPoolExecutor(ProbabilitySim.WORKERS)
+
+        return ProbabilitySim._POOL
+
+    @staticmethod
+    def setWorkers(workers : int) -> None:
+        """
+        Change how many processes parallel simulations use
+        """
+        if workers < 1:
+            raise ValueError("Need at least one worker")
+
+        ProbabilitySim.shutdownPool()
+        ProbabilitySim.WORKERS = workers
+
+    @staticmethod
+    def shutdownPool() -> None:
+        """
+        Stop the worker processes, a later parallel call starts new ones
+        """
+        if ProbabilitySim._POOL is not None:
+            ProbabilitySim._POOL.shutdown()
+            ProbabilitySim._POOL = None
+
+    @staticmethod
+    def _simulateBatch(unseen : list[int], missing : int, key : int, mask : int,
+                       counts : list[int]) -> None:
+        """
+        Same as _simulate, but every board is built as a row of an array and
+        the boards are evaluated together with HandEvaluator.evaluateKeysBatch
+        """
+        unseen_keys = np.array([HandEvaluator.CARD_KEYS[index] for index in unseen], dtype=np.int64)
+        unseen_masks = np.array([1 << index for index in unseen], dtype=np.uint64)
+        for chunk in ProbabilitySim.combinationChunks(len(unseen), missing):
+            keys = unseen_keys[chunk].sum(axis=1) + key
+            masks = np.bitwise_or.reduce(unseen_masks[chunk], axis=1) | np.uint64(mask)
+            strengths = HandEvaluator.evaluateKeysBatch(keys, masks)
+            hand_counts = np.bincount(strengths >> HandEvaluator.CATEGORY_SHIFT, minlength=10)
+            for i in range(1, 10):
+                counts[i] += int(hand_counts[i])
+            counts[0] += len(chunk)
+
+    @staticmethod
+    def combinationArray(n : int, k : int) -> "np.ndarray":
+        """
+        Get every way to pick k of n positions as rows of an array, in the same
+        order itertools.combinations gives them (needs numpy). Only arrays of
+        at most BATCH_SIZE rows are kept for later calls, see combinationChunks
+        for larger ones
+        """
+        combos = ProbabilitySim._COMBINATIONS.get((n, k))
+        if combos is not None:
+            return combos
+
+        combos = np.arange(n, dtype=np.int8)[:, None]
+        for _ in range(k - 1):
+            # each row is followed by every position after its last one
+            last = combos[:, -1].astype(np.int64)
+            repeats = n - 1 - last
+            rows = np.repeat(combos, repeats, axis=0)
+            offsets = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+            following = np.repeat(last + 1, repeats) + offsets
+            combos = np.hstack([rows, following[:, None].astype(np.int8)])
+
+        if len(combos) <= ProbabilitySim.BATCH_SIZE:
+            ProbabilitySim._COMBINATIONS[(n, k)] = combos
+        return combos
+
+    @staticmethod
+    def combinationChunks(n : int, k : int) -> Iterator["np.ndarray"]:
+        """
+        Go through the rows of combinationArray(n, k) in order, as arrays of
+        at most BATCH_SIZE rows (more only if k is 1), so a large enumeration
+        is never in memory at once. Picks are split by their first position
+        until the rest fit in a chunk
+        """
+        if k <= 1 or comb(n, k) <= ProbabilitySim.BATCH_SIZE:
+            yield ProbabilitySim.combinationArray(n, k)
             return
 
-        if cutoff > 0 and counts[0] >= cutoff:
-            return # cutoff reached, stop search
+        for first in range(n - k + 1):
+            for rest in ProbabilitySim.combinationChunks(n - first - 1, k - 1):
+                yield np.hstack([np.full((len(rest), 1), first, dtype=np.int8), rest + np.int8(first + 1)])
 
-        # simualte all potential cards
-        remaining_cards = [card for card in ProbabilitySim.DECK if card not in cards]
-        for rem_card in remaining_cards:
-            ProbabilitySim._simulate(cards + [rem_card], counts, cutoff)
+    @staticmethod
+    def _walk(unseen_keys : list[int], unseen_masks : list[int], start : int,
+              depth : int, key : int, mask : int, counts : list[int], cutoff : int) -> None:
+        """
+        Add the unseen cards from start onwards to the key and mask one at a
+        time until depth more cards are added, then count the hand
+        """
+        if depth == 1:
+            # last card, evaluate straight from the tables
+            rank_table = HandEvaluator.RANK_TABLE
+            rank_part = HandEvaluator.RANK_PART
+            flush_add = HandEvaluator.FLUSH_ADD
+            flush_test = HandEvaluator.FLUSH_TEST
+            shift = HandEvaluator.CATEGORY_SHIFT
+            for pos in range(start, len(unseen_keys)):
+                full_key = key + unseen_keys[pos]
+                if (full_key + flush_add) & flush_test:
+                    strength = HandEvaluator.evaluateKey(full_key, mask | unseen_masks[pos])
+                else:
+                    strength = rank_table[full_key & rank_part]
+
+                counts[strength >> shift] += 1
+
+            counts[0] += len(unseen_keys) - start
+            return
+
+        for pos in range(start, len(unseen_keys) - depth + 1):
+            if cutoff > 0 and counts[0] >= cutoff:
+                return # cutoff reached, stop search
+
+            ProbabilitySim._walk(unseen_keys, unseen_masks, pos + 1, depth - 1,
+                                 key + unseen_keys[pos], mask | unseen_masks[pos],
+                                 counts, cutoff)
 
 if __name__ == "__main__":
     current_hand = sample(ProbabilitySim.DECK, 2)
-    # arbitrary cutoff, change according to acceptable simulation time at cost of accuracy
-    pre_flop_cutoff = 500000    
 
     print("Current hand pre-flop is {}".format(current_hand))
-    probs = ProbabilitySim.getProbs(current_hand, pre_flop_cutoff)
+    probs = ProbabilitySim.getProbs(current_hand)
     for hand in HandVal:
         print("Probability of {} being best is {:.3f}".format(hand.name, probs[hand.value]))
     
@@ -77,10 +480,9 @@ if __name__ == "__main__":
     
     print("Average hand value of {}".format(value))
 
-    current_hand = (current_hand + sample([card for card in ProbabilitySim.DECK 
-                                           if card not in current_hand],3))
+    current_hand = (current_hand + sample(Card.fromMask(Card.FULL_MASK ^ Card.toMask(current_hand)), 3))
     print("\nCurrent hand post-flop is {}".format(current_hand))
-    # Don't need cutoff after flop (5 cards known), runtime will be near instant
+    # post-flop (5 cards known) only 1081 boards are left, runtime will be near instant
     probs = ProbabilitySim.getProbs(current_hand)
     for hand in HandVal:
         print("Probability of {} being best is {:.3f}".format(hand.name, probs[hand.value]))
\ No newline at end of file
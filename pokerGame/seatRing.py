@@ -0,0 +1,98 @@
+from typing import Iterator
+
+class SeatRing:
+    """
+    The seats still in a hand and which of them have acted this betting
+    round, as bitmasks (bit i is seat i) with a count, so finding the next
+    seat to act, folding and checking if the round is complete take a few
+    int operations however many seats are empty or folded
+
+    A seat that is all in can be marked so it counts as having acted, it
+    has nothing left to bet with
+    """
+    def __init__(self, occupied : list[bool]) -> None:
+        """
+        occupied tells which seats have a player in the hand
+        """
+        self.size = len(occupied)
+        self.active = 0  # seats still in the hand
+        for seat, taken in enumerate(occupied):
+            if taken:
+                self.active |= 1 << seat
+        self.count = sum(1 for taken in occupied if taken)
+        self.acted = 0   # seats that acted since the last bet or raise
+        self.all_in = 0  # seats with no money left to act with
+
+    def next(self, seat : int) -> int:
+        """
+        Get the next seat still in the hand after seat (seat itself if it's
+        the only one)
+        """
+        later = self.active >> (seat + 1)
+        if later:
+            return seat + 1 + SeatRing._lowest(later)
+        if self.active:
+            return SeatRing._lowest(self.active)
+        return seat
+
+    def first(self, seat : int) -> int:
+        """
+        Get seat if it's still in the hand, otherwise the next one that is
+        """
+        return seat if self.active >> seat & 1 else self.next(seat)
+
+    @staticmethod
+    def _lowest(mask : int) -> int:
+        return (mask & -mask).bit_length() - 1
+
+    def fold(self, seat : int) -> None:
+        bit = 1 << seat
+        if self.active & bit:
+            self.active ^= bit
+            self.count -= 1
+        self.acted &= ~bit
+        self.all_in &= ~bit
+
+    def act(self, seat : int) -> None:
+        """
+        The seat checked or called
+        """
+        self.acted |= 1 << seat
+
+    def raised(self, seat : int) -> None:
+        """
+        The seat bet or raised, everyone else has to act again
+        """
+        self.acted = 1 << seat
+
+    def allIn(self, seat : int) -> None:
+        self.all_in |= 1 << seat
+
+    def newRound(self) -> None:
+        """
+        Start a betting round, nobody has acted
+        """
+        self.acted = 0
+
+    def complete(self) -> bool:
+        """
+        Check if every seat still in has acted (or is all in) since the last
+        bet or raise
+        """
+        return (self.acted | self.all_in) & self.active == self.active
+
+    def __contains__(self, seat : int) -> bool:
+        return bool(self.active >> seat & 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Go through the seats still in, lowest first
+        """
+        active = self.active
+        while active:
+            lowest = active & -active
+            yield lowest.bit_length() - 1
+            active ^= lowest
@@ -0,0 +1,37 @@
+from card import Card
+
+class SuitCanonicalizer:
+    """
+    Maps sets of cards to a representative of all the sets that are the same
+    up to renaming suits (ex: AsKs and AhKh). Hand chances don't depend on
+    which suit is which, so results for one set hold for all of them
+    """
+    SUIT_BITS = 0x1FFF
+
+    @staticmethod
+    def suitMasks(mask : int) -> list[int]:
+        """
+        Split a card set mask into the 13 bit rank mask of each suit
+        """
+        return [(mask >> (13 * suit)) & SuitCanonicalizer.SUIT_BITS for suit in range(4)]
+
+    @staticmethod
+    def canonicalMask(cards : list[Card] | int) -> int:
+        """
+        Get the representative card set mask of the cards: suits are renamed
+        so the suit holding the most valuable ranks comes first. Suits with
+        the same ranks are interchangeable, so ties don't matter
+        """
+        mask = cards if isinstance(cards, int) else Card.toMask(cards)
+        canonical = 0
+        for suit, ranks in enumerate(sorted(SuitCanonicalizer.suitMasks(mask), reverse=True)):
+            canonical |= ranks << (13 * suit)
+
+        return canonical
+
+    @staticmethod
+    def canonicalCards(cards : list[Card]) -> list[Card]:
+        """
+        Get the representative cards of the cards
+        """
+        return Card.fromMask(SuitCanonicalizer.canonicalMask(cards))
@@ -0,0 +1,50 @@
+from poker import Game
+
+class TableHost:
+    """
+    Plays many tables in one process, a bot action at a time from each in
+    turn, so no table waits on another's whole hand. Tables share nothing,
+    every decision gets its own table's state
+    """
+    def __init__(self, tables : list[Game], stack : int | None = None) -> None:
+        """
+        stack tops every player up to that much before each hand (ex: to
+        benchmark a table that never shrinks), None plays on until a table
+        has fewer than 2 players with money
+        """
+        self.tables = list(tables)
+        self.stack = stack
+        self.hands = 0 # hands finished at all tables
+
+    def step(self) -> bool:
+        """
+        Let every table take one action (starting a hand if none is being
+        played), returns False once no table can play
+        """
+        playing = []
+        for table in self.tables:
+            if table.hand_over:
+                if self.stack is not None:
+                    for player in table.players:
+                        player.money = self.stack
+                if not table.start_hand():
+                    continue # not enough players left, the table is closed
+
+            table.apply(table.bot_action())
+            if table.hand_over:
+                self.hands += 1
+            playing.append(table)
+
+        self.tables = playing
+        return bool(playing)
+
+    def run(self, hands : int) -> int:
+        """
+        Play until at least hands more hands are finished (across all
+        tables) or no table can play, returns the hands finished
+        """
+        start = self.hands
+        while self.hands - start < hands and self.step():
+            pass
+
+        return self.hands - start
@@ -0,0 +1,16 @@
+class TableState:
+    """
+    What a bet strategy knows about its table besides the cards and bet it's
+    given: the pot, how many players are still in, how often each player
+    has folded and how many hands have been played. Made by the table for
+    each decision, so any number of tables can share a process
+    """
+    def __init__(self, pot : int = 0, players_in : int = 2,
+                 opponent_folds : dict | None = None, rounds : int = 0) -> None:
+        self.pot = pot                      # chips bet in the current betting round
+        self.players_in = players_in        # players still in the hand, counting the one to act
+        self.opponent_folds = opponent_folds if opponent_folds is not None else {} # player -> folds
+        self.rounds = rounds                # hands played at the table
+
+    def __repr__(self) -> str:
+        return "TableState(pot={}, players_in={}, rounds={})".format(self.pot, self.players_in, self.rounds)
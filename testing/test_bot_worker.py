@@ -0,0 +1,126 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+import threading
+import time
+from random import Random
+from botWorker import BotWorker # type: ignore
+from player import Player # type: ignore
+from card import Card # type: ignore
+from handStrategy import LookupHandStrat # type: ignore
+from betStrategy import BetType, RandomStrat # type: ignore
+from tableState import TableState # type: ignore
+
+class TestBotWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = BotWorker()
+
+    def tearDown(self):
+        self.worker.stop()
+
+    def _wait(self):
+        for _ in range(500):
+            result = self.worker.poll()
+            if result is not None:
+                return result
+            time.sleep(0.01)
+        self.fail("no decision from the worker")
+
+    def test_decision_comes_back(self):
+        player = Player("bot", 800, LookupHandStrat(), RandomStrat(Random(18)))
+        player.recievePocket(*Card.toCards([12, 25]))
+        self.worker.submit(7, player, 10, 20, 20, [], TableState())
+        move_id, decision = self._wait()
+        self.assertEqual(move_id, 7)
+        self.assertIn(decision[0], list(BetType))
+        # deciding doesn't make the bet
+        self.assertEqual(player.money, 800)
+
+    def test_error_comes_back(self):
+        player = Player("bot", 800, LookupHandStrat(), RandomStrat())
+        self.worker.submit(1, player, 10, 20, 20, [], TableState()) # no pocket cards
+        move_id, decision = self._wait()
+        self.assertIsInstance(decision, Exception)
+
+    def test_speculation_prepared(self):
+        player = Player("bot", 800, LookupHandStrat(), RandomStrat(Random(19)))
+        player.recievePocket(*Card.toCards([12, 25]))
+        self.worker.speculate("table", player, 10, 20, 20, [], TableState())
+        for _ in range(500):
+            if "table" in self.worker.prepared:
+                break
+            time.sleep(0.01)
+        self.assertIsNone(self.worker.takePrepared("other table"))
+        self.assertIn(self.worker.takePrepared("table")[0], list(BetType))
+        self.assertIsNone(self.worker.takePrepared("table")) # only used once
+        self.assertIsNone(self.worker.poll()) # guesses aren't moves
+
+    def test_moves_before_speculation(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowBot:
+            pocket_cards = []
+            context = None
+
+            def decideBet(self, *args):
+                started.set()
+                release.wait(5)
+                return (BetType.CHECK, 0)
+
+        self.worker.speculate("busy", SlowBot(), 10, 20, 20, [], TableState())
+        started.wait(5)
+        # queued while the worker is busy: the move goes first and the
+        # cancelled guess never runs
+        self.worker.speculate("cancelled", SlowBot(), 10, 20, 20, [], TableState())
+        self.worker.cancelSpeculation()
+        player = Player("bot", 800, LookupHandStrat(), RandomStrat(Random(19)))
+        player.recievePocket(*Card.toCards([12, 25]))
+        self.worker.submit(3, player, 10, 20, 20, [], TableState())
+        self.worker.speculate("after", player, 10, 20, 20, [], TableState())
+        release.set()
+        self.assertEqual(self._wait()[0], 3)
+        for _ in range(500):
+            if "after" in self.worker.prepared:
+                break
+            time.sleep(0.01)
+        self.assertIn("busy", self.worker.prepared)
+        self.assertIn("after", self.worker.prepared)
+        self.assertNotIn("cancelled", self.worker.prepared)
+
+    def test_speculation_across_hands(self):
+        started = threading.Event()
+        release = threading.Event()
+        seen = []
+
+        class SlowStrat(RandomStrat):
+            def determineBet(self, small_blind, big_blind, current_bet, pocket_cards, community_cards,
+                             player_name, table, context=None):
+                started.set()
+                release.wait(5)
+                seen.append((list(pocket_cards), context))
+                return (BetType.CHECK, 0)
+
+        player = Player("bot", 800, LookupHandStrat(), SlowStrat())
+        player.recievePocket(*Card.toCards([12, 25]))
+        old_context = player.context
+        self.worker.speculate("old hand", player, 10, 20, 20, [], TableState())
+        started.wait(5)
+        # a new hand is dealt while the guess is being made
+        self.worker.clearPrepared()
+        player.clearPocket()
+        player.recievePocket(*Card.toCards([0, 1]))
+        release.set()
+        self.worker.submit(2, player, 10, 20, 20, [], TableState())
+        self.assertEqual(self._wait()[0], 2)
+
+        self.assertEqual(seen[0], (Card.toCards([12, 25]), old_context))
+        self.assertEqual(seen[1], (Card.toCards([0, 1]), player.context))
+        self.assertIsNot(player.context, old_context)
+        self.assertNotIn("old hand", self.worker.prepared)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+import pickle
+from copy import deepcopy
+from card import Card, Rank, Suit # type: ignore
+from handBuilder import HandBuilder, HandVal # type: ignore
+
+class TestCard(unittest.TestCase):
+
+    def test_interned(self):
+        card = Card(Rank.ACE, Suit.SPADE)
+        self.assertIs(card, Card(Rank.ACE, Suit.SPADE))
+        self.assertIs(card, deepcopy(card))
+        self.assertIs(card, pickle.loads(pickle.dumps(card)))
+        self.assertEqual(repr(card), "SA")
+
+        with self.assertRaises(AttributeError):
+            card.rank = Rank.TWO
+
+    def test_invalid_card(self):
+        for rank, suit in ((Rank.ACE, 5), (Rank.ACE, 0), (1, Suit.HEART), (15, Suit.CLUB)):
+            with self.assertRaises(Exception):
+                Card(rank, suit)
+
+    def test_index_and_mask(self):
+        self.assertEqual(len(Card.ALL), 52)
+        for index, card in enumerate(Card.ALL):
+            self.assertEqual(card.index, index)
+            self.assertEqual(card.mask, 1 << index)
+            self.assertIs(Card.fromIndex(index), card)
+
+        cards = [Card(Rank.TWO, Suit.CLUB), Card(Rank.KING, Suit.HEART)]
+        mask = Card.toMask(cards)
+        self.assertEqual(Card.fromMask(mask), cards)
+        self.assertEqual(Card.toCards(mask), cards)
+        self.assertEqual(Card.toCards([card.index for card in cards]), cards)
+
+    def test_hand_builder_from_indexes(self):
+        # aces of every suit plus three low clubs
+        indexes = [12, 25, 38, 51, 0, 1, 2]
+        hand = HandBuilder(indexes).checkFOK()
+        self.assertEqual(hand[1], HandVal.FOUR_OF_KIND)
+        self.assertEqual(hand[0][4], Card(Rank.FOUR, Suit.CLUB))
+
+if __name__ == '__main__':
+    unittest.main()
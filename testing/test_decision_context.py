@@ -0,0 +1,47 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from card import Card # type: ignore
+from decisionContext import DecisionContext # type: ignore
+from equitySim import EquitySim # type: ignore
+from probabilitySim import ProbabilitySim # type: ignore
+
+class TestDecisionContext(unittest.TestCase):
+
+    def setUp(self):
+        self.pocket = Card.toCards([12, 25])
+        self.board = Card.toCards([11, 24, 37, 4, 30])
+
+    def test_conditioned_probs_match_simulation(self):
+        context = DecisionContext()
+        for street in (3, 4, 5):
+            board = self.board[:street]
+            expected = ProbabilitySim.getProbs(self.pocket + board)
+            for exp, act in zip(expected, context.handProbs(self.pocket, board)):
+                self.assertAlmostEqual(exp, act)
+
+        # turn and river came from the flop counts
+        self.assertEqual(context.hits, 2)
+
+    def test_conditioned_equity_matches_exact(self):
+        context = DecisionContext()
+        for street in (3, 4, 5):
+            board = self.board[:street]
+            expected = EquitySim.equity(EquitySim.headsUp(self.pocket, board))
+            self.assertAlmostEqual(context.headsUpEquity(self.pocket, board), expected)
+
+    def test_reuse_same_board(self):
+        context = DecisionContext()
+        calls = []
+        for _ in range(3):
+            context.reuse(self.pocket, self.board[:3], ("test",), lambda: calls.append(1))
+        self.assertEqual(len(calls), 1)
+
+        # new pocket cards start a new hand
+        context.reuse(Card.toCards([0, 1]), self.board[:3], ("test",), lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from random import Random
+from deck import Deck # type: ignore
+from card import Card # type: ignore
+from handEvaluator import np # type: ignore
+
+class TestDeck(unittest.TestCase):
+
+    def test_deals_every_card_once(self):
+        deck = Deck(Random(21))
+        for _ in range(3):
+            deck.shuffle(12)
+            # past the 12 shuffled cards the rest are shuffled in as dealt
+            cards = [deck.deal() for _ in range(52)]
+            self.assertEqual(sorted(card.index for card in cards), list(range(52)))
+            self.assertEqual(len(deck), 0)
+        with self.assertRaises(Exception):
+            deck.deal()
+
+    def test_seeded_replays(self):
+        first, second = Deck(Random(21)), Deck(Random(21))
+        for _ in range(5):
+            first.shuffle(10)
+            second.shuffle(10)
+            self.assertEqual([first.deal() for _ in range(10)], [second.deal() for _ in range(10)])
+
+    def test_first_card_uniform(self):
+        deck = Deck(Random(21))
+        counts = [0] * 52
+        for _ in range(52000):
+            deck.shuffle(1)
+            counts[deck.deal().index] += 1
+        self.assertLess(max(counts), 1200)
+        self.assertGreater(min(counts), 800)
+
+    @unittest.skipIf(np is None, "needs numpy")
+    def test_batch(self):
+        deck = Deck(Random(21), batch=100)
+        hands = []
+        for _ in range(250): # runs out of batched shuffles twice
+            deck.shuffle(20)
+            cards = [deck.deal() for _ in range(20)]
+            self.assertEqual(len(set(cards)), 20)
+            hands.append(tuple(cards))
+        self.assertEqual(len(set(hands)), 250)
+        self.assertIn(deck.deal(), Card.ALL)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from random import Random
+from itertools import combinations
+from card import Card # type: ignore
+from equitySim import EquitySim # type: ignore
+from handEvaluator import HandEvaluator # type: ignore
+
+class TestEquitySim(unittest.TestCase):
+
+    def _bruteForce(self, pocket, board):
+        unseen = [card for card in Card.ALL if card not in pocket + board]
+        results = [0, 0, 0]
+        for runout in combinations(unseen, 5 - len(board)):
+            own = HandEvaluator.evaluate(pocket + board + list(runout))
+            for opponent in combinations([card for card in unseen if card not in runout], 2):
+                other = HandEvaluator.evaluate(board + list(runout) + list(opponent))
+                results[0 if own > other else 1 if own == other else 2] += 1
+
+        return tuple(result / sum(results) for result in results)
+
+    def test_matches_brute_force(self):
+        spots = [(Card.toCards([1, 30]), Card.toCards([0, 3, 7, 20, 40])),  # flush board
+                 (Card.toCards([12, 25]), Card.toCards([11, 24, 37, 4])),    # turn
+                 (Card.toCards([9, 10]), Card.toCards([8, 11, 50, 33])),     # flush and straight draws
+                 (Card.toCards([14, 27]), Card.toCards([0, 2, 4, 6, 8])),    # monotone river, board flush
+                 (Card.toCards([14, 27]), Card.toCards([0, 2, 4, 6]))]       # 4 flush turn
+        for pocket, board in spots:
+            expected = self._bruteForce(pocket, board)
+            for exp, act in zip(expected, EquitySim.headsUp(pocket, board)):
+                self.assertAlmostEqual(exp, act)
+
+    def test_nuts(self):
+        # royal flush in clubs can't lose
+        win, tie, lose = EquitySim.headsUp(Card.toCards([12, 11]), Card.toCards([10, 9, 8, 30, 40]))
+        self.assertEqual((win, tie, lose), (1.0, 0.0, 0.0))
+
+    def test_multiway_heads_up(self):
+        pocket, board = Card.toCards([12, 25]), Card.toCards([11, 24, 37])
+        exact = EquitySim.equity(EquitySim.headsUp(pocket, board))
+        estimate = EquitySim.multiway(pocket, board, 1, std_error=0.005, rng=Random(11))
+        self.assertLessEqual(estimate.std_error, 0.005)
+        self.assertAlmostEqual(estimate.equity, exact, delta=0.02)
+        low, high = estimate.interval
+        self.assertTrue(low <= estimate.equity <= high)
+
+    def test_multiway_more_opponents(self):
+        pocket = Card.toCards([12, 25]) # pocket aces
+        equities = [EquitySim.multiway(pocket, [], opponents, max_samples=3000, rng=Random(3)).equity
+                    for opponents in (1, 4, 9)]
+        self.assertAlmostEqual(equities[0], 0.85, delta=0.03)
+        self.assertGreater(equities[0], equities[1])
+        self.assertGreater(equities[1], equities[2])
+
+    def test_needs_flop(self):
+        with self.assertRaises(Exception):
+            EquitySim.headsUp(Card.toCards([12, 11]), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from poker import Game # type: ignore
+from player import Player # type: ignore
+from handStrategy import LookupHandStrat # type: ignore
+from betStrategy import BetType, RandomStrat, ArguablyOptimalStrat # type: ignore
+from gameEvents import ListSink, NullSink # type: ignore
+
+class TestGameEngine(unittest.TestCase):
+
+    def _game(self, seats):
+        players = [Player("bot " + str(x + 1), 800, LookupHandStrat(), RandomStrat(), is_agent=True)
+                   for x in range(seats)]
+        return Game(seats, players=players, events=ListSink())
+
+    def test_hands_keep_money(self):
+        for seats in (2, 6, 22):
+            game = self._game(seats)
+            for _ in range(50):
+                if not game.play_hand():
+                    break
+                self.assertTrue(game.hand_over)
+                self.assertEqual(sum(player.money for player in game.players), 800 * seats)
+
+    def test_legal_actions(self):
+        game = self._game(3)
+        game.start_hand()
+        # first to act faces the big blind
+        self.assertEqual(game.legal_actions(), [(BetType.FOLD, 0), (BetType.CALL, 20), (BetType.RAISE, 40)])
+        with self.assertRaises(Exception):
+            game.apply((BetType.RAISE, 1000))
+
+        game.apply((BetType.CALL, 20))
+        game.apply((BetType.CALL, 20))
+        # big blind can check it through
+        self.assertIn((BetType.CHECK, 0), game.legal_actions())
+        game.apply((BetType.CHECK, 0))
+        self.assertEqual(len(game.field), 3)
+        self.assertEqual(game.total_pot, 60)
+
+    def test_fold_settles(self):
+        game = self._game(3)
+        game.start_hand()
+        game.apply((BetType.FOLD, 0))
+        game.apply((BetType.FOLD, 0))
+        self.assertTrue(game.hand_over)
+        self.assertEqual(sorted(player.money for player in game.players), [790, 800, 810])
+        self.assertIn("win", game.events.kinds())
+
+    def test_raises_capped(self):
+        game = self._game(2)
+        game.start_hand()
+        for _ in range(Game.MAX_RAISES):
+            raises = [action for action in game.legal_actions() if action[0] == BetType.RAISE]
+            game.apply(raises[0])
+        self.assertNotIn(BetType.RAISE, [action[0] for action in game.legal_actions()])
+
+    def test_showdown_hand_only_built_when_watched(self):
+        for events in (NullSink(), ListSink()):
+            built = []
+            players = [Player("bot " + str(x + 1), 800, LookupHandStrat(), RandomStrat(), is_agent=True)
+                       for x in range(3)]
+            for player in players:
+                player.constructHand = lambda field, player=player: built.append(player) or \
+                    Player.constructHand(player, field)
+            game = Game(3, players=players, events=events)
+            game.start_hand()
+            while not game.hand_over:
+                game.apply((BetType.CHECK, 0) if (BetType.CHECK, 0) in game.legal_actions() else (BetType.CALL, 20))
+            self.assertEqual(len(game.field), 5)
+            if events.watching:
+                self.assertIn("best hand", events.kinds())
+                self.assertTrue(built)
+            else:
+                self.assertEqual(built, [])
+
+    def test_deadline_decision(self):
+        players = [Player("bot " + str(x + 1), 800, LookupHandStrat(), ArguablyOptimalStrat(deadline=0.02),
+                          is_agent=True) for x in range(6)]
+        game = Game(6, players=players, events=ListSink())
+        game.start_hand()
+        game.apply((BetType.CALL, 20))
+        while game.game_state == 0 and not game.hand_over:
+            game.apply((BetType.CHECK, 0) if (BetType.CHECK, 0) in game.legal_actions() else (BetType.CALL, 20))
+        self.assertEqual(len(game.field), 3)
+
+        strat = game.to_act().bet_strat
+        game.bot_action()
+        decision = strat.last_decision
+        self.assertGreater(decision.samples, 0)
+        self.assertGreater(decision.std_error, 0)
+        self.assertLess(decision.elapsed, 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from card import Card, Rank, Suit # type: ignore
+from handBuilder import HandVal # type: ignore
+from handEvaluator import HandEvaluator, np # type: ignore
+from handStrategy import LookupHandStrat # type: ignore
+
+SUITS = {"C": Suit.CLUB, "D": Suit.DIAMOND, "H": Suit.HEART, "S": Suit.SPADE}
+RANKS = {"J": Rank.JACK, "Q": Rank.QUEEN, "K": Rank.KING, "A": Rank.ACE}
+
+def cards(text):
+    """
+    Build cards from their printed form, ex: "SA H10 D2"
+    """
+    result = []
+    for name in text.split():
+        rank = RANKS[name[1:]] if name[1:] in RANKS else Rank(int(name[1:]))
+        result.append(Card(rank, SUITS[name[0]]))
+
+    return result
+
+class TestHandEvaluator(unittest.TestCase):
+
+    def test_categories(self):
+        hands = {"SA SK SQ SJ S10 H2 D3": HandVal.STRAIGHT_FLUSH,
+                 "SA HA DA CA S10 H2 D3": HandVal.FOUR_OF_KIND,
+                 "SA HA DA C10 S10 H2 D3": HandVal.FULL_HOUSE,
+                 "S2 S5 S9 SJ SK SA H3": HandVal.FLUSH,
+                 "SA H2 D3 C4 S5 H9 DJ": HandVal.STRAIGHT,
+                 "SA HA DA C10 S9 H2 D3": HandVal.THREE_OF_KIND,
+                 "SA HA D10 C10 S9 H2 D3": HandVal.TWO_PAIRS,
+                 "SA HA D10 C8 S9 H2 D3": HandVal.PAIR,
+                 "SA HK D10 C8 S9 H2 D3": HandVal.HIGH_CARD}
+        for hand, value in hands.items():
+            strength = HandEvaluator.evaluate(cards(hand))
+            self.assertEqual(HandEvaluator.handCategory(strength), value, hand)
+
+    def test_kickers(self):
+        better = HandEvaluator.evaluate(cards("SA HA DK C8 S9 H2 D3"))
+        worse = HandEvaluator.evaluate(cards("SA HA DQ C8 S9 H2 D3"))
+        self.assertGreater(better, worse)
+
+        # only the best five cards count
+        tie1 = HandEvaluator.evaluate(cards("SA HA DK CQ SJ H2 D3"))
+        tie2 = HandEvaluator.evaluate(cards("CA DA HK SQ CJ H4 D5"))
+        self.assertEqual(tie1, tie2)
+
+    def test_wheel_is_lowest_straight(self):
+        wheel = HandEvaluator.evaluate(cards("SA H2 D3 C4 S5 H9 D9"))
+        six_high = HandEvaluator.evaluate(cards("S6 H2 D3 C4 S5 H9 D9"))
+        self.assertEqual(HandEvaluator.handCategory(wheel), HandVal.STRAIGHT)
+        self.assertLess(wheel, six_high)
+
+    def test_best_hand(self):
+        hand, value = HandEvaluator.bestHand(cards("S2 S5 S9 SJ SK SA H3"))
+        self.assertEqual(value, HandVal.FLUSH)
+        self.assertEqual(hand, cards("SA SK SJ S9 S5"))
+
+    def test_lookup_strat(self):
+        strat = LookupHandStrat()
+        strat.takeInCards(cards("SA HA DA C10 S10 H2 D3"))
+        hand, value = strat.execute()
+        self.assertEqual(value, HandVal.FULL_HOUSE)
+        self.assertEqual(hand, cards("SA HA DA C10 S10"))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_batch_matches_single(self):
+        rng = np.random.default_rng(480)
+        hands = np.argsort(rng.random((5000, 52)), axis=1)[:, :7]
+        strengths, categories = HandEvaluator.evaluateBatch(hands)
+        for row, strength, category in zip(hands.tolist(), strengths, categories):
+            self.assertEqual(HandEvaluator.evaluate(Card.toCards(row)), strength)
+            self.assertEqual(strength >> HandEvaluator.CATEGORY_SHIFT, category)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+import tempfile
+from random import Random
+from card import Card # type: ignore
+from poker import Game # type: ignore
+from player import Player # type: ignore
+from handStrategy import LookupHandStrat # type: ignore
+from betStrategy import BetType, RandomStrat # type: ignore
+from gameEvents import NullSink # type: ignore
+from handHistory import HandRecord, HandHistoryWriter, readHands, exportText, importText # type: ignore
+
+class TestHandHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "hands.phh")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _play(self, hands, seats=6):
+        players = [Player("bot " + str(x + 1), 800, LookupHandStrat(), RandomStrat(Random(x)), is_agent=True)
+                   for x in range(seats)]
+        with HandHistoryWriter(self.path) as writer:
+            game = Game(seats, players=players, events=NullSink(), rng=Random(25), history=writer)
+            for _ in range(hands):
+                game.play_hand()
+        return game
+
+    def test_card_text(self):
+        cards = Card.fromText("AsKdTh2c")
+        self.assertEqual([str(card) for card in cards], ["SA", "DK", "H10", "C2"])
+        self.assertEqual(Card.toText(cards), "AsKdTh2c")
+        self.assertEqual(Card.fromText(Card.toText(Card.ALL)), list(Card.ALL))
+        with self.assertRaises(Exception):
+            Card.fromText("Ax")
+
+    def test_game_records_hands(self):
+        game = self._play(50)
+        records = list(readHands(self.path))
+        self.assertEqual(len(records), 50)
+        self.assertEqual(records, list(readHands(self.path, memory_map=True)))
+        for record in records:
+            # the pot is what was put in, and it all went to the winners
+            self.assertGreater(record.pot, 0)
+            self.assertTrue(record.winners)
+            self.assertIn(len(record.board), (0, 3, 4, 5))
+            self.assertEqual(len(set(card for _, _, pocket in record.players for card in pocket) | set(record.board)),
+                             2 * len(record.players) + len(record.board))
+        self.assertEqual(records[-1].hand, game.rounds - 1)
+        # about 65 bytes a hand
+        self.assertLess(os.path.getsize(self.path) / 50, 100)
+
+    def test_text_round_trip(self):
+        self._play(20)
+        text_path = os.path.join(self.directory.name, "hands.txt")
+        copy_path = os.path.join(self.directory.name, "copy.phh")
+        self.assertEqual(exportText(self.path, text_path), 20)
+        self.assertEqual(importText(text_path, copy_path), 20)
+        self.assertEqual(list(readHands(copy_path)), list(readHands(self.path)))
+
+        line = "12|6|2|0:800:AsKd 1:780:7h7c|AhKc2d|0:call:20 1:fold:0|0|50"
+        record = HandRecord.fromText(line)
+        self.assertEqual(record.actions[1], (1, BetType.FOLD, 0))
+        self.assertEqual(record.toText(), line)
+        self.assertEqual(HandRecord.decode(record.encode()), record)
+
+    def test_appends_and_skips_cut_hand(self):
+        self._play(5)
+        self._play(5) # opening again adds to the file
+        with open(self.path, "ab") as history:
+            history.write(b"\x40\x00\x00\x00\x01\x02") # a hand cut short
+        self.assertEqual(len(list(readHands(self.path))), 10)
+        self.assertEqual(len(list(readHands(self.path, memory_map=True))), 10)
+
+    def test_appends_after_cut_hand(self):
+        self._play(3)
+        with open(self.path, "ab") as history:
+            history.write(b"\x40\x00\x00\x00\x01\x02") # a hand cut short
+        self._play(3) # the cut hand is dropped before adding to the file
+        records = list(readHands(self.path))
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[:3], records[3:]) # same seeds, same hands
+        self.assertEqual(list(readHands(self.path, memory_map=True)), records)
+
+    def test_not_a_hand_history(self):
+        with open(self.path, "wb") as history:
+            history.write(b"hands.txt")
+        with self.assertRaises(Exception):
+            HandHistoryWriter(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
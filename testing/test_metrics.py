@@ -0,0 +1,54 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from metrics import Histogram, Metrics # type: ignore
+from probabilitySim import ProbabilitySim # type: ignore
+from card import Card # type: ignore
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.was_enabled = Metrics.enabled
+        Metrics.reset()
+
+    def tearDown(self):
+        Metrics.enable(self.was_enabled)
+        Metrics.reset()
+
+    def test_disabled_records_nothing(self):
+        Metrics.enable(False)
+        Metrics.count("test")
+        with Metrics.timer("test"):
+            pass
+        self.assertEqual(Metrics.snapshot(), {"counters": {}, "timers": {}})
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for i in range(1, 101):
+            histogram.observe(i / 1000)
+        # bucket bounds are within a factor of sqrt(2)
+        self.assertAlmostEqual(histogram.percentile(50), 0.05, delta=0.05 * 0.42)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.099 * 0.42)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_simulation_counts(self):
+        Metrics.enable()
+        ProbabilitySim.CACHE.clear()
+        cards = Card.toCards([0, 14, 28, 42, 50])
+        ProbabilitySim.getProbs(cards)
+        ProbabilitySim.getProbs(cards)
+        counters = Metrics.snapshot()["counters"]
+        self.assertEqual(counters["probability_sim.evaluations"], 1081)
+        self.assertEqual(counters["probability_sim.cache_hits"], 1)
+        self.assertEqual(counters["probability_sim.cache_misses"], 1)
+
+        with Metrics.timer("game.showdown"):
+            pass
+        text = Metrics.toPrometheus()
+        self.assertIn("poker_probability_sim_evaluations_total 1081", text)
+        self.assertIn('poker_game_showdown_seconds_bucket{le="+Inf"} 1', text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 import unittest
 print(sys.path)
 from poker import Game # type: ignore
+from card import Card, Rank, Suit # type: ignore
 
 class TestPoker(unittest.TestCase):
 
@@ -12,5 +13,34 @@ class TestPoker(unittest.TestCase):
         g = Game(1)
         assert g
 
+    def _showdown(self, field, *pockets):
+        g = Game(len(pockets) - 1)
+        g.field = field
+        g.current_players = list(g.players)
+        for player, pocket in zip(g.players, pockets):
+            player.recievePocket(*pocket)
+
+        return g, g.showdown()
+
+    def test_showdown_kicker(self):
+        field = [Card(Rank.ACE, Suit.SPADE), Card(Rank.ACE, Suit.HEART),
+                 Card(Rank.NINE, Suit.CLUB), Card(Rank.SIX, Suit.DIAMOND),
+                 Card(Rank.TWO, Suit.CLUB)]
+        g, winners = self._showdown(field,
+                                    (Card(Rank.KING, Suit.CLUB), Card(Rank.THREE, Suit.HEART)),
+                                    (Card(Rank.QUEEN, Suit.CLUB), Card(Rank.JACK, Suit.HEART)),
+                                    (Card(Rank.FOUR, Suit.CLUB), Card(Rank.THREE, Suit.SPADE)))
+        self.assertEqual(winners, [g.players[0]])
+
+    def test_showdown_split(self):
+        # everyone plays the board straight
+        field = [Card(Rank.TEN, Suit.SPADE), Card(Rank.JACK, Suit.HEART),
+                 Card(Rank.QUEEN, Suit.CLUB), Card(Rank.KING, Suit.DIAMOND),
+                 Card(Rank.ACE, Suit.CLUB)]
+        g, winners = self._showdown(field,
+                                    (Card(Rank.TWO, Suit.CLUB), Card(Rank.THREE, Suit.HEART)),
+                                    (Card(Rank.TWO, Suit.DIAMOND), Card(Rank.FOUR, Suit.HEART)))
+        self.assertEqual(winners, g.players)
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
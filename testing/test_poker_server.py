@@ -0,0 +1,134 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+import asyncio
+import json
+from pokerServer import PokerServer # type: ignore
+from loadTest import LoadResult, bot, loadTest # type: ignore
+
+async def join(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b'{"type": "join", "name": "test"}\n')
+    return reader, writer, json.loads(await reader.readline())
+
+class FakeClient:
+    def __init__(self):
+        self.messages = []
+
+    def send(self, message):
+        self.messages.append(message)
+
+    async def nextAction(self, move_id, timeout):
+        return None
+
+class TestPokerServer(unittest.TestCase):
+
+    def test_load_test(self):
+        result = asyncio.run(loadTest(12, 1.0, local_seats=6))
+        self.assertEqual(result.connected, 12)
+        self.assertGreater(result.hands, 0)
+        self.assertEqual(result.latency.count, result.actions)
+        self.assertGreater(result.actions, 0)
+
+    def test_silent_client_times_out(self):
+        async def run():
+            server = PokerServer(1, seats=2, timeout=0.05)
+            port = await server.start(port=0)
+            reader, writer, seated = await join(port) # never answers
+            result = LoadResult()
+            loop = asyncio.get_running_loop()
+            await bot(1, result, loop.time() + 0.5, "127.0.0.1", port, None, 0)
+            writer.close()
+            await server.stop()
+            return server, seated, result
+
+        server, seated, result = asyncio.run(run())
+        self.assertEqual(seated["type"], "seated")
+        # the table kept playing without the silent client
+        self.assertGreater(server.hands, 1)
+        self.assertGreater(result.actions, 0)
+
+    def test_answers_not_objects_ignored(self):
+        async def run():
+            server = PokerServer(1, seats=2, timeout=0.05)
+            port = await server.start(port=0)
+            reader, writer, seated = await join(port)
+            result = LoadResult()
+            loop = asyncio.get_running_loop()
+            playing = asyncio.create_task(bot(1, result, loop.time() + 0.5, "127.0.0.1", port, None, 0))
+            while not playing.done():
+                try:
+                    line = await asyncio.wait_for(reader.readline(), 0.1)
+                except asyncio.TimeoutError:
+                    continue
+                if json.loads(line)["type"] == "act":
+                    writer.write(b'[1, 2]\n"call"\n7\n')
+            await playing
+            writer.close()
+            await server.stop()
+            return server, result
+
+        server, result = asyncio.run(run())
+        self.assertFalse(any(task.done() and task.exception() for task in server.tasks))
+        self.assertGreater(server.hands, 1)
+        self.assertGreater(result.actions, 0)
+
+    def test_new_client_buys_in(self):
+        server = PokerServer(1, seats=2, bots=1, stack=800)
+        server.running = True
+        table = server.tables[0]
+        left = FakeClient()
+        table.clients[0] = table.owners[0] = left
+        table.game.players[0].money = 5000 # won by the client that left
+        joined = FakeClient()
+        table.clients[0] = joined
+        asyncio.run(server.playHand(table))
+        server.bot_executor.shutdown()
+
+        hand = joined.messages[0]
+        self.assertEqual(hand["type"], "hand")
+        self.assertLessEqual(hand["money"], 800)
+        self.assertIs(table.owners[0], joined)
+
+    def test_failed_hand_refunded(self):
+        server = PokerServer(1, seats=3, bots=1, stack=800)
+        table = server.tables[0]
+        table.clients[0], table.clients[1] = FakeClient(), FakeClient()
+        decide = server.decide
+        calls = []
+
+        async def failing(table, seat):
+            calls.append(seat)
+            if len(calls) == 3:
+                server.running = False # stop once the table has given up the hand
+                raise Exception("bad move")
+            return await decide(table, seat)
+
+        server.decide = failing
+        server.running = True
+        asyncio.run(server.playTable(table))
+        server.bot_executor.shutdown()
+
+        self.assertEqual(len(calls), 3)
+        self.assertTrue(table.game.hand_over)
+        self.assertEqual(sum(player.money for player in table.game.players), 3 * 800)
+        self.assertEqual(table.game.total_pot + table.game.current_pot, 0)
+
+    def test_full(self):
+        async def run():
+            server = PokerServer(1, seats=3, bots=1)
+            port = await server.start(port=0)
+            first = await join(port)
+            second = await join(port)
+            third = await join(port)
+            for _, writer, _ in (first, second, third):
+                writer.close()
+            await server.stop()
+            return [message["type"] for _, _, message in (first, second, third)]
+
+        self.assertEqual(asyncio.run(run()), ["seated", "seated", "full"])
+
+if __name__ == '__main__':
+    unittest.main()
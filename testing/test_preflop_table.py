@@ -0,0 +1,50 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+import tempfile
+from card import Card, Rank, Suit # type: ignore
+from preflopTable import PreflopTable # type: ignore
+from probabilitySim import ProbabilitySim # type: ignore
+
+class TestPreflopTable(unittest.TestCase):
+
+    def setUp(self):
+        self.rows, self.loaded = PreflopTable._rows, PreflopTable._loaded
+
+    def tearDown(self):
+        # whatever table the test loaded, the others get the one they had
+        PreflopTable._rows, PreflopTable._loaded = self.rows, self.loaded
+
+    def test_classes(self):
+        classes = {PreflopTable.classIndex(PreflopTable.classCards(i)) for i in range(169)}
+        self.assertEqual(classes, set(range(169)))
+
+        ak_suited = [Card(Rank.ACE, Suit.HEART), Card(Rank.KING, Suit.HEART)]
+        ak_offsuit = [Card(Rank.KING, Suit.SPADE), Card(Rank.ACE, Suit.HEART)]
+        self.assertEqual(PreflopTable.className(PreflopTable.classIndex(ak_suited)), "AKs")
+        self.assertEqual(PreflopTable.className(PreflopTable.classIndex(ak_offsuit)), "AKo")
+
+    def test_save_and_load(self):
+        rows = [[i / 1000] * PreflopTable.ROW_SIZE for i in range(169)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.bin")
+            PreflopTable.save(path, rows, 0, 10)
+            self.assertTrue(PreflopTable.load(path))
+            cards = PreflopTable.classCards(100)
+            self.assertAlmostEqual(PreflopTable.getProbs(cards)[1], 0.1)
+            self.assertAlmostEqual(PreflopTable.getEquity(cards, 9), 0.1)
+
+    @unittest.skipUnless(os.path.exists(PreflopTable.DEFAULT_PATH), "pre-flop table not built")
+    def test_shipped_table(self):
+        aces = [Card(Rank.ACE, Suit.SPADE), Card(Rank.ACE, Suit.HEART)]
+        counts = [0] * 10
+        ProbabilitySim._simulate(aces, counts, 0)
+        for count, prob in zip(counts[1:], ProbabilitySim.getProbs(aces)[1:]):
+            self.assertAlmostEqual(count / counts[0], prob, places=5)
+
+        self.assertAlmostEqual(PreflopTable.getEquity(aces, 1), 0.85, delta=0.02)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from random import Random
+from card import Card, Rank, Suit # type: ignore
+from lruCache import LRUCache # type: ignore
+from probabilitySim import ProbabilitySim # type: ignore
+from suitCanonicalizer import SuitCanonicalizer # type: ignore
+
+class TestProbCache(unittest.TestCase):
+
+    def test_canonical_suits(self):
+        spades = [Card(Rank.ACE, Suit.SPADE), Card(Rank.KING, Suit.SPADE), Card(Rank.TWO, Suit.CLUB)]
+        hearts = [Card(Rank.ACE, Suit.HEART), Card(Rank.KING, Suit.HEART), Card(Rank.TWO, Suit.DIAMOND)]
+        offsuit = [Card(Rank.ACE, Suit.HEART), Card(Rank.KING, Suit.SPADE), Card(Rank.TWO, Suit.DIAMOND)]
+        self.assertEqual(SuitCanonicalizer.canonicalMask(spades), SuitCanonicalizer.canonicalMask(hearts))
+        self.assertNotEqual(SuitCanonicalizer.canonicalMask(spades), SuitCanonicalizer.canonicalMask(offsuit))
+
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3) # evicts b
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats(), {"size": 2, "max_size": 2, "hits": 1,
+                                         "misses": 1, "evictions": 1})
+
+    def test_isomorphic_hit(self):
+        ProbabilitySim.CACHE.clear()
+        board = Card.toCards([0, 14, 28, 40, 51])
+        probs = ProbabilitySim.getProbs(board)
+        # same board with clubs and diamonds swapped
+        swapped = Card.toCards([13, 1, 28, 40, 51])
+        self.assertEqual(ProbabilitySim.getProbs(swapped), probs)
+        self.assertEqual(ProbabilitySim.CACHE.hits, 1)
+        self.assertEqual(ProbabilitySim.CACHE.misses, 1)
+
+    def test_sampled_not_cached(self):
+        ProbabilitySim.CACHE.clear()
+        cards = Card.toCards([0, 14, 28])
+        first = ProbabilitySim.getProbs(cards, std_error=0.02, rng=Random(1))
+        self.assertEqual(len(ProbabilitySim.CACHE), 0)
+        # each call draws its own samples, the seed decides them
+        self.assertEqual(ProbabilitySim.getProbs(cards, std_error=0.02, rng=Random(1)), first)
+        self.assertNotEqual(ProbabilitySim.getProbs(cards, std_error=0.02, rng=Random(2)), first)
+
+if __name__ == '__main__':
+    unittest.main()
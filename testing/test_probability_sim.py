@@ -0,0 +1,128 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from random import Random
+from itertools import permutations, combinations
+from time import perf_counter
+from card import Card # type: ignore
+from handEvaluator import HandEvaluator, np # type: ignore
+from probabilitySim import ProbabilitySim # type: ignore
+
+class TestProbabilitySim(unittest.TestCase):
+
+    def _orderedProbs(self, cards):
+        """
+        Probabilities from every ordered way to deal the rest of the cards
+        """
+        unseen = [card for card in ProbabilitySim.DECK if card not in cards]
+        counts = [0] * 10
+        for extra in permutations(unseen, 7 - len(cards)):
+            counts[0] += 1
+            counts[HandEvaluator.evaluate(cards + list(extra)) >> HandEvaluator.CATEGORY_SHIFT] += 1
+
+        return [0] + [count / counts[0] for count in counts[1:]]
+
+    def test_matches_ordered_enumeration(self):
+        for cards in (Card.toCards([0, 13, 26, 40, 51]), Card.toCards([3, 4, 5, 6, 20, 33])):
+            expected = self._orderedProbs(cards)
+            actual = ProbabilitySim.getProbs(cards)
+            for exp, act in zip(expected, actual):
+                self.assertAlmostEqual(exp, act)
+
+    def test_board_count(self):
+        counts = [0] * 10
+        ProbabilitySim._simulate(Card.toCards([0, 1, 2]), counts, 0)
+        # C(49, 4) unordered turn + river + 2 more cards
+        self.assertEqual(counts[0], 211876)
+        self.assertEqual(sum(counts[1:]), counts[0])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_batch_matches_walk(self):
+        cards = Card.toCards([5, 20, 33])
+        batch_counts = [0] * 10
+        ProbabilitySim._simulateBatch([card.index for card in ProbabilitySim.DECK if card not in cards],
+                                      4, sum(HandEvaluator.CARD_KEYS[card.index] for card in cards),
+                                      Card.toMask(cards), batch_counts)
+        walk_counts = [0] * 10
+        ProbabilitySim._simulate(cards, walk_counts, 1 << 30) # cutoff never batches
+        self.assertEqual(batch_counts, walk_counts)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_combination_chunks(self):
+        batch_size = ProbabilitySim.BATCH_SIZE
+        ProbabilitySim.BATCH_SIZE = 50
+        ProbabilitySim._COMBINATIONS.clear()
+        try:
+            chunks = list(ProbabilitySim.combinationChunks(12, 5))
+            rows = [tuple(row) for chunk in chunks for row in chunk.tolist()]
+            self.assertEqual(rows, list(combinations(range(12), 5)))
+            self.assertTrue(all(len(chunk) <= 50 for chunk in chunks))
+            # only arrays that fit in a chunk are kept
+            self.assertNotIn((12, 5), ProbabilitySim._COMBINATIONS)
+            self.assertTrue(all(len(combos) <= 50 for combos in ProbabilitySim._COMBINATIONS.values()))
+        finally:
+            ProbabilitySim.BATCH_SIZE = batch_size
+            ProbabilitySim._COMBINATIONS.clear()
+
+    def test_parallel_matches_serial(self):
+        ProbabilitySim.setWorkers(2)
+        try:
+            cards = Card.toCards([5, 20, 33, 47])
+            serial = [0] * 10
+            ProbabilitySim._simulate(cards, serial, 0)
+            parallel = [0] * 10
+            ProbabilitySim._simulateParallel(cards, parallel)
+            self.assertEqual(serial, parallel)
+
+            serial_estimate = ProbabilitySim.estimateProbs(cards[:2], std_error=0.01, rng=Random(9))
+            parallel_estimate = ProbabilitySim.estimateProbs(cards[:2], std_error=0.01, rng=Random(9),
+                                                             parallel=True)
+            self.assertEqual(serial_estimate.probs, parallel_estimate.probs)
+            self.assertEqual(serial_estimate.samples, parallel_estimate.samples)
+        finally:
+            ProbabilitySim.shutdownPool()
+
+    def test_known_cards(self):
+        probs = ProbabilitySim.getProbs(Card.toCards([8, 9, 10, 11, 12, 20, 30]))
+        self.assertEqual(probs[9], 1.0) # royal flush in clubs
+
+    def test_estimate_within_error(self):
+        cards = Card.toCards([12, 25])
+        exact = ProbabilitySim.getProbs(cards)
+        estimate = ProbabilitySim.estimateProbs(cards, std_error=0.005, rng=Random(5))
+        self.assertFalse(estimate.exact)
+        self.assertLessEqual(estimate.std_error, 0.005)
+        for prob, est, (low, high) in zip(exact[1:], estimate.probs[1:], estimate.intervals[1:]):
+            self.assertLess(abs(prob - est), 0.025)
+            self.assertLessEqual(low, est)
+            self.assertGreaterEqual(high, est)
+
+    def test_estimate_budget(self):
+        cards = Card.toCards([12, 25])
+        estimate = ProbabilitySim.estimateProbs(cards, max_samples=2500, rng=Random(5))
+        self.assertEqual(estimate.samples, 2500)
+        again = ProbabilitySim.estimateProbs(cards, max_samples=2500, rng=Random(5))
+        self.assertEqual(estimate.probs, again.probs)
+
+    def test_estimate_exact_when_cheaper(self):
+        cards = Card.toCards([0, 13, 26, 40, 51])
+        estimate = ProbabilitySim.estimateProbs(cards, std_error=0.01)
+        self.assertTrue(estimate.exact)
+        self.assertEqual(estimate.probs, ProbabilitySim.getProbs(cards))
+
+    def test_estimate_deadline(self):
+        cards = Card.toCards([12, 25])
+        # a deadline already passed still gives one batch
+        estimate = ProbabilitySim.estimateProbs(cards, deadline=perf_counter(), batch_size=300, rng=Random(1))
+        self.assertEqual(estimate.samples, 300)
+        self.assertFalse(estimate.exact)
+
+        start = perf_counter()
+        estimate = ProbabilitySim.estimateProbs(cards, std_error=0.0001, deadline=start + 0.05, rng=Random(1))
+        self.assertLess(perf_counter() - start, 0.5)
+        self.assertGreater(estimate.std_error, 0.0001)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from seatRing import SeatRing # type: ignore
+
+class TestSeatRing(unittest.TestCase):
+
+    def test_next_skips_empty_and_folded(self):
+        ring = SeatRing([True, False, True, True, False])
+        self.assertEqual(len(ring), 3)
+        self.assertEqual(ring.next(0), 2)
+        self.assertEqual(ring.next(3), 0) # wraps around
+        self.assertEqual(ring.first(1), 2)
+        ring.fold(2)
+        self.assertEqual(ring.next(0), 3)
+        self.assertEqual(list(ring), [0, 3])
+        self.assertNotIn(2, ring)
+        ring.fold(2) # folding twice changes nothing
+        self.assertEqual(len(ring), 2)
+
+    def test_round_complete(self):
+        ring = SeatRing([True] * 4)
+        for seat in range(3):
+            ring.act(seat)
+        self.assertFalse(ring.complete())
+        ring.raised(3)
+        # everyone has to act again after a raise
+        for seat in range(2):
+            ring.act(seat)
+        self.assertFalse(ring.complete())
+        ring.fold(2)
+        self.assertTrue(ring.complete())
+        ring.newRound()
+        self.assertFalse(ring.complete())
+
+    def test_all_in_counts_as_acted(self):
+        ring = SeatRing([True] * 3)
+        ring.allIn(1)
+        ring.act(0)
+        ring.act(2)
+        self.assertTrue(ring.complete())
+        ring.raised(0)
+        self.assertFalse(ring.complete())
+        ring.act(2)
+        self.assertTrue(ring.complete())
+
+    def test_many_seats(self):
+        ring = SeatRing([seat % 3 != 0 for seat in range(100)])
+        self.assertEqual(ring.next(98), 1)
+        self.assertEqual(ring.next(1), 2)
+        self.assertEqual(ring.next(2), 4)
+
+if __name__ == '__main__':
+    unittest.main()
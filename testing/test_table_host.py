@@ -0,0 +1,65 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+
+import unittest
+from random import Random
+from poker import Game # type: ignore
+from player import Player # type: ignore
+from handStrategy import LookupHandStrat # type: ignore
+from betStrategy import RandomStrat # type: ignore
+from gameEvents import NullSink # type: ignore
+from oddsForPot import potOdds # type: ignore
+from tableState import TableState # type: ignore
+from tableHost import TableHost # type: ignore
+
+class TestTableHost(unittest.TestCase):
+
+    def _game(self, seats, seed):
+        players = [Player("bot " + str(x + 1), 800, LookupHandStrat(), RandomStrat(Random(seed * 10 + x)),
+                          is_agent=True) for x in range(seats)]
+        return Game(seats, players=players, events=NullSink(), rng=Random(seed))
+
+    def test_tables_keep_their_state(self):
+        first, second = self._game(3, 1), self._game(6, 2)
+        first.start_hand()
+        second.start_hand()
+        second.current_pot = 600
+        self.assertEqual(potOdds(first.table_state()).opponentCount(), 2)
+        self.assertEqual(potOdds(second.table_state()).opponentCount(), 5)
+        self.assertAlmostEqual(potOdds(first.table_state()).potEquity(30), 30 / 60)
+        self.assertAlmostEqual(potOdds(second.table_state()).potEquity(30), 30 / 630)
+
+    def test_fold_stats(self):
+        players = [Player(name, 800, LookupHandStrat(), RandomStrat()) for name in ("a", "b", "c")]
+        table = TableState(pot=20, players_in=3, opponent_folds={players[0]: 0, players[1]: 4, players[2]: 2},
+                           rounds=8)
+        self.assertEqual(potOdds(table).calcOpponentFold("b"), 2 / 8)
+        self.assertEqual(potOdds(table).calcOpponentFold("a"), 4 / 8)
+
+    def test_host_interleaves(self):
+        tables = [self._game(seats, seed) for seed, seats in enumerate((2, 3, 6, 9))]
+        host = TableHost(tables)
+        played = host.run(200)
+        self.assertGreaterEqual(played, 200)
+        self.assertEqual(played, sum(table.rounds for table in tables))
+        for table in tables:
+            self.assertGreater(table.rounds, 0)
+            if table.hand_over:
+                self.assertEqual(sum(player.money for player in table.players), 800 * len(table.players))
+
+    def test_host_matches_tables_alone(self):
+        hosted = [self._game(3, seed) for seed in range(3)]
+        TableHost(hosted, stack=800).run(60)
+        for seed, table in enumerate(hosted):
+            alone = self._game(3, seed)
+            for _ in range(table.rounds):
+                for player in alone.players:
+                    player.money = 800
+                alone.play_hand()
+            if table.hand_over:
+                self.assertEqual([player.money for player in table.players],
+                                 [player.money for player in alone.players])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'pokerGame')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from random import Random
+from tournament import RunningStats, playSession # type: ignore
+
+class TestTournament(unittest.TestCase):
+
+    def test_merge_matches_single_stream(self):
+        rng = Random(14)
+        values = [rng.gauss(0, 3) for _ in range(1000)]
+        whole = RunningStats()
+        for value in values:
+            whole.add(value)
+
+        merged = RunningStats()
+        for start in range(0, 1000, 300):
+            part = RunningStats()
+            for value in values[start:start + 300]:
+                part.add(value)
+            merged.merge(part)
+
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.squares, whole.squares)
+
+    def test_session_replays(self):
+        lineup = ["random", "random", "random"]
+        first = playSession(lineup, 50, "test:0")
+        second = playSession(lineup, 50, "test:0")
+        self.assertEqual(first["random"].winnings.mean, second["random"].winnings.mean)
+        self.assertEqual(first["random"].busts, second["random"].busts)
+        # money only moves between seats
+        self.assertAlmostEqual(first["random"].winnings.mean, 0)
+
+if __name__ == '__main__':
+    unittest.main()
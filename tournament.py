@@ -0,0 +1,151 @@
+import sys, os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "pokerGame"))
+
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from random import Random
+from poker import Game
+from player import Player
+from handStrategy import LookupHandStrat
+from betStrategy import BetStrat, RandomStrat, ArguablyOptimalStrat
+from gameEvents import NullSink
+
+STRATEGIES : dict[str, type[BetStrat]] = {"random": RandomStrat,
+                                          "optimal": ArguablyOptimalStrat}
+STACK = 800
+BIG_BLIND = 20
+
+class RunningStats:
+    """
+    Running mean and variance of a stream of values (Welford), two of them
+    can be merged so results from different workers add up without keeping
+    the values
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0  # sum of squared differences from the mean
+
+    def add(self, value : float) -> None:
+        self.count += 1
+        difference = value - self.mean
+        self.mean += difference / self.count
+        self.squares += difference * (value - self.mean)
+
+    def merge(self, other : "RunningStats") -> None:
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        difference = other.mean - self.mean
+        self.mean += difference * other.count / count
+        self.squares += other.squares + difference * difference * self.count * other.count / count
+        self.count = count
+
+    def stdError(self) -> float:
+        if self.count < 2:
+            return float("inf")
+
+        return sqrt(self.squares / (self.count - 1) / self.count)
+
+class StrategyResult:
+    """
+    What one strategy won: results in big blinds per hand played by a seat
+    and how often a seat lost its whole stack
+    """
+    def __init__(self) -> None:
+        self.winnings = RunningStats()
+        self.busts = 0
+
+    def merge(self, other : "StrategyResult") -> None:
+        self.winnings.merge(other.winnings)
+        self.busts += other.busts
+
+    def winrate(self, z : float = 1.96) -> tuple[float, float, float]:
+        """
+        Get the winrate in big blinds per 100 hands with its confidence interval
+        """
+        rate = self.winnings.mean * 100
+        spread = z * self.winnings.stdError() * 100
+        return (rate, rate - spread, rate + spread)
+
+    def bustRate(self) -> float:
+        """
+        Get the busts per 100 hands
+        """
+        return self.busts * 100 / self.winnings.count if self.winnings.count else 0.0
+
+def playSession(lineup : list[str], hands : int, seed : int | str) -> dict[str, StrategyResult]:
+    """
+    Play a table of bots for some hands. Every random choice comes from one
+    RNG seeded by seed, so a session always plays out the same way no matter
+    which worker runs it. Busted seats buy back in for the next hand
+    """
+    rng = Random(seed)
+    players = [Player("{} {}".format(name, seat + 1), STACK, LookupHandStrat(), STRATEGIES[name](rng), is_agent=True)
+               for seat, name in enumerate(lineup)]
+    game = Game(len(players), players=players, events=NullSink(), rng=rng)
+    results = {name: StrategyResult() for name in lineup}
+
+    for _ in range(hands):
+        for player in players:
+            if player.money == 0:
+                player.money = STACK
+        before = [player.money for player in players]
+        game.play_hand()
+
+        for player, name, money in zip(players, lineup, before):
+            result = results[name]
+            result.winnings.add((player.money - money) / BIG_BLIND)
+            if player.money == 0:
+                result.busts += 1
+
+    return results
+
+def runTournament(lineup : list[str], sessions : int, hands : int, seed : int = 480,
+                  workers : int | None = None, report=None) -> dict[str, StrategyResult]:
+    """
+    Play sessions tables of the lineup over a process pool and add up their
+    results as they come back, in session order so the totals only depend on
+    the seed. report(done, totals) is called after every session
+    """
+    totals = {name: StrategyResult() for name in lineup}
+    seeds = ["{}:{}".format(seed, session) for session in range(sessions)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        finished = pool.map(playSession, [lineup] * sessions, [hands] * sessions, seeds)
+        for done, results in enumerate(finished, 1):
+            for name, result in results.items():
+                totals[name].merge(result)
+            if report is not None:
+                report(done, totals)
+
+    return totals
+
+def printResults(totals : dict[str, StrategyResult]) -> None:
+    for name, result in totals.items():
+        rate, low, high = result.winrate()
+        print("{:>8}: {:>8.2f} bb/100 (95% {:.2f} to {:.2f}), {:.3f} busts/100, {} seat hands".format(
+            name, rate, low, high, result.bustRate(), result.winnings.count))
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Play bot strategies against each other")
+    parser.add_argument("lineup", nargs="*", default=["random"] * 5 + ["optimal"],
+                        help="strategy of each seat: " + ", ".join(STRATEGIES))
+    parser.add_argument("--sessions", type=int, default=8, help="tables to play")
+    parser.add_argument("--hands", type=int, default=200, help="hands per table")
+    parser.add_argument("--seed", type=int, default=480)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    for name in args.lineup:
+        if name not in STRATEGIES:
+            parser.error("Unknown strategy: {}".format(name))
+
+    def report(done, totals):
+        print("--- {}/{} tables ---".format(done, args.sessions))
+        printResults(totals)
+
+    runTournament(args.lineup, args.sessions, args.hands, args.seed, args.workers, report)